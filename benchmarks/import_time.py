@@ -0,0 +1,126 @@
+"""
+Отчёт о времени старта воркера.
+
+Запускает `python -X importtime` в отдельном процессе, собирает
+накопленное время импорта по модулям и печатает самые дорогие.
+Отдельно замеряется запуск lifespan (регистрация роутеров) и создание
+движка при первом обращении — то, что при импорте больше не выполняется.
+
+Пример:
+    python benchmarks/import_time.py --top 25
+    python benchmarks/import_time.py --save benchmarks/import_time.json
+    python benchmarks/import_time.py --baseline benchmarks/import_time.json --tolerance 20
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# import time: self [us] | cumulative | imported package
+LINE_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S.*)$')
+
+STARTUP_SNIPPET = '''
+import time
+started = time.perf_counter()
+from fastapi.testclient import TestClient
+from main import app
+with TestClient(app):
+    lifespan = time.perf_counter() - started
+    from config import get_engine
+    engine_started = time.perf_counter()
+    get_engine()
+    engine = time.perf_counter() - engine_started
+print(f"{lifespan * 1000:.1f} {engine * 1000:.1f}")
+'''
+
+
+def run_importtime(module: str):
+    """Список (модуль, собственное время, накопленное время, глубина) в микросекундах"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, env=os.environ.copy(), capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.exit(result.stderr)
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name.strip(), int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def run_startup():
+    """Время (мс) запуска lifespan и создания движка"""
+    result = subprocess.run(
+        [sys.executable, '-c', STARTUP_SNIPPET],
+        cwd=ROOT, env=os.environ.copy(), capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.exit(result.stderr)
+    lifespan_ms, engine_ms = result.stdout.split()[-2:]
+    return float(lifespan_ms), float(engine_ms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='main', help='модуль, импорт которого замеряется')
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--no-startup', action='store_true', help='не замерять lifespan и создание движка')
+    parser.add_argument('--save', help='сохранить отчёт в JSON')
+    parser.add_argument('--baseline', help='JSON прошлого отчёта для сравнения')
+    parser.add_argument('--tolerance', type=float, default=20.0,
+                        help='допустимый рост общего времени импорта, %%')
+    args = parser.parse_args()
+
+    rows = run_importtime(args.module)
+    total_us = next((cumulative for name, _, cumulative, _ in rows if name == args.module), 0)
+    project = [row for row in rows if (ROOT / row[0].split('.')[0]).exists()
+               or (ROOT / (row[0].split('.')[0] + '.py')).exists()]
+
+    print(f"import {args.module}: {total_us / 1000:.1f} ms, модулей: {len(rows)}")
+    print(f"\nСамые дорогие модули (накопленное время):")
+    print(f"{'cumulative, ms':>15} {'self, ms':>10}  module")
+    for name, self_us, cumulative_us, _ in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>15.1f} {self_us / 1000:>10.1f}  {name}")
+
+    print(f"\nМодули проекта: {len(project)}, собственное время "
+          f"{sum(row[1] for row in project) / 1000:.1f} ms")
+
+    report = {
+        'module': args.module,
+        'total_ms': round(total_us / 1000, 1),
+        'modules': len(rows),
+        'project_modules': sorted(row[0] for row in project),
+    }
+
+    if not args.no_startup:
+        lifespan_ms, engine_ms = run_startup()
+        report.update(lifespan_ms=lifespan_ms, engine_ms=engine_ms)
+        print(f"\nimport + lifespan (роутеры): {lifespan_ms:.1f} ms")
+        print(f"создание движка при первом обращении: {engine_ms:.1f} ms")
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        limit = baseline['total_ms'] * (1 + args.tolerance / 100)
+        new_modules = sorted(set(report['project_modules']) - set(baseline.get('project_modules', [])))
+        print(f"\nБазовый замер: {baseline['total_ms']:.1f} ms, допустимо до {limit:.1f} ms")
+        if new_modules:
+            print(f"Новые модули проекта при импорте: {', '.join(new_modules)}")
+        if report['total_ms'] > limit:
+            print("Регрессия времени импорта")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
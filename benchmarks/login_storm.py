@@ -0,0 +1,103 @@
+"""
+Нагрузочный сценарий «утренний шторм логинов».
+
+Параллельно с массовыми запросами к /auth/login идёт поток обычных
+запросов к /cars/filter. Скрипт печатает пропускную способность логина
+и задержки (p50/p99) запросов к /cars, которые не должны деградировать
+из-за PBKDF2.
+
+Пример:
+    uvicorn main:app --workers 1 &
+    python benchmarks/login_storm.py --url http://127.0.0.1:8000 \\
+        --email agent@yandex.ru --password secret --logins 400 --concurrency 64
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+
+async def login_worker(client, queue, email, password, results):
+    while True:
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        started = time.perf_counter()
+        response = await client.post("/auth/login", data={"username": email, "password": password})
+        results.append((response.status_code, time.perf_counter() - started))
+
+
+async def cars_worker(client, token, stop, latencies):
+    headers = {"Authorization": f"Bearer {token}"}
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/cars/filter", headers=headers)
+        latencies.append(time.perf_counter() - started)
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.concurrency + args.readers)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60) as client:
+        response = await client.post("/auth/login", data={"username": args.email, "password": args.password})
+        response.raise_for_status()
+        token = response.json()["access_token"]
+
+        # Базовая задержка /cars без нагрузки
+        baseline = []
+        for _ in range(50):
+            started = time.perf_counter()
+            await client.get("/cars/filter", headers={"Authorization": f"Bearer {token}"})
+            baseline.append(time.perf_counter() - started)
+
+        queue = asyncio.Queue()
+        for i in range(args.logins):
+            queue.put_nowait(i)
+
+        login_results, cars_latencies = [], []
+        stop = asyncio.Event()
+        readers = [asyncio.create_task(cars_worker(client, token, stop, cars_latencies))
+                   for _ in range(args.readers)]
+
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            login_worker(client, queue, args.email, args.password, login_results)
+            for _ in range(args.concurrency)
+        ])
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await asyncio.gather(*readers)
+
+    ok = sum(1 for code, _ in login_results if code == 200)
+    rejected = sum(1 for code, _ in login_results if code == 503)
+    login_latencies = [latency for _, latency in login_results]
+
+    print(f"logins:            {len(login_results)} за {elapsed:.2f} c "
+          f"({len(login_results) / elapsed:.1f} rps), успешно {ok}, отказов 503: {rejected}")
+    print(f"login p50/p99:     {statistics.median(login_latencies) * 1000:.1f} / "
+          f"{percentile(login_latencies, 99) * 1000:.1f} мс")
+    print(f"/cars без нагрузки p50/p99: {statistics.median(baseline) * 1000:.1f} / "
+          f"{percentile(baseline, 99) * 1000:.1f} мс")
+    print(f"/cars во время шторма p50/p99: {statistics.median(cars_latencies) * 1000:.1f} / "
+          f"{percentile(cars_latencies, 99) * 1000:.1f} мс ({len(cars_latencies)} запросов)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--readers", type=int, default=4)
+    asyncio.run(main(parser.parse_args()))
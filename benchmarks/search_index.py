@@ -0,0 +1,79 @@
+"""
+Задержка поиска по триграммному индексу на синтетических данных.
+
+Индекс строится из сгенерированных клиентов и автомобилей без БД, затем
+прогоняются типичные запросы строки поиска: часть фамилии, хвост
+телефона, фрагмент номера и VIN, модель. Печатается время построения
+и p50/p99 на запрос.
+
+Пример:
+    python benchmarks/search_index.py --clients 100000 --cars 50000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from service.SearchIndex import SearchIndex, client_document, car_document  # noqa: E402
+
+SURNAMES = ['Иванов', 'Петров', 'Сидоров', 'Смирнов', 'Кузнецов', 'Попов', 'Васильев', 'Соколов', 'Михайлов']
+NAMES = ['Иван', 'Пётр', 'Алексей', 'Денис', 'Дмитрий', 'Сергей', 'Андрей', 'Николай']
+MODELS = ['Toyota Camry', 'Toyota Supra MK4', 'Nissan Silvia S15', 'Kia Rio', 'Hyundai Solaris', 'Lada Vesta']
+PLATE_LETTERS = 'АВЕКМНОРСТУХ'
+VIN_CHARS = 'ABCDEFGHJKLMNPRSTUVWXYZ0123456789'
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def documents(clients: int, cars: int, rng: random.Random):
+    for client_id in range(1, clients + 1):
+        name = f"{rng.choice(SURNAMES)}{rng.randint(1, 999)} {rng.choice(NAMES)}"
+        yield client_document(client_id, name, f"89{client_id:09d}", f"@user{client_id}", f"ГИБДД {client_id:06d}")
+    for car_id in range(1, cars + 1):
+        letters = ''.join(rng.choice(PLATE_LETTERS) for _ in range(3))
+        plate = f"{letters[0]}{car_id % 1000:03d}{letters[1:]}{rng.randint(10, 199)}"
+        vin = ''.join(rng.choice(VIN_CHARS) for _ in range(17))
+        yield car_document(car_id, plate, vin, rng.choice(MODELS))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=100_000)
+    parser.add_argument('--cars', type=int, default=50_000)
+    parser.add_argument('--queries', type=int, default=2_000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+
+    index = SearchIndex(ttl=0)
+    generated = list(documents(args.clients, args.cars, rng))
+    started = time.perf_counter()
+    index.build(generated)
+    print(f"Построение: {len(index)} документов за {time.perf_counter() - started:.2f} с")
+
+    queries = {
+        'фамилия': lambda: rng.choice(SURNAMES)[:5],
+        'хвост телефона': lambda: f"{rng.randint(1, args.clients):09d}"[-6:],
+        'номер': lambda: f"{rng.randint(0, 999):03d}",
+        'модель': lambda: rng.choice(MODELS).split()[-1],
+        'промах': lambda: 'ЯЯЯЯ',
+    }
+    for name, make_query in queries.items():
+        latencies = []
+        for _ in range(args.queries // len(queries)):
+            query = make_query()
+            started = time.perf_counter()
+            index.search(query, limit=20)
+            latencies.append((time.perf_counter() - started) * 1000)
+        print(f"{name:>16}: p50 {statistics.median(latencies):6.2f} мс, p99 {percentile(latencies, 99):6.2f} мс")
+
+
+if __name__ == '__main__':
+    main()
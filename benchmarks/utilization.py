@@ -0,0 +1,69 @@
+"""
+Время расчёта загрузки парка по интервалам аренд на синтетических данных.
+
+Генерируются аренды длиной от часа до двух недель за три года, часть из них
+пересекается внутри одного автомобиля. Замеряется busy_seconds (занятость
+каждого автомобиля в окне) и суммирование по моделям — то, что делает
+UtilizationService после загрузки столбцов из БД, — и отдельно перевод
+дат из объектов datetime, какими их возвращает драйвер, в секунды.
+
+Пример:
+    python benchmarks/utilization.py --rentals 1000000 --cars 10000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from service.UtilizationService import busy_seconds, to_seconds, EPOCH  # noqa: E402
+
+DAY = 86400
+HISTORY_DAYS = 3 * 365
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rentals', type=int, default=1_000_000)
+    parser.add_argument('--cars', type=int, default=10_000)
+    parser.add_argument('--models', type=int, default=50)
+    parser.add_argument('--window-days', type=int, default=365)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+    rng = np.random.default_rng(args.seed)
+
+    car_index = rng.integers(0, args.cars, args.rentals)
+    starts = rng.integers(0, HISTORY_DAYS * DAY, args.rentals)
+    ends = starts + rng.integers(3600, 14 * DAY, args.rentals)
+    car_models = rng.integers(0, args.models, args.cars)
+    window_start = (HISTORY_DAYS - args.window_days) * DAY
+    window_end = HISTORY_DAYS * DAY
+
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        busy = busy_seconds(car_index, starts, ends, window_start, window_end, args.cars)
+        model_busy = np.bincount(car_models, weights=busy, minlength=args.models)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    moments = [EPOCH + timedelta(seconds=int(second)) for second in starts]
+    started = time.perf_counter()
+    to_seconds(moments, len(moments))
+    conversion = (time.perf_counter() - started) * 1000
+
+    window = window_end - window_start
+    print(f"{args.rentals} аренд, {args.cars} автомобилей, окно {args.window_days} дней")
+    print(f"Загрузка парка: {busy.sum() / (args.cars * window):.1%}, "
+          f"моделей: {len(model_busy)}")
+    print(f"Расчёт: медиана {statistics.median(timings):.0f} мс, максимум {max(timings):.0f} мс")
+    print(f"Перевод {len(moments)} дат в секунды: {conversion:.0f} мс")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,48 @@
-from .connection import SessionLocal, get_db
-from .data import get_data
+"""
+Настройки и подключение к БД. Имена подгружаются при первом обращении:
+main берёт отсюда только settings, и импорт пакета не тянет SQLAlchemy,
+модели и асинхронный драйвер.
+"""
+import importlib
+
+# Имя -> модуль пакета, в котором оно определено
+_EXPORTS = {
+    'SessionLocal': 'connection',
+    'get_engine': 'connection',
+    'get_read_router': 'connection',
+    'get_db': 'connection',
+    'get_async_db': 'connection',
+    'get_async_sessionmaker': 'connection',
+    'get_data': 'data',
+    'get_optional_data': 'data',
+    'settings': 'data',
+    'Settings': 'data',
+    'pool_metrics': 'pool_metrics',
+    'async_pool_metrics': 'pool_metrics',
+    'PoolMetrics': 'pool_metrics',
+}
 
 __all__ = [
     'SessionLocal',
+    'get_engine',
+    'get_read_router',
+    'PoolMetrics',
+    'pool_metrics',
+    'async_pool_metrics',
+    'Settings',
+    'settings',
     'get_data',
-    'get_db'
-]
\ No newline at end of file
+    'get_optional_data',
+    'get_db',
+    'get_async_db',
+    'get_async_sessionmaker'
+]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'{__name__}.{module}'), name)
+    globals()[name] = value
+    return value
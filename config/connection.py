@@ -1,23 +1,50 @@
-from .data import get_data
+from .data import settings
+from .pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, PoolMetrics, async_pool_metrics, pool_metrics
+from .replicas import ReplicaRouter, RoutingSession
 
+import threading
 import urllib.parse
-from typing import Any, Generator
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Generator, List, Optional
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.engine import Engine
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncEngine, AsyncSession
+
 class DatabaseConfig:
     """
     Класс для загрузки конфигурации подключения к БД из JSON-файла
     и создания синхронного или асинхронного движка SQLAlchemy.
+    Помимо MSSQL поддерживается встроенный SQLite (backend="sqlite",
+    path — файл или ":memory:"): схема создаётся из entity.Base.metadata,
+    что позволяет гонять тесты и бенчмарки без SQL Server.
     """
     def __init__(self, config_: dict, is_local: bool = True):
         self.config = config_
         self.is_local = is_local
 
+    @property
+    def backend(self) -> str:
+        """mssql (по умолчанию) или sqlite"""
+        return self.config.get('backend', 'mssql')
+
+    @property
+    def is_memory(self) -> bool:
+        return self.backend == 'sqlite' and self.config.get('path', ':memory:') == ':memory:'
+
+    def _build_sqlite_string(self, is_async: bool = False) -> str:
+        driver_name = "sqlite+aiosqlite" if is_async else "sqlite"
+        if self.is_memory:
+            return f"{driver_name}://"
+        return f"{driver_name}:///{self.config['path']}"
+
     def _build_string(self, is_async: bool = False) -> str:
+        if self.backend == 'sqlite':
+            return self._build_sqlite_string(is_async)
+
         server = self.config['server']
         port = self.config.get('port', 1433)  # по умолчанию 1433
         database = self.config['name']
@@ -30,7 +57,7 @@ class DatabaseConfig:
 
         # Выбираем префикс в зависимости от типа подключения
         if is_async:
-            driver_name = "mssql+aiomssql"
+            driver_name = "mssql+aioodbc"
         else:
             driver_name = "mssql+pyodbc"
 
@@ -47,25 +74,186 @@ class DatabaseConfig:
             )
         return connection_string
 
-    def sync_engine(self, echo: bool = False) -> Engine:
+    def _pool_options(self) -> dict:
+        """Параметры пула соединений из секции database.pool"""
+        pool = self.config.get('pool', {})
+        return dict(
+            pool_size=pool.get('size', 5),
+            max_overflow=pool.get('max-overflow', 10),
+            pool_timeout=pool.get('timeout-seconds', 30),
+            pool_recycle=pool.get('recycle-seconds', -1),
+            pool_pre_ping=pool.get('pre-ping', False),
+        )
+
+    def _engine_options(self, is_async: bool = False) -> dict:
+        if self.backend != 'sqlite':
+            return dict(connect_args={'charset': ' cp1251'}, **self._pool_options())
+
+        if self.is_memory:
+            # Одно соединение на процесс, иначе каждое соединение видит свою пустую БД
+            return dict(connect_args={'check_same_thread': False}, poolclass=StaticPool)
+        return dict(connect_args={'check_same_thread': False}, **self._pool_options())
+
+    def sync_engine(
+            self, echo: bool = False, metrics: Optional[PoolMetrics] = pool_metrics, create_schema: bool = True
+    ) -> Engine:
+        """
+        Синхронный движок. Для SQLite схема по умолчанию создаётся сразу
+        из моделей; create_schema=False оставляет её миграциям.
+        """
         connection_string = self._build_string(is_async=False)
-        engine = create_engine(connection_string, echo=echo, connect_args={'charset': ' cp1251'})
+        options = self._engine_options()
+        options.setdefault('poolclass', InstrumentedQueuePool)
+        engine = create_engine(connection_string, echo=echo, **options)
+        if self.backend == 'sqlite':
+            _setup_sqlite(engine)
+            if create_schema:
+                # Модели нужны только здесь: без них импорт config не тянет entity
+                from entity import Base
+                Base.metadata.create_all(engine)
+        if metrics is not None:
+            metrics.attach(engine)
         return engine
 
-    def async_engine(self, echo: bool = False) -> AsyncEngine:
+    def replica_engines(self, echo: bool = False) -> List[Engine]:
+        """
+        Движки реплик для чтения из списка database.replicas.
+        Элемент списка — готовый DSN SQLAlchemy или словарь с полями,
+        которые отличаются от основного сервера (server, port, ...).
+        """
+        engines = []
+        for replica in self.config.get('replicas', []):
+            if isinstance(replica, str):
+                engine = create_engine(replica, echo=echo, **self._engine_options())
+            else:
+                replica_config = DatabaseConfig({**self.config, **replica, 'replicas': []}, is_local=False)
+                engine = replica_config.sync_engine(echo, metrics=None)
+            engines.append(engine)
+        return engines
+
+    def async_engine(self, echo: bool = False, metrics: Optional[PoolMetrics] = async_pool_metrics) -> 'AsyncEngine':
+        """
+        Асинхронный движок. SQLite подходит только файловый: база в памяти
+        у асинхронного драйвера была бы отдельной и пустой.
+        """
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        if self.is_memory:
+            raise ValueError("Асинхронному движку SQLite нужна файловая база (database.path), а не :memory:")
         connection_string = self._build_string(is_async=True)
-        engine = create_async_engine(connection_string, echo=echo, connect_args={'charset': ' cp1251'})
+        engine = create_async_engine(
+            connection_string, echo=echo, poolclass=InstrumentedAsyncQueuePool, **self._engine_options(is_async=True)
+        )
+        if self.backend == 'sqlite':
+            _setup_sqlite(engine.sync_engine)
+        if metrics is not None:
+            metrics.attach(engine.sync_engine)
         return engine
 
 
-config = DatabaseConfig(get_data('database')['database'], True)
+def _setup_sqlite(engine: Engine):
+    """
+    Включаем внешние ключи (как в MSSQL) и берём управление транзакциями
+    на себя: иначе pysqlite ломает SAVEPOINT, на которых держится откат
+    изменений после каждого теста.
+    """
+
+    @event.listens_for(engine, 'connect')
+    def _on_connect(dbapi_connection, _):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+
+    @event.listens_for(engine, 'begin')
+    def _on_begin(connection):
+        connection.exec_driver_sql('BEGIN')
+
+
+class LazySessionmaker(sessionmaker):
+    """
+    sessionmaker, который создаёт движок при первой сессии, а не при импорте:
+    импорт пакета не читает конфигурацию и не открывает пул соединений.
+    """
+
+    def __call__(self, **local_kw) -> Session:
+        if 'bind' not in self.kw:
+            get_engine()
+        return super().__call__(**local_kw)
+
+
+SessionLocal: sessionmaker = LazySessionmaker(class_=RoutingSession)
+
+_engine_lock = threading.Lock()
+_config: Optional[DatabaseConfig] = None
+_engine: Optional[Engine] = None
+_read_router: Optional[ReplicaRouter] = None
+
+
+def get_database_config() -> DatabaseConfig:
+    global _config
+    if _config is None:
+        _config = DatabaseConfig(settings.get('database'), True)
+    return _config
+
+
+def get_engine() -> Engine:
+    """Основной движок; создаётся один раз при первом обращении"""
+    global _engine, _read_router
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                db_config = get_database_config()
+                engine = db_config.sync_engine(echo=False)
+                _read_router = ReplicaRouter(
+                    engine, db_config.replica_engines(echo=False),
+                    retry_after=db_config.config.get('replica-retry-seconds', 30)
+                )
+                SessionLocal.configure(bind=engine, router=_read_router)
+                _engine = engine
+    return _engine
+
+
+def get_read_router() -> ReplicaRouter:
+    get_engine()
+    return _read_router
+
+
+def __getattr__(name: str):
+    # Совместимость со старыми импортами: from config.connection import SyncEngine
+    if name == 'SyncEngine':
+        return get_engine()
+    if name == 'ReadRouter':
+        return get_read_router()
+    if name == 'config':
+        return get_database_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-SyncEngine = config.sync_engine(echo=False)
-SessionLocal: sessionmaker = sessionmaker(bind=SyncEngine)
 
 def get_db() -> Generator[Session, Any, None]:
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Асинхронный движок создаётся при первом запросе: синхронным развертываниям
+# не нужен асинхронный драйвер
+_async_session_factory: Optional['async_sessionmaker'] = None
+
+
+def get_async_sessionmaker() -> 'async_sessionmaker':
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        _async_session_factory = async_sessionmaker(
+            bind=get_database_config().async_engine(echo=False), expire_on_commit=False
+        )
+    return _async_session_factory
+
+
+async def get_async_db() -> AsyncGenerator['AsyncSession', None]:
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -1,8 +1,199 @@
 import json
-file_path = 'config\\config.json'
+import logging
+import os
+import signal
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Путь к файлу можно переопределить переменной окружения,
+# по умолчанию config.json лежит рядом с этим модулем
+CONFIG_PATH_ENV = 'CAR_RENTAL_CONFIG'
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent / 'config.json'
+
+# CAR_RENTAL__AUTH_KEY=... -> data['auth-key'],
+# CAR_RENTAL__DATABASE__SERVER=... -> data['database']['server']
+ENV_PREFIX = 'CAR_RENTAL__'
+
+_MISSING = object()
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(key: str) -> str:
+    return key.replace('-', '_').lower()
+
+
+def _parse_env_value(value: str) -> Any:
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+class Settings:
+    """
+    Конфигурация приложения, общая для всего процесса.
+    Файл разбирается один раз при первом обращении, повторные чтения
+    берут данные из памяти. Переменные окружения с префиксом CAR_RENTAL__
+    перекрывают значения из файла. reload() перечитывает файл без
+    перезапуска: по SIGHUP или при изменении файла (watch). И то и другое
+    выполняет фоновый поток: обработчик сигнала только ставит флаг.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path
+        self._data: Optional[Dict[str, Any]] = None
+        self._mtime: Optional[float] = None
+        self._listeners: List[Callable[['Settings'], None]] = []
+        self._lock = threading.RLock()
+        self._watcher: Optional[threading.Thread] = None
+        self._interval: Optional[float] = None
+        self._wakeup = threading.Event()
+        self._reload_requested = False
+        self._stopping = False
+
+    @property
+    def path(self) -> Path:
+        return Path(self._path or os.environ.get(CONFIG_PATH_ENV) or DEFAULT_CONFIG_PATH)
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        data = self._data
+        if data is None:
+            with self._lock:
+                if self._data is None:
+                    self._load()
+                data = self._data
+        return data
+
+    def _read_file(self) -> Tuple[Dict[str, Any], Optional[float]]:
+        path = self.path
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            # Допускаем конфигурацию только из переменных окружения
+            return {}, None
+
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file), mtime
+
+    @staticmethod
+    def _apply_env_overrides(data: Dict[str, Any]):
+        for name, value in os.environ.items():
+            if not name.startswith(ENV_PREFIX):
+                continue
+
+            *parents, leaf = name[len(ENV_PREFIX):].split('__')
+            target = data
+            for part in parents:
+                key = next((k for k in target if _normalize(k) == part.lower()), part.lower().replace('_', '-'))
+                target = target.setdefault(key, {})
+            key = next((k for k in target if _normalize(k) == leaf.lower()), leaf.lower().replace('_', '-'))
+            target[key] = _parse_env_value(value)
+
+    def _load(self):
+        # Время изменения запоминаем только после разбора: битый файл перечитаем на следующей проверке
+        data, mtime = self._read_file()
+        self._apply_env_overrides(data)
+        self._data, self._mtime = data, mtime
+
+    def reload(self):
+        """Перечитать файл и уведомить подписчиков; при ошибке разбора данные остаются прежними"""
+        with self._lock:
+            self._load()
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(self)
+
+    def reload_if_changed(self) -> bool:
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if self._data is not None and mtime == self._mtime:
+            return False
+        self.reload()
+        return True
+
+    def subscribe(self, listener: Callable[['Settings'], None]):
+        """Вызывать listener после каждой перезагрузки"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def get(self, key: str, default: Any = _MISSING) -> Any:
+        if default is _MISSING:
+            return self.data[key]
+        return self.data.get(key, default)
+
+    def section(self, *params) -> Dict[str, Any]:
+        data = self.data
+        return {p: data[p] for p in params}
+
+    def install_sighup_handler(self):
+        """Перезагрузка по SIGHUP (только POSIX и только из главного потока)"""
+        if not hasattr(signal, 'SIGHUP') or threading.current_thread() is not threading.main_thread():
+            return
+        signal.signal(signal.SIGHUP, self._request_reload)
+        self._start_watcher()
+
+    def _request_reload(self, *_):
+        # Обработчик сигнала: ни разбора файла, ни подписчиков, только флаг для фонового потока
+        self._reload_requested = True
+        self._wakeup.set()
+
+    def watch(self, interval: float = 2.0):
+        """Фоновая проверка времени изменения файла"""
+        self._interval = interval
+        if not self._start_watcher():
+            self._wakeup.set()  # Поток ждал только сигнала: пусть начнёт проверять по интервалу
+
+    def stop_watching(self, timeout: Optional[float] = None):
+        """Остановить фоновый поток (перезагрузка по SIGHUP тоже прекращается)"""
+        watcher = self._watcher
+        if watcher is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        watcher.join(timeout)
+        self._watcher = None
+
+    def _start_watcher(self) -> bool:
+        if self._watcher is not None:
+            return False
+        self._stopping = False
+        self._wakeup.clear()
+        self._watcher = threading.Thread(target=self._watch_loop, name='settings-watcher', daemon=True)
+        self._watcher.start()
+        return True
+
+    def _watch_loop(self):
+        while True:
+            # Без интервала (только SIGHUP) ждём, пока разбудят
+            self._wakeup.wait(self._interval)
+            self._wakeup.clear()
+            if self._stopping:
+                return
+            requested, self._reload_requested = self._reload_requested, False
+            try:
+                if requested:
+                    self.reload()
+                else:
+                    self.reload_if_changed()
+            except (OSError, ValueError) as error:
+                # Файл сохраняется не атомарно: остаёмся на прежних данных и пробуем на следующем шаге
+                logger.warning("Не удалось перечитать %s: %s", self.path, error)
+            except Exception:
+                logger.exception("Ошибка подписчика при перезагрузке настроек")
+
+
+settings = Settings()
+
 
 def get_data(*params):
-    with open(file_path, 'r', encoding='utf-8') as file:
-        data = json.load(file)
+    return settings.section(*params)
+
 
-    return {p: data[p] for p in params}
+def get_optional_data(param, default=None):
+    """Как get_data, но для необязательных секций конфигурации"""
+    return settings.get(param, default)
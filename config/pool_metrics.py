@@ -0,0 +1,121 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """
+    Счётчики пула соединений, собранные из событий пула.
+    Нужны, чтобы подобрать число воркеров под лимит соединений БД.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pool = None
+        self.connections_created = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.checkout_timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    @property
+    def attached(self) -> bool:
+        return self._pool is not None
+
+    def attach(self, engine: Engine):
+        """Подписаться на события пула движка (для асинхронного — его sync_engine)"""
+        self._pool = engine.pool
+        if isinstance(engine.pool, _InstrumentedPool):
+            engine.pool.metrics = self
+
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', self._on_checkin)
+
+    def _on_connect(self, *_):
+        with self._lock:
+            self.connections_created += 1
+
+    def _on_checkout(self, *_):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, *_):
+        with self._lock:
+            self.checkins += 1
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.checkout_timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        pool = self._pool
+        with self._lock:
+            waits = self.checkouts + self.checkout_timeouts
+            result = {
+                'connections_created': self.connections_created,
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'checkout_timeouts': self.checkout_timeouts,
+                'wait_avg_ms': round(self.wait_total / waits * 1000, 3) if waits else 0.0,
+                'wait_max_ms': round(self.wait_max * 1000, 3),
+            }
+
+        if isinstance(pool, QueuePool):
+            result.update(
+                pool_size=pool.size(),
+                checked_out=pool.checkedout(),
+                overflow=max(pool.overflow(), 0),
+                idle=pool.checkedin(),
+            )
+        return result
+
+
+class _InstrumentedPool:
+    """Примесь к QueuePool: замеряет ожидание свободного соединения и таймауты"""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+
+        if self.metrics is not None:
+            self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # При dispose() движок пересоздаёт пул: переносим метрики
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics._pool = pool
+        return pool
+
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    """Тот же замер для пула асинхронного движка"""
+
+
+pool_metrics = PoolMetrics()
+# Асинхронный движок держит отдельный пул со своими соединениями
+async_pool_metrics = PoolMetrics()
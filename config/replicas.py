@@ -0,0 +1,181 @@
+import functools
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+
+class ReplicaRouter:
+    """
+    Круговой выбор реплики для чтения с учётом её здоровья.
+    Реплика, на которой упало соединение, выводится из ротации; не раньше
+    чем через retry_after секунд её проверяет (SELECT 1) фоновый поток,
+    и только он возвращает реплику в ротацию. Выбор реплики никогда не ждёт
+    сети. Если живых реплик нет, чтение идёт на основной сервер.
+    """
+
+    def __init__(self, primary: Engine, replicas: Optional[List[Engine]] = None, retry_after: float = 30.0):
+        self.primary = primary
+        self.replicas = list(replicas or [])
+        self.retry_after = retry_after
+
+        self._cycle = itertools.cycle(range(len(self.replicas))) if self.replicas else None
+        self._down_until: Dict[int, float] = {}
+        self._probing: Set[int] = set()
+        self._lock = threading.Lock()
+
+        for replica in self.replicas:
+            event.listen(replica, 'handle_error', self._on_error)
+
+    def _on_error(self, context):
+        # Обрыв соединения или отказ в подключении — реплика недоступна
+        if context.is_disconnect or context.connection is None:
+            self.mark_down(context.engine)
+
+    def mark_down(self, engine: Engine):
+        with self._lock:
+            for index, replica in enumerate(self.replicas):
+                if replica is engine:
+                    self._down_until[index] = time.monotonic() + self.retry_after
+
+    def _is_healthy(self, index: int, now: float) -> bool:
+        """Вызывается под self._lock; проверку запускает в фоне и сам её не ждёт"""
+        down_until = self._down_until.get(index)
+        if down_until is None:
+            return True
+        if now >= down_until and index not in self._probing:
+            self._probing.add(index)
+            threading.Thread(target=self.probe, args=(index,), name=f'replica-probe-{index}', daemon=True).start()
+        return False
+
+    def probe(self, index: int) -> bool:
+        """Проверить реплику SELECT 1 и вернуть её в ротацию или продлить простой"""
+        try:
+            with self.replicas[index].connect() as connection:
+                connection.execute(text('SELECT 1'))
+            healthy = True
+        except Exception:
+            healthy = False
+        with self._lock:
+            self._probing.discard(index)
+            if healthy:
+                self._down_until.pop(index, None)
+            else:
+                self._down_until[index] = time.monotonic() + self.retry_after
+        return healthy
+
+    def get_read_engine(self) -> Engine:
+        if not self.replicas:
+            return self.primary
+
+        now = time.monotonic()
+        with self._lock:
+            for _ in range(len(self.replicas)):
+                index = next(self._cycle)
+                if self._is_healthy(index, now):
+                    return self.replicas[index]
+        return self.primary
+
+    def health(self) -> List[dict]:
+        with self._lock:
+            return [
+                dict(url=replica.url.render_as_string(hide_password=True),
+                     healthy=index not in self._down_until)
+                for index, replica in enumerate(self.replicas)
+            ]
+
+
+class RoutingSession(Session):
+    """
+    Сессия основного сервера, которая умеет читать с реплик.
+    Методы @read_only выполняются в отдельной сессии реплики: её соединение
+    не входит в транзакцию основной сессии, поэтому отказ реплики не портит
+    транзакцию и не трогает несохранённые изменения. Пока в текущей
+    транзакции есть записи, чтение остаётся на основном сервере, чтобы запрос
+    видел собственные изменения; после commit или rollback реплики снова доступны.
+    Сессия с info['read_only'] (выгрузки) целиком читает с реплики.
+    """
+
+    def __init__(self, *args, router: Optional[ReplicaRouter] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.router = router
+        self._replica_sessions: Dict[Engine, Session] = {}
+        event.listen(self, 'after_flush', self._on_flush)
+        event.listen(self, 'after_transaction_end', self._on_transaction_end)
+
+    @staticmethod
+    def _on_flush(session, _):
+        session.info['has_writes'] = True
+
+    @staticmethod
+    def _on_transaction_end(session, transaction):
+        if transaction.parent is None:
+            session.info.pop('has_writes', None)
+
+    def replica_session(self) -> Optional[Session]:
+        """Сессия живой реплики для чтения или None, если читать нужно с основного сервера"""
+        if self.router is None or self.info.get('has_writes') or self.new or self.dirty or self.deleted:
+            return None
+        engine = self.router.get_read_engine()
+        if engine is self.router.primary:
+            return None
+        replica_session = self._replica_sessions.get(engine)
+        if replica_session is None:
+            replica_session = self._replica_sessions[engine] = Session(bind=engine, autoflush=False)
+        return replica_session
+
+    def discard_replica_session(self, replica_session: Session):
+        """Закрыть сессию отказавшей реплики: следующее чтение возьмёт новое соединение"""
+        self._replica_sessions.pop(replica_session.bind, None)
+        replica_session.close()
+
+    def close(self):
+        for replica_session in self._replica_sessions.values():
+            replica_session.close()
+        self._replica_sessions.clear()
+        super().close()
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (self.router is not None
+                and self.info.get('read_only')
+                and not self.info.get('has_writes')
+                and not self._flushing
+                and isinstance(clause, Select)):
+            return self.router.get_read_engine()
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+def read_only(method):
+    """
+    Помечает метод репозитория как чистое чтение: его запросы можно
+    выполнять на реплике. На время вызова репозиторий работает с сессией
+    реплики; при ошибке реплика выводится из ротации, а запрос повторяется
+    на основной сессии, в которой ничего не откатывается.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        session = self.session_db
+        if not isinstance(session, RoutingSession):
+            return method(self, *args, **kwargs)
+        replica_session = session.replica_session()
+        if replica_session is None:
+            return method(self, *args, **kwargs)
+
+        self.session_db = replica_session
+        try:
+            return method(self, *args, **kwargs)
+        except OperationalError:
+            session.router.mark_down(replica_session.bind)
+            session.discard_replica_session(replica_session)
+        finally:
+            self.session_db = session
+        return method(self, *args, **kwargs)
+
+    return wrapper
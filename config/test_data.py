@@ -17,6 +17,12 @@ class TestData:
         self.user_service = UserService(session_db)
         self.rental_service = RentalService(session_db)
 
+        # Созданные записи: тесты берут идентификаторы отсюда, а не из констант
+        self.cars = []
+        self.users = []
+        self.clients = []
+        self.rentals = []
+
     def load(self):
 
         cars = [
@@ -57,7 +63,7 @@ class TestData:
             )
         ]
         for car_dto in cars:
-            self.car_service.create_car(car_dto)
+            self.cars.append(self.car_service.create_car(car_dto))
 
         users = [
             UserCreateDTO(
@@ -74,7 +80,7 @@ class TestData:
             )
         ]
         for user_dto in users:
-            self.user_service.create_user(user_dto)
+            self.users.append(self.user_service.create_user(user_dto))
 
         clients = [
             ClientCreateDTO(
@@ -91,25 +97,26 @@ class TestData:
             )
         ]
         for client_dto in clients:
-            self.client_service.create_client(client_dto)
+            self.clients.append(self.client_service.create_client(client_dto))
 
         rentals = [
             RentalCreateDTO(
-                car_id=26,      # Nissan Silvia S15
-                client_id=6,    # Иванов Иван Иванович
-                user_id=2,      # Петров Дмитрий, ADMIN
+                car_id=self.cars[0].car_id,          # Nissan Silvia S15
+                client_id=self.clients[0].client_id,  # Иванов Иван Иванович
+                user_id=self.users[0].user_id,        # Петров Дмитрий, ADMIN
                 start_date=datetime.now(timezone.utc) + timedelta(days=3),
                 end_date=datetime.now(timezone.utc) + timedelta(days=5),
                 status=RentalStatusEnum.AWAITING,
             ),
             RentalCreateDTO(
-                car_id=27,      # Toyota Supra MK4
-                client_id=7,    # Какой-то Случайный человек
-                user_id=3,      # Бутусов Денис Николаевич
+                car_id=self.cars[1].car_id,          # Toyota Supra MK4
+                client_id=self.clients[1].client_id,  # Бутусов Денис Николаевич
+                user_id=self.users[1].user_id,        # Какой-то Случайный человек
                 start_date=datetime.now(timezone.utc) + timedelta(days=9),
                 end_date=datetime.now(timezone.utc) + timedelta(days=11),
                 status=RentalStatusEnum.AWAITING
             )
         ]
         for rental_dto in rentals:
-            self.rental_service.create_rental(rental_dto)
\ No newline at end of file
+            self.rentals.append(self.rental_service.create_rental(rental_dto))
+        return self
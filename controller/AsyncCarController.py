@@ -0,0 +1,34 @@
+from service import get_async_car_service, get_current_user_async, get_page_request, get_car_filter
+from service import AsyncCarService
+from dto import CarWithSpecsResponseDTO, CarFilterDTO, PageDTO, PageRequestDTO
+
+from fastapi import APIRouter, Depends, HTTPException
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter(
+    prefix="/cars",
+    tags=["Автомобили"],
+    dependencies=[Depends(get_current_user_async)],
+)
+
+
+@router.get("/filter", response_model=PageDTO[CarWithSpecsResponseDTO])
+async def get_cars_by_filter_async(
+        car_filter: CarFilterDTO = Depends(get_car_filter),
+        page: PageRequestDTO = Depends(get_page_request),
+        service: AsyncCarService = Depends(get_async_car_service)
+):
+    try:
+        result = await service.get_cars_page(car_filter, page)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
+    return result
+
+
+@router.get("/{car_id:int}", response_model=CarWithSpecsResponseDTO)
+async def get_car_by_id_async(car_id: int, service: AsyncCarService = Depends(get_async_car_service)):
+    try:
+        return await service.get_car_by_id(car_id)
+    except ValueError as e:
+        raise HTTPException(404, detail=str(e))
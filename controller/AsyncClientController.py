@@ -0,0 +1,47 @@
+from service import get_async_client_service, get_current_user_async, get_page_request, get_client_filter
+from service import AsyncClientService
+from dto import PageDTO, PageRequestDTO
+from dto import ClientResponseDTO, ClientFilterDTO
+
+from fastapi import APIRouter, Depends, HTTPException
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter(
+    prefix="/clients",
+    tags=["Клиенты"],
+    dependencies=[Depends(get_current_user_async)]
+)
+
+
+@router.get("/{client_id:int}", response_model=ClientResponseDTO)
+async def get_client_by_id_async(client_id: int, service: AsyncClientService = Depends(get_async_client_service)):
+    try:
+        return await service.get_client_by_id(client_id)
+    except ValueError as e:
+        raise HTTPException(404, detail=str(e))
+
+
+@router.get("/name", response_model=PageDTO[ClientResponseDTO])
+async def get_by_name_async(
+        name: str,
+        page: PageRequestDTO = Depends(get_page_request),
+        service: AsyncClientService = Depends(get_async_client_service)
+):
+    try:
+        return await service.get_page_by_name(name, page)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
+
+
+@router.get("/filter", response_model=PageDTO[ClientResponseDTO])
+async def get_client_by_filter_async(
+        client_filter: ClientFilterDTO = Depends(get_client_filter),
+        page: PageRequestDTO = Depends(get_page_request),
+        service: AsyncClientService = Depends(get_async_client_service)
+):
+    try:
+        result = await service.get_clients_page(client_filter, page)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
+    return result
@@ -0,0 +1,35 @@
+from service import get_async_rental_service, get_current_user_async, get_page_request
+from service import AsyncRentalService
+from dto import RentalWithRelationsDTO, RentalFilterDTO, PageDTO, PageRequestDTO
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Annotated
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter(
+    prefix="/rentals",
+    tags=["Бронирования"],
+    dependencies=[Depends(get_current_user_async)]
+)
+
+
+@router.get("/filter", response_model=PageDTO[RentalWithRelationsDTO])
+async def get_rentals_by_filter_async(
+        rentals_filter: Annotated[RentalFilterDTO, Query()],
+        page: PageRequestDTO = Depends(get_page_request),
+        service: AsyncRentalService = Depends(get_async_rental_service)
+):
+    try:
+        result = await service.get_rentals_page(rentals_filter, page)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
+    return result
+
+
+@router.get("/{rent_id:int}", response_model=RentalWithRelationsDTO)
+async def get_rent_by_id_async(rent_id: int, service: AsyncRentalService = Depends(get_async_rental_service)):
+    try:
+        return await service.get_rent_by_id(rent_id)
+    except ValueError as e:
+        raise HTTPException(404, detail=str(e))
@@ -0,0 +1,31 @@
+from service import get_async_user_service, get_current_user_async
+from service import AsyncUserService
+from dto import UserResponseDTO
+
+from fastapi import APIRouter, Depends, HTTPException
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter(
+    prefix="/users",
+    tags=["Пользователи"],
+    dependencies=[Depends(get_current_user_async)]
+)
+
+
+@router.get("/{user_id:int}", response_model=UserResponseDTO)
+async def get_by_user_id_async(user_id: int, service: AsyncUserService = Depends(get_async_user_service)):
+    try:
+        return await service.get_user_by_id(user_id)
+    except ValueError as e:
+        raise HTTPException(404, detail=str(e))
+
+
+@router.get("/{user_id:int}/exist")
+async def user_exist_async(user_id: int, service: AsyncUserService = Depends(get_async_user_service)):
+    return await service.exists(user_id)
+
+
+@router.get("/count")
+async def users_count_async(service: AsyncUserService = Depends(get_async_user_service)):
+    return dict(count=await service.count_all())
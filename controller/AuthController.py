@@ -1,8 +1,11 @@
 from service import get_current_user, create_access_token, UserDetailsService, get_auth_service
+from service.LoginThrottle import login_throttle
 from dto import UserLoginResponseDTO
+from utils import HashingOverloadError
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
+from math import ceil
 
 # Применяем авторизацию КО ВСЕМ маршрутам этого роутера
 router = APIRouter(
@@ -12,30 +15,45 @@ router = APIRouter(
 
 
 @router.post("/login")
-def login(
+async def login(
+        request: Request,
         form_data: OAuth2PasswordRequestForm = Depends(),
         auth_service: UserDetailsService = Depends(get_auth_service)
 ):
-    # 1. Проверяем учетные данные через ваш сервис
     email, password = form_data.username, form_data.password
-    is_valid = auth_service.check_authorization(email, password)
+    client_ip = request.client.host if request.client else None
 
-    if not is_valid:
+    # 1. Отсекаем перебор паролей до обращения к БД и PBKDF2.
+    # Попытка засчитывается сразу: одновременные запросы не проскочат лимит, пока идёт хеширование
+    retry_after, attempt = login_throttle.reserve(email, client_ip)
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Слишком много попыток входа, попробуйте позже",
+            headers={"Retry-After": str(ceil(retry_after))},
+        )
+
+    # 2. Проверяем учетные данные: один запрос за id и хешем
+    try:
+        user_id = await auth_service.authenticate_async(email, password)
+    except HashingOverloadError as e:
+        login_throttle.refund(email, client_ip, attempt)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+
+    if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Неверный email или пароль",
             headers={"WWW-Authenticate": "Bearer"},
         )
-
-    # 2. Получаем пользователя из репозитория, чтобы взять его ID
-    # В вашем UserDetailsService стоит добавить метод получения по email
-    user_record = auth_service.get_user_by_email(email)
-
-    if not user_record:
-        raise HTTPException(status_code=404, detail="Пользователь не найден")
+    login_throttle.register_success(email, client_ip, attempt)
 
     # 3. Создаем JWT токен, передавая ID пользователя в поле "sub"
-    access_token = create_access_token(data={"sub": str(user_record.user_id)})
+    access_token = create_access_token(data={"sub": str(user_id)})
 
     return dict(access_token=access_token, token_type="bearer")
 
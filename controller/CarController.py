@@ -1,9 +1,13 @@
-from service import get_car_service, get_current_user
-from service import CarService
+from service import get_car_service, get_export_service, get_current_user
+from service import CarService, ExportService
+from service.ExportService import MEDIA_TYPES
 from dto import (CarCreateDTO, CarWithSpecsUpdateDTO, CarWithSpecsResponseDTO,
-                 CarFilterDTO, CarResponseDTO)
+                 CarFilterDTO, CarResponseDTO, PageDTO, PageRequestDTO, ExportRequestDTO,
+                 CarModelSuggestionDTO, CarStatsDTO)
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from datetime import datetime
 from typing import List
 import logging
 
@@ -15,24 +19,74 @@ router = APIRouter(
 )
 
 
-@router.get("/filter", response_model=List[CarWithSpecsResponseDTO])
+@router.get("/filter", response_model=PageDTO[CarWithSpecsResponseDTO])
 def get_cars_by_filter(
         car_filter: CarFilterDTO = Depends(),
+        page: PageRequestDTO = Depends(),
         service: CarService = Depends(get_car_service)
 ):
+    """Страница автомобилей; следующая запрашивается с cursor=next_cursor"""
     try:
-
-        result = service.get_cars_by_filter(cars_filter=car_filter)
+        result = service.get_cars_page(car_filter, page)
     except ValueError as e:
-        raise HTTPException(404, detail=str(e))
+        raise HTTPException(400, detail=str(e))
     return result
 
 
+@router.get("/export", response_class=StreamingResponse)
+def export_cars(
+        car_filter: CarFilterDTO = Depends(),
+        export: ExportRequestDTO = Depends(),
+        service: ExportService = Depends(get_export_service)
+):
+    """Все автомобили по фильтру потоком NDJSON или CSV, без страниц"""
+    try:
+        rows = service.export_cars(car_filter, export.format)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
+    return StreamingResponse(rows, media_type=MEDIA_TYPES[export.format], headers={
+        "Content-Disposition": f'attachment; filename="cars.{export.format.value}"'
+    })
+
+
 @router.get("/available", response_model=List[CarWithSpecsResponseDTO])
 def get_available_cars(service: CarService = Depends(get_car_service)):
     return service.get_available_cars()
 
 
+@router.get("/free", response_model=List[CarWithSpecsResponseDTO])
+def get_free_cars(
+        start: datetime = Query(...),
+        end: datetime = Query(...),
+        car_filter: CarFilterDTO = Depends(),
+        service: CarService = Depends(get_car_service)
+):
+    """Автомобили без аренд на весь период [start, end] (с точностью до суток) с фильтрами как у /filter"""
+    try:
+        return service.get_free_cars(start, end, car_filter)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
+
+
+@router.get("/stats", response_model=CarStatsDTO)
+def get_car_stats(
+        top: int = Query(10, gt=0, le=100),
+        service: CarService = Depends(get_car_service)
+):
+    """Число автомобилей по статусам, самые дорогие и самые дешёвые доступные"""
+    return service.get_stats(top)
+
+
+@router.get("/models", response_model=List[CarModelSuggestionDTO])
+def get_model_suggestions(
+        prefix: str = Query("", description="Начало любого слова модели"),
+        limit: int = Query(10, gt=0, le=50),
+        service: CarService = Depends(get_car_service)
+):
+    """Подсказки для поля model фильтра: модели и число автомобилей, частые первыми"""
+    return service.get_model_suggestions(prefix, limit)
+
+
 @router.get("/price-range", response_model=List[CarWithSpecsResponseDTO])
 def get_cars_by_price(
         min_price: int = Query(..., gt=0),
@@ -1,9 +1,9 @@
 from service import get_client_service, get_current_user
 from service import ClientService
+from dto import PageDTO, PageRequestDTO
 from dto import ClientResponseDTO, ClientCreateDTO, ClientUpdateDTO, ClientFilterDTO
 
 from fastapi import APIRouter, Depends, HTTPException
-from typing import List
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,20 +22,28 @@ def get_client_by_id(client_id: int, service: ClientService = Depends(get_client
         raise HTTPException(404, detail=str(e))
 
 
-@router.get("/name", response_model=List[ClientResponseDTO])
-def get_by_name(name: str, service: ClientService = Depends(get_client_service)):
-    return service.get_by_name(name)
+@router.get("/name", response_model=PageDTO[ClientResponseDTO])
+def get_by_name(
+        name: str,
+        page: PageRequestDTO = Depends(),
+        service: ClientService = Depends(get_client_service)
+):
+    try:
+        return service.get_page_by_name(name, page)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
 
 
-@router.get("/filter", response_model=List[ClientResponseDTO])
+@router.get("/filter", response_model=PageDTO[ClientResponseDTO])
 def get_client_by_filter(
         client_filter: ClientFilterDTO = Depends(),
+        page: PageRequestDTO = Depends(),
         service: ClientService = Depends(get_client_service)
 ):
     try:
-        result = service.get_clients_by_filter(clients_filter_dto=client_filter)
+        result = service.get_clients_page(client_filter, page)
     except ValueError as e:
-        raise HTTPException(404, detail=str(e))
+        raise HTTPException(400, detail=str(e))
     return result
 
 
@@ -0,0 +1,30 @@
+from service import get_current_user
+from config import pool_metrics, async_pool_metrics, get_read_router
+
+from fastapi import APIRouter, Depends
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter(
+    prefix="/health",
+    tags=["Служебное"],
+    dependencies=[Depends(get_current_user)]
+)
+
+
+@router.get("/db-pool")
+def get_db_pool_metrics():
+    """
+    Состояние пула соединений: занятые, overflow, ожидание и таймауты выдачи.
+    У асинхронного движка свой пул, его счётчики — в поле async.
+    """
+    result = pool_metrics.snapshot()
+    if async_pool_metrics.attached:
+        result['async'] = async_pool_metrics.snapshot()
+    return result
+
+
+@router.get("/db-replicas")
+def get_db_replicas_health():
+    """Реплики для чтения и их доступность"""
+    return get_read_router().health()
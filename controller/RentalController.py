@@ -1,11 +1,14 @@
 from datetime import datetime
 
-from service import get_rental_service, get_current_user
-from service import RentalService
-from dto import RentalCreateDTO, RentalUpdateDTO, RentalWithRelationsDTO, RentalFilterDTO
+from service import get_rental_service, get_export_service, get_current_user
+from service import RentalService, ExportService, RentalConflictError
+from service.ExportService import MEDIA_TYPES
+from dto import (RentalCreateDTO, RentalUpdateDTO, RentalWithRelationsDTO, RentalFilterDTO,
+                 PageDTO, PageRequestDTO, ExportRequestDTO)
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List, Annotated
+from fastapi.responses import StreamingResponse
+from typing import Annotated
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,18 +19,35 @@ router = APIRouter(
 )
 
 
-@router.get("/filter", response_model=List[RentalWithRelationsDTO])
+@router.get("/filter", response_model=PageDTO[RentalWithRelationsDTO])
 def get_rentals_by_filter(
         rentals_filter: Annotated[RentalFilterDTO, Query()],
+        page: PageRequestDTO = Depends(),
         service: RentalService = Depends(get_rental_service)
 ):
     try:
-        result = service.get_rentals_by_filter(rentals_filter)
+        result = service.get_rentals_page(rentals_filter, page)
     except ValueError as e:
-        raise HTTPException(404, detail=str(e))
+        raise HTTPException(400, detail=str(e))
     return result
 
 
+@router.get("/export", response_class=StreamingResponse)
+def export_rentals(
+        rentals_filter: Annotated[RentalFilterDTO, Query()],
+        export: ExportRequestDTO = Depends(),
+        service: ExportService = Depends(get_export_service)
+):
+    """Все аренды по фильтру со связями потоком NDJSON или CSV, без страниц"""
+    try:
+        rows = service.export_rentals(rentals_filter, export.format)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
+    return StreamingResponse(rows, media_type=MEDIA_TYPES[export.format], headers={
+        "Content-Disposition": f'attachment; filename="rentals.{export.format.value}"'
+    })
+
+
 @router.post("/", response_model=RentalWithRelationsDTO, status_code=201)
 def create_rental(
         rental_dto: RentalCreateDTO,
@@ -58,8 +78,10 @@ def extend_rental(
 ):
     try:
         return service.extend_rental(rent_id, new_end_date)
+    except RentalConflictError as e:
+        raise HTTPException(409, detail=str(e))
     except ValueError as e:
-        return RentalWithRelationsDTO()
+        raise HTTPException(404, detail=str(e))
     except Exception as e:
         raise HTTPException(400, detail=str(e))
 
@@ -0,0 +1,65 @@
+from service import get_report_service, get_utilization_service, get_current_user
+from service import ReportService, UtilizationService
+from dto import RentalReportDTO, ReportPeriodEnum, UtilizationReportDTO
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter(
+    prefix="/reports",
+    tags=["Отчёты"],
+    dependencies=[Depends(get_current_user)]
+)
+
+YEAR = Query(..., ge=2000, le=2100)
+
+
+def _report(service: ReportService, period: ReportPeriodEnum, year: int, number: int = 1) -> RentalReportDTO:
+    try:
+        return service.get_report(period, year, number)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
+
+
+@router.get("/month", response_model=RentalReportDTO)
+def month_report(
+        year: int = YEAR,
+        month: int = Query(..., ge=1, le=12),
+        service: ReportService = Depends(get_report_service)
+):
+    """Выручка, длительность и загрузка парка за месяц"""
+    return _report(service, ReportPeriodEnum.MONTH, year, month)
+
+
+@router.get("/quarter", response_model=RentalReportDTO)
+def quarter_report(
+        year: int = YEAR,
+        quarter: int = Query(..., ge=1, le=4),
+        service: ReportService = Depends(get_report_service)
+):
+    """Выручка, длительность и загрузка парка за квартал"""
+    return _report(service, ReportPeriodEnum.QUARTER, year, quarter)
+
+
+@router.get("/year", response_model=RentalReportDTO)
+def year_report(
+        year: int = YEAR,
+        service: ReportService = Depends(get_report_service)
+):
+    """Выручка, длительность и загрузка парка за год"""
+    return _report(service, ReportPeriodEnum.YEAR, year)
+
+
+@router.get("/utilization", response_model=UtilizationReportDTO)
+def utilization_report(
+        start: datetime,
+        end: datetime,
+        service: UtilizationService = Depends(get_utilization_service)
+):
+    """Загрузка автомобилей и моделей в окне [start, end): занятые часы / часы окна"""
+    try:
+        return service.get_utilization(start, end)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
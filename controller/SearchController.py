@@ -0,0 +1,28 @@
+from service import get_search_service, get_current_user
+from service import SearchService
+from dto import SearchHitDTO, SearchKindEnum
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter(
+    prefix="/search",
+    tags=["Поиск"],
+    dependencies=[Depends(get_current_user)]
+)
+
+
+@router.get("", response_model=List[SearchHitDTO])
+def search(
+        q: str = Query(..., description="Часть имени, телефона, Telegram ID, ВУ, номера, VIN или модели"),
+        kind: Optional[SearchKindEnum] = None,
+        limit: int = Query(20, gt=0, le=100),
+        service: SearchService = Depends(get_search_service)
+):
+    """Поиск по клиентам и автомобилям, лучшие совпадения первыми"""
+    try:
+        return service.search(q, limit, kind)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
@@ -1,8 +1,9 @@
 from service import get_user_service, get_current_user
 from service import UserService
 from dto import UserCreateDTO, UserUpdateDTO, UserResponseDTO
+from utils import HashingOverloadError
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, status
 import logging
 
 logger = logging.getLogger(__name__)
@@ -37,21 +38,34 @@ def users_count(service: UserService = Depends(get_user_service)):
         raise HTTPException(404, detail=str(e))
 
 
+def hashing_unavailable(error: HashingOverloadError) -> HTTPException:
+    # Как и при входе: пул хеширования перегружен, запрос стоит повторить
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(error),
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/", response_model=UserResponseDTO, status_code=201)
-def create_user(user_dto: UserCreateDTO, service: UserService = Depends(get_user_service)):
+async def create_user(user_dto: UserCreateDTO, service: UserService = Depends(get_user_service)):
     try:
-        return service.create_user(user_dto)
+        return await service.create_user_async(user_dto)
+    except HashingOverloadError as e:
+        raise hashing_unavailable(e)
     except ValueError as e:
         raise HTTPException(400, detail=str(e))
 
 
 @router.put("/", response_model=UserResponseDTO)
-def update_user(
+async def update_user(
         update_dto: UserUpdateDTO,
         service: UserService = Depends(get_user_service)
 ):
     try:
-        return service.update_user(update_dto)
+        return await service.update_user_async(update_dto)
+    except HashingOverloadError as e:
+        raise hashing_unavailable(e)
     except Exception as e:
         raise HTTPException(400, detail=str(e))
 
@@ -3,12 +3,26 @@ from .CarController import router as car_router
 from .ClientController import router as client_router
 from .UserController import router as user_router
 from .RentalController import router as rental_router
+from .HealthController import router as health_router
+from .SearchController import router as search_router
+from .ReportController import router as report_router
+from .AsyncCarController import router as async_car_router
+from .AsyncClientController import router as async_client_router
+from .AsyncUserController import router as async_user_router
+from .AsyncRentalController import router as async_rental_router
 
 __all__ = [
     'auth_router',
     'car_router',
     'client_router',
     'user_router',
-    'rental_router'
+    'rental_router',
+    'health_router',
+    'search_router',
+    'report_router',
+    'async_car_router',
+    'async_client_router',
+    'async_user_router',
+    'async_rental_router'
 ]
 
@@ -3,7 +3,7 @@ from .CarSpecificationsDTO import (CarSpecificationsCreateDTO, CarSpecifications
 
 import re
 from pydantic import BaseModel, Field, field_validator, ConfigDict
-from typing import Optional, Final
+from typing import Dict, List, Optional, Final
 from datetime import datetime
 from enum import Enum
 
@@ -96,6 +96,25 @@ class CarWithSpecsUpdateDTO(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CarModelSuggestionDTO(BaseModel):
+    """Подсказка модели: название и число автомобилей этой модели"""
+    name: str
+    count: int
+
+
+class CarRateDTO(BaseModel):
+    car_id: int
+    daily_rate: int
+
+
+class CarStatsDTO(BaseModel):
+    """Счётчики парка и рейтинги по цене"""
+    total: int
+    by_status: Dict[str, int]
+    most_expensive: List[CarRateDTO]
+    cheapest_available: List[CarRateDTO]
+
+
 class CarFilterDTO(BaseModel):
     """DTO для поиска автомобилей"""
     license_plate: Optional[str] = None
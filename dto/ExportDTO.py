@@ -0,0 +1,13 @@
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class ExportFormatEnum(str, Enum):
+    NDJSON = "ndjson"  # по JSON-объекту на строку
+    CSV = "csv"        # вложенные поля разворачиваются в колонки вида car.daily_rate
+
+
+class ExportRequestDTO(BaseModel):
+    """Параметры выгрузки"""
+    format: ExportFormatEnum = ExportFormatEnum.NDJSON
@@ -0,0 +1,19 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar('T')
+
+
+class PageRequestDTO(BaseModel):
+    """Параметры страницы: размер, курсор предыдущей страницы и сортировка"""
+    limit: Optional[int] = Field(None, gt=0)  # по умолчанию pagination.default-page-size
+    cursor: Optional[str] = None              # next_cursor из предыдущего ответа
+    sort: Optional[str] = None                # "daily_rate" — по возрастанию, "-daily_rate" — по убыванию
+
+
+class PageDTO(BaseModel, Generic[T]):
+    """Страница результатов; next_cursor отсутствует на последней странице"""
+    items: List[T]
+    next_cursor: Optional[str] = None
+    limit: int
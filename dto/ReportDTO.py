@@ -0,0 +1,72 @@
+from datetime import date, datetime
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class ReportPeriodEnum(str, Enum):
+    MONTH = "month"
+    QUARTER = "quarter"
+    YEAR = "year"
+
+
+class CarRevenueDTO(BaseModel):
+    car_id: int
+    completed: int
+    revenue: float
+    busy_hours: float
+
+
+class ClientRevenueDTO(BaseModel):
+    client_id: int
+    started: int
+    completed: int
+    revenue: float
+
+
+class RentalReportDTO(BaseModel):
+    """
+    Отчёт по закрытым арендам за период [first_day, last_day]: открытые
+    брони и выдачи попадают в отчёт после завершения или отмены
+    """
+    period: ReportPeriodEnum
+    first_day: date
+    last_day: date
+    started: int  # Завершённых аренд, начатых в периоде
+    completed: int
+    cancelled: int
+    revenue: float
+    average_cost: float  # Средняя стоимость завершённой аренды
+    average_duration_hours: float  # Средняя длительность завершённой аренды
+    busy_hours: float  # Часы завершённых аренд внутри периода
+    fleet_size: int
+    utilization: float  # Доля занятого времени парка: busy_hours / (fleet_size · часы периода)
+    top_cars: List[CarRevenueDTO]
+    top_clients: List[ClientRevenueDTO]
+
+
+class CarUtilizationDTO(BaseModel):
+    car_id: int
+    model: Optional[str]
+    busy_hours: float
+    utilization: float  # Занятые часы / часы окна
+
+
+class ModelUtilizationDTO(BaseModel):
+    model: Optional[str]  # None — автомобили без характеристик
+    cars: int
+    busy_hours: float
+    utilization: float  # Занятые часы / (автомобилей модели · часы окна)
+
+
+class UtilizationReportDTO(BaseModel):
+    """Загрузка парка в окне [start, end)"""
+    start: datetime
+    end: datetime
+    window_hours: float
+    fleet_size: int
+    busy_hours: float
+    utilization: float
+    models: List[ModelUtilizationDTO]
+    cars: List[CarUtilizationDTO]
@@ -0,0 +1,18 @@
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class SearchKindEnum(str, Enum):
+    CLIENT = "client"
+    CAR = "car"
+
+
+class SearchHitDTO(BaseModel):
+    """Результат поиска: найденная запись и поле, в котором нашлась строка"""
+    kind: SearchKindEnum
+    id: int
+    title: str
+    field: str
+    value: str
+    score: int  # 3 — поле совпадает целиком, 2 — начинается с запроса, 1 — содержит его
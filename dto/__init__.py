@@ -3,7 +3,8 @@ from .CarDTO import (CarCreateDTO,
                      CarResponseDTO,
                      CarWithSpecsResponseDTO,
                      CarStatusEnum,
-                     CarWithSpecsUpdateDTO, CarFilterDTO)
+                     CarWithSpecsUpdateDTO, CarFilterDTO, CarModelSuggestionDTO,
+                     CarRateDTO, CarStatsDTO)
 from .CarSpecificationsDTO import (CarSpecificationsCreateDTO,
                                    CarSpecificationsResponseDTO,
                                    CarSpecificationsUpdateDTO,
@@ -25,6 +26,11 @@ from .RentalDTO import (RentalResponseDTO,
                         RentalWithRelationsDTO,
                         RentalStatusEnum,
                         RentalFilterDTO)
+from .PageDTO import PageDTO, PageRequestDTO
+from .ExportDTO import ExportFormatEnum, ExportRequestDTO
+from .SearchDTO import SearchKindEnum, SearchHitDTO
+from .ReportDTO import (ReportPeriodEnum, CarRevenueDTO, ClientRevenueDTO, RentalReportDTO,
+                        CarUtilizationDTO, ModelUtilizationDTO, UtilizationReportDTO)
 
 __all__ = [
     "CarCreateDTO",
@@ -34,6 +40,9 @@ __all__ = [
     "CarStatusEnum",
     "CarWithSpecsUpdateDTO",
     "CarFilterDTO",
+    "CarModelSuggestionDTO",
+    "CarRateDTO",
+    "CarStatsDTO",
 
     'CarSpecificationsCreateDTO',
     'CarSpecificationsUpdateDTO',
@@ -61,4 +70,21 @@ __all__ = [
     'RentalStatusEnum',
     'RentalResponseDTO',
     'RentalFilterDTO',
+
+    'PageDTO',
+    'PageRequestDTO',
+
+    'ExportFormatEnum',
+    'ExportRequestDTO',
+
+    'SearchKindEnum',
+    'SearchHitDTO',
+
+    'ReportPeriodEnum',
+    'CarRevenueDTO',
+    'ClientRevenueDTO',
+    'RentalReportDTO',
+    'CarUtilizationDTO',
+    'ModelUtilizationDTO',
+    'UtilizationReportDTO',
 ]
\ No newline at end of file
@@ -4,6 +4,7 @@ from .car_specifications import CarSpecifications
 from .client import Client
 from .rental import Rental, RentalStatus
 from .user import User
+from .rental_rollup import RentalDayRollup, RentalCarDayRollup, RentalClientDayRollup
 
 __all__ = [
     'Car',
@@ -13,5 +14,8 @@ __all__ = [
     'Rental',
     'RentalStatus',
     'User',
+    'RentalDayRollup',
+    'RentalCarDayRollup',
+    'RentalClientDayRollup',
     'Base',
 ]
\ No newline at end of file
@@ -1,6 +1,6 @@
 from .base import Base
 
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -12,10 +12,18 @@ class CarStatus:
 
 class Car(Base):
     __tablename__ = "Cars"
+    __table_args__ = (
+        # Сортировка по цене и самые дешёвые доступные автомобили
+        Index('ix_cars_daily_rate', 'daily_rate'),
+        Index('ix_cars_status_daily_rate', 'status', 'daily_rate'),
+        # Уникальность с явными именами: по имени из ошибки драйвера находится столбец
+        Index('ix_Cars_license_plate', 'license_plate', unique=True),
+        Index('ix_Cars_vin', 'vin', unique=True),
+    )
 
     car_id = Column(Integer, primary_key=True, index=True)
-    license_plate = Column(String(20), nullable=False, unique=True, index=True) # Номерной знак
-    vin = Column(String(17), nullable=False, unique=True, index=True) # VIN
+    license_plate = Column(String(20), nullable=False) # Номерной знак
+    vin = Column(String(17), nullable=False) # VIN
     daily_rate = Column(Integer, nullable=False) # Стоимость аренды
     status = Column(String(20), default=CarStatus.AVAILABLE) # Статус автомобиля
     change_at = Column(DateTime, default=datetime.now)
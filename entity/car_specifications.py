@@ -1,12 +1,17 @@
 from .base import Base
 
-from sqlalchemy import Column, Integer, String, DECIMAL, ForeignKey, LargeBinary
+from sqlalchemy import Column, Integer, String, DECIMAL, ForeignKey, Index, LargeBinary
 from sqlalchemy.orm import relationship
 
 
 
 class CarSpecifications(Base):
     __tablename__ = 'CarSpecifications'
+    __table_args__ = (
+        # Фильтры по модели, коробке и цвету; car_id в конце делает индексы покрывающими
+        Index('ix_car_specifications_name', 'name', 'car_id'),
+        Index('ix_car_specifications_transmission_color', 'transmission', 'color', 'car_id'),
+    )
 
     # Первичный ключ - car_id, который также является внешним ключом
     car_id = Column(
@@ -1,18 +1,28 @@
 from .base import Base
 
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
 class Client(Base):
     __tablename__ = "Clients"
+    __table_args__ = (
+        # Ключи сортировки страниц (keyset): значение + первичный ключ
+        Index('ix_clients_name', 'name', 'client_id'),
+        Index('ix_clients_created_at', 'created_at', 'client_id'),
+        # Уникальность с явными именами: по имени из ошибки драйвера находится столбец
+        Index('ix_Clients_phone', 'phone', unique=True),
+        Index('ix_Clients_telegram_id', 'telegram_id', unique=True),
+        UniqueConstraint('license_number', name='uq_clients_license_number'),
+    )
 
     client_id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
-    phone = Column(String(11), nullable=False, unique=True, index=True)
-    telegram_id = Column(String(30), unique=True, index=True)
-    license_number = Column(String(50), nullable=False, unique=True)
+    phone = Column(String(11), nullable=False)
+    telegram_id = Column(String(30))
+    license_number = Column(String(50), nullable=False)
     created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, nullable=True)  # Последнее изменение; created_at не трогаем, по нему идёт сортировка
 
     # Связь "один ко многим" с арендами
     rentals = relationship("Rental", back_populates="client")
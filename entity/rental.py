@@ -1,6 +1,6 @@
 from .base import Base
 
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, Numeric, String
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index, Numeric, String
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -12,6 +12,16 @@ class RentalStatus:
 
 class Rental(Base):
     __tablename__ = "Rentals"
+    __table_args__ = (
+        # Проверка пересечения аренд по автомобилю и фильтр аренд автомобиля
+        Index('ix_rentals_car_status_period', 'car_id', 'status', 'start_date', 'end_date'),
+        Index('ix_rentals_client_status', 'client_id', 'status'),
+        Index('ix_rentals_user_id', 'user_id'),
+        # Фильтр по периоду без автомобиля
+        Index('ix_rentals_start_end', 'start_date', 'end_date'),
+        # Сортировка страниц по дате создания
+        Index('ix_rentals_created_at', 'created_at', 'rent_id'),
+    )
 
     rent_id = Column(Integer, primary_key=True, index=True)
     start_date = Column(DateTime, nullable=False, default=datetime.utcnow) # Когда выдан
@@ -21,6 +31,7 @@ class Rental(Base):
     status = Column(String(20), default=RentalStatus.ACTIVE)
     notes = Column(String(1000), nullable=True) # Примечания
     created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, nullable=True)  # Последнее изменение; created_at не трогаем, по нему идёт сортировка
 
     # Связь "много к одному" с автомобилем
     car_id = Column(Integer, ForeignKey("Cars.car_id"))
@@ -0,0 +1,56 @@
+from .base import Base
+
+from sqlalchemy import Column, Date, Integer, Index, Numeric
+
+
+# Сводки по закрытым (завершённым и отменённым) арендам за день. Завершение, отмена
+# и правка закрытой аренды прибавляют к строкам своих дней разницу в той же транзакции,
+# поэтому отчёт за период читает не больше строк, чем дней в нём.
+# Внешних ключей нет: сводка за прошлые дни остаётся и после удаления автомобиля или клиента
+
+class RentalDayRollup(Base):
+    __tablename__ = "RentalDayRollups"
+
+    day = Column(Date, primary_key=True)
+    started = Column(Integer, nullable=False, default=0)  # Завершённых аренд, начатых в этот день
+    completed = Column(Integer, nullable=False, default=0)  # Завершено, по дню возврата
+    cancelled = Column(Integer, nullable=False, default=0)  # Отменено, по дню начала
+    revenue = Column(Numeric(precision=12, scale=2), nullable=False, default=0)  # Выручка завершённых
+    completed_hours = Column(Numeric(precision=12, scale=2), nullable=False, default=0)  # Длительность завершённых
+    busy_hours = Column(Numeric(precision=12, scale=2), nullable=False, default=0)  # Часы завершённых аренд
+
+    def __repr__(self):
+        return f"<RentalDayRollup({self.day=}, {self.completed=}, {self.revenue=})>"
+
+
+class RentalCarDayRollup(Base):
+    __tablename__ = "RentalCarDayRollups"
+    __table_args__ = (
+        # История одного автомобиля
+        Index('ix_rental_car_day_rollups_car_day', 'car_id', 'day'),
+    )
+
+    day = Column(Date, primary_key=True)
+    car_id = Column(Integer, primary_key=True)
+    completed = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(precision=12, scale=2), nullable=False, default=0)
+    busy_hours = Column(Numeric(precision=12, scale=2), nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<RentalCarDayRollup({self.day=}, {self.car_id=}, {self.revenue=})>"
+
+
+class RentalClientDayRollup(Base):
+    __tablename__ = "RentalClientDayRollups"
+    __table_args__ = (
+        Index('ix_rental_client_day_rollups_client_day', 'client_id', 'day'),
+    )
+
+    day = Column(Date, primary_key=True)
+    client_id = Column(Integer, primary_key=True)
+    started = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(precision=12, scale=2), nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<RentalClientDayRollup({self.day=}, {self.client_id=}, {self.revenue=})>"
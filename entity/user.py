@@ -1,14 +1,17 @@
 from .base import Base
 
-from sqlalchemy import Column, Integer, String, DateTime, LargeBinary
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
 class User(Base):
     __tablename__ = "Users"
+    __table_args__ = (
+        UniqueConstraint('email', name='uq_users_email'),
+    )
 
     user_id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, unique=True, nullable=False)
+    email = Column(String, nullable=False)
     password = Column(LargeBinary, nullable=False)
     name = Column(String(255), nullable=False)
     position = Column(String(100), nullable=False)
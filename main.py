@@ -1,15 +1,62 @@
-from controller import client_router, car_router, user_router, rental_router, auth_router
+from contextlib import asynccontextmanager
+
+from config import settings
 
 from fastapi import FastAPI
 
+
+def register_routers(app: FastAPI):
+    """
+    Подключение роутеров. Контроллеры тянут за собой сервисы, репозитории
+    и DTO, поэтому импортируются здесь, а не при импорте main: воркер
+    поднимается быстрее, а повторный вызов ничего не делает.
+    """
+    if getattr(app.state, 'routers_registered', False):
+        return
+
+    from controller import (client_router, car_router, user_router, rental_router, auth_router, health_router,
+                            search_router, report_router)
+    from service.Dependencies import configure
+
+    configure()
+    app.include_router(auth_router)
+
+    # Асинхронные маршруты чтения регистрируются раньше синхронных и перекрывают
+    # совпадающие пути; запись по-прежнему обслуживают синхронные роутеры
+    if settings.get("database").get("async", False):
+        from controller import async_car_router, async_client_router, async_user_router, async_rental_router
+
+        app.include_router(async_car_router)
+        app.include_router(async_client_router)
+        app.include_router(async_user_router)
+        app.include_router(async_rental_router)
+
+    app.include_router(car_router)
+    app.include_router(client_router)
+    app.include_router(user_router)
+    app.include_router(rental_router)
+    app.include_router(search_router)
+    app.include_router(report_router)
+    app.include_router(health_router)
+
+    app.state.routers_registered = True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    register_routers(app)
+
+    # Перезагрузка конфигурации без рестарта: по SIGHUP и, если задано, при изменении файла
+    settings.install_sighup_handler()
+    if settings.get("config-watch-seconds", None):
+        settings.watch(settings.get("config-watch-seconds"))
+    yield
+    settings.stop_watching(timeout=1)
+
+
 app = FastAPI(
     title="Car Rental API ",
     description="Управление автомобилями и клиентами",
-    version="1.3.3.7"
+    version="1.3.3.7",
+    lifespan=lifespan
 )
-
-app.include_router(auth_router)
-app.include_router(car_router)
-app.include_router(client_router)
-app.include_router(user_router)
-app.include_router(rental_router)
@@ -0,0 +1,10 @@
+from .runner import Migration, MigrationRunner, load_migrations
+from .advisor import IndexAdvisor, QueryPlan
+
+__all__ = [
+    'Migration',
+    'MigrationRunner',
+    'load_migrations',
+    'IndexAdvisor',
+    'QueryPlan'
+]
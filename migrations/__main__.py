@@ -0,0 +1,57 @@
+"""
+Управление схемой БД из настроек приложения (секция database).
+
+    python -m migrations current
+    python -m migrations history
+    python -m migrations upgrade [--to N]
+    python -m migrations downgrade --to N
+    python -m migrations advise [--verbose]
+"""
+import argparse
+import sys
+
+from config.connection import get_database_config
+from migrations import IndexAdvisor, MigrationRunner
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m migrations', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('current', help='текущая версия схемы')
+    commands.add_parser('history', help='применённые версии')
+    upgrade = commands.add_parser('upgrade', help='применить миграции')
+    upgrade.add_argument('--to', type=int, default=None, help='целевая версия (по умолчанию последняя)')
+    downgrade = commands.add_parser('downgrade', help='откатить миграции')
+    downgrade.add_argument('--to', type=int, required=True, help='целевая версия')
+    advise = commands.add_parser('advise', help='планы частых запросов и полные сканирования')
+    advise.add_argument('--verbose', action='store_true', help='печатать план целиком')
+    args = parser.parse_args(argv)
+
+    db_config = get_database_config()
+    engine = db_config.sync_engine(metrics=None, create_schema=False)
+    runner = MigrationRunner(engine)
+
+    if args.command == 'current':
+        print(f"{runner.current_version()} (последняя {runner.head})")
+    elif args.command == 'history':
+        for row in runner.history():
+            print(f"{row['version']:>4}  {row['applied_at']:%Y-%m-%d %H:%M:%S}  {row['description']}")
+    elif args.command == 'upgrade':
+        for migration in runner.upgrade(args.to):
+            print(f"upgrade {migration.version}: {migration.description}")
+    elif args.command == 'downgrade':
+        for migration in runner.downgrade(args.to):
+            print(f"downgrade {migration.version}: {migration.description}")
+    elif args.command == 'advise':
+        if db_config.is_memory:
+            # Пустая база в памяти: сначала создаём схему
+            runner.upgrade()
+        plans = IndexAdvisor(engine).run()
+        print(IndexAdvisor.report(plans, verbose=args.verbose))
+        return 1 if any(plan.has_scans for plan in plans) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
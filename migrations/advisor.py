@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta
+from typing import Callable, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+
+class QueryPlan:
+    """План одного запроса репозитория и найденные в нём полные сканирования"""
+
+    def __init__(self, name: str, statement: str, plan: List[str], scans: List[str]):
+        self.name = name
+        self.statement = statement
+        self.plan = plan
+        self.scans = scans
+
+    @property
+    def has_scans(self) -> bool:
+        return bool(self.scans)
+
+    def __repr__(self):
+        return f"<QueryPlan('{self.name}', scans={self.scans})>"
+
+
+def default_workload() -> List[Tuple[str, Callable[[Session], object]]]:
+    """Частые запросы репозиториев с типичными параметрами"""
+    from dto import CarFilterDTO, ClientFilterDTO, RentalFilterDTO, RentalStatusEnum
+    from repository import CarRepository, ClientRepository, RentalRepository
+
+    now = datetime.now()
+    week = [now, now + timedelta(days=7)]
+    return [
+        ('RentalRepository.is_car_available',
+         lambda s: RentalRepository(s).is_car_available(1, *week)),
+        ('RentalRepository.find_by_filters(car_id, status)',
+         lambda s: RentalRepository(s).find_by_filters(RentalFilterDTO(car_id=1, status=RentalStatusEnum.ACTIVE))),
+        ('RentalRepository.find_by_filters(client_id)',
+         lambda s: RentalRepository(s).find_by_filters(RentalFilterDTO(client_id=1))),
+        ('RentalRepository.find_by_filters(user_id)',
+         lambda s: RentalRepository(s).find_by_filters(RentalFilterDTO(user_id=1))),
+        ('RentalRepository.find_by_filters(time_range)',
+         lambda s: RentalRepository(s).find_by_filters(RentalFilterDTO(time_range=week))),
+        ('CarRepository.find_by_filters(min_rate, max_rate)',
+         lambda s: CarRepository(s).find_by_filters(CarFilterDTO(min_rate=1000, max_rate=5000))),
+        ('CarRepository.find_by_filters(model, transmission, color)',
+         lambda s: CarRepository(s).find_by_filters(CarFilterDTO(model='Camry', transmission='Автомат', color='Белый'))),
+        ('CarRepository.get_most_expensive_cars',
+         lambda s: CarRepository(s).get_most_expensive_cars()),
+        ('CarRepository.get_cheapest_cars',
+         lambda s: CarRepository(s).get_cheapest_cars()),
+        ('ClientRepository.find_by_filters(name)',
+         lambda s: ClientRepository(s).find_by_filters(ClientFilterDTO(name='Иван'))),
+    ]
+
+
+class IndexAdvisor:
+    """
+    Прогоняет запросы репозиториев, перехватывает сгенерированный SQL
+    и запрашивает у базы план выполнения: EXPLAIN QUERY PLAN в SQLite,
+    SHOWPLAN_TEXT в MSSQL. Запросы выполняются в транзакции, которая
+    откатывается, так что данные не меняются.
+    """
+
+    def __init__(self, engine: Engine, workload=None):
+        self.engine = engine
+        self.workload = workload if workload is not None else default_workload()
+
+    def _capture(self, connection: Connection, query: Callable[[Session], object]) -> List[Tuple[str, object]]:
+        captured = []
+
+        def on_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('SELECT'):
+                captured.append((statement, parameters))
+
+        event.listen(connection, 'before_cursor_execute', on_execute)
+        transaction = connection.begin()
+        session = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            query(session)
+        finally:
+            session.close()
+            transaction.rollback()
+            event.remove(connection, 'before_cursor_execute', on_execute)
+        return captured
+
+    @staticmethod
+    def _explain_sqlite(connection: Connection, statement: str, parameters) -> Tuple[List[str], List[str]]:
+        rows = connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).all()
+        plan = [row[-1] for row in rows]
+        # "SCAN Cars" — полный проход по таблице; "SCAN ... USING INDEX" читает только индекс
+        scans = [line for line in plan if line.startswith('SCAN') and 'INDEX' not in line]
+        return plan, scans
+
+    @staticmethod
+    def _explain_mssql(connection: Connection, statement: str, parameters) -> Tuple[List[str], List[str]]:
+        cursor = connection.connection.cursor()
+        try:
+            cursor.execute('SET SHOWPLAN_TEXT ON')
+            try:
+                cursor.execute(statement, parameters)
+                plan = []
+                while True:
+                    plan.extend(str(row[0]).strip() for row in cursor.fetchall())
+                    if not cursor.nextset():
+                        break
+            finally:
+                cursor.execute('SET SHOWPLAN_TEXT OFF')
+        finally:
+            cursor.close()
+        scans = [line for line in plan if 'Table Scan' in line or 'Clustered Index Scan' in line]
+        return plan, scans
+
+    def explain(self, connection: Connection, statement: str, parameters) -> Tuple[List[str], List[str]]:
+        if connection.dialect.name == 'sqlite':
+            return self._explain_sqlite(connection, statement, parameters)
+        if connection.dialect.name == 'mssql':
+            return self._explain_mssql(connection, statement, parameters)
+        raise ValueError(f"Планы запросов для {connection.dialect.name} не поддерживаются")
+
+    def run(self) -> List[QueryPlan]:
+        plans = []
+        with self.engine.connect() as connection:
+            for name, query in self.workload:
+                for statement, parameters in self._capture(connection, query):
+                    plan, scans = self.explain(connection, statement, parameters)
+                    plans.append(QueryPlan(name, statement, plan, scans))
+                if connection.in_transaction():
+                    connection.rollback()
+        return plans
+
+    @staticmethod
+    def report(plans: List[QueryPlan], verbose: bool = False) -> str:
+        lines = []
+        for plan in plans:
+            mark = 'SCAN' if plan.has_scans else 'ok  '
+            lines.append(f"[{mark}] {plan.name}")
+            for line in (plan.plan if verbose else plan.scans):
+                lines.append(f"         {line}")
+        scans = sum(plan.has_scans for plan in plans)
+        lines.append(f"\nЗапросов: {len(plans)}, с полным сканированием: {scans}")
+        return '\n'.join(lines)
@@ -0,0 +1,142 @@
+import importlib
+import pkgutil
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, String, Table, delete, insert, inspect, select
+from sqlalchemy.engine import Connection, Engine
+
+# Таблица версий живёт вне entity.Base, чтобы create_all её не трогал
+version_metadata = MetaData()
+schema_version = Table(
+    'schema_version', version_metadata,
+    Column('version', Integer, primary_key=True, autoincrement=False),
+    Column('description', String(255), nullable=False),
+    Column('applied_at', DateTime, nullable=False, default=datetime.now),
+)
+
+# (таблица, индекс, столбцы) — описание индекса в миграции
+IndexSpec = Tuple[str, str, Sequence[str]]
+
+
+def _indexes(connection: Connection, specs: Iterable[IndexSpec]) -> Iterator[Index]:
+    # Таблицы отражаются из базы: миграция не зависит от текущих моделей
+    metadata = MetaData()
+    tables = {}
+    for table_name, index_name, columns in specs:
+        if table_name not in tables:
+            tables[table_name] = Table(table_name, metadata, autoload_with=connection)
+        table = tables[table_name]
+
+        # Уже существующий индекс приходит вместе с отражённой таблицей
+        existing = next((index for index in table.indexes if index.name == index_name), None)
+        yield existing if existing is not None else Index(index_name, *(table.c[column] for column in columns))
+
+
+def create_indexes(connection: Connection, specs: Iterable[IndexSpec]):
+    """Создать недостающие индексы из списка (таблица, индекс, столбцы)"""
+    for index in _indexes(connection, specs):
+        index.create(connection, checkfirst=True)
+
+
+def drop_indexes(connection: Connection, specs: Iterable[IndexSpec]):
+    """Удалить индексы из списка, если они есть"""
+    for index in _indexes(connection, specs):
+        index.drop(connection, checkfirst=True)
+
+
+class Migration:
+    """
+    Одна версия схемы. Модуль в migrations/versions задаёт VERSION,
+    DESCRIPTION и функции upgrade(connection) / downgrade(connection).
+    """
+
+    def __init__(self, version: int, description: str,
+                 upgrade: Callable[[Connection], None], downgrade: Callable[[Connection], None]):
+        self.version = version
+        self.description = description
+        self.upgrade = upgrade
+        self.downgrade = downgrade
+
+    def __repr__(self):
+        return f"<Migration({self.version}, '{self.description}')>"
+
+
+def load_migrations() -> List[Migration]:
+    """Миграции из migrations/versions по возрастанию версии"""
+    from . import versions
+
+    migrations = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        module = importlib.import_module(f'{versions.__name__}.{module_info.name}')
+        migrations.append(Migration(module.VERSION, module.DESCRIPTION, module.upgrade, module.downgrade))
+    migrations.sort(key=lambda m: m.version)
+
+    expected = list(range(1, len(migrations) + 1))
+    if [m.version for m in migrations] != expected:
+        raise ValueError(f"Версии миграций должны идти подряд с 1: {[m.version for m in migrations]}")
+    return migrations
+
+
+class MigrationRunner:
+    """
+    Применяет и откатывает миграции. Каждая версия выполняется
+    в отдельной транзакции вместе с записью в schema_version.
+    """
+
+    def __init__(self, engine: Engine, migrations: Optional[List[Migration]] = None):
+        self.engine = engine
+        self.migrations = migrations if migrations is not None else load_migrations()
+
+    @property
+    def head(self) -> int:
+        return self.migrations[-1].version if self.migrations else 0
+
+    def current_version(self) -> int:
+        with self.engine.connect() as connection:
+            if not inspect(connection).has_table(schema_version.name):
+                return 0
+            version = connection.execute(select(schema_version.c.version).order_by(
+                schema_version.c.version.desc()
+            )).scalar()
+        return version or 0
+
+    def history(self) -> List[dict]:
+        """Применённые версии"""
+        if self.current_version() == 0:
+            return []
+        with self.engine.connect() as connection:
+            rows = connection.execute(select(schema_version).order_by(schema_version.c.version))
+            return [dict(row._mapping) for row in rows]
+
+    def upgrade(self, target: Optional[int] = None) -> List[Migration]:
+        target = self.head if target is None else target
+        if not 0 <= target <= self.head:
+            raise ValueError(f"Нет версии {target}, последняя версия {self.head}")
+
+        current = self.current_version()
+        applied = []
+        for migration in self.migrations:
+            if current < migration.version <= target:
+                with self.engine.begin() as connection:
+                    version_metadata.create_all(connection)
+                    migration.upgrade(connection)
+                    connection.execute(insert(schema_version).values(
+                        version=migration.version, description=migration.description, applied_at=datetime.now()
+                    ))
+                applied.append(migration)
+        return applied
+
+    def downgrade(self, target: int) -> List[Migration]:
+        if not 0 <= target <= self.head:
+            raise ValueError(f"Нет версии {target}, последняя версия {self.head}")
+
+        current = self.current_version()
+        reverted = []
+        for migration in reversed(self.migrations):
+            if target < migration.version <= current:
+                with self.engine.begin() as connection:
+                    migration.downgrade(connection)
+                    connection.execute(delete(schema_version).where(schema_version.c.version == migration.version))
+                reverted.append(migration)
+        return reverted
@@ -0,0 +1,5 @@
+"""
+Версии схемы. Файл vNNN_<описание>.py задаёт VERSION, DESCRIPTION,
+upgrade(connection) и downgrade(connection). Применённую миграцию
+не меняют: исправления оформляются следующей версией.
+"""
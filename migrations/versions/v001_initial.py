@@ -0,0 +1,91 @@
+"""
+Исходная схема: таблицы и индексы в том виде, в каком их создавали
+модели entity до появления миграций. Описание заморожено здесь и не
+следует за моделями. На существующей базе создаёт только недостающие
+таблицы, поэтому служит точкой отсчёта.
+"""
+from sqlalchemy import (Column, DateTime, DECIMAL, ForeignKey, Index, Integer, LargeBinary, MetaData, Numeric,
+                        String, Table, UniqueConstraint)
+
+VERSION = 1
+DESCRIPTION = 'Исходная схема'
+
+metadata = MetaData()
+
+users = Table(
+    'Users', metadata,
+    Column('user_id', Integer, primary_key=True),
+    Column('email', String, nullable=False),
+    Column('password', LargeBinary, nullable=False),
+    Column('name', String(255), nullable=False),
+    Column('position', String(100), nullable=False),
+    Column('created_at', DateTime),
+    UniqueConstraint('email'),
+    Index('ix_Users_user_id', 'user_id'),
+)
+
+cars = Table(
+    'Cars', metadata,
+    Column('car_id', Integer, primary_key=True),
+    Column('license_plate', String(20), nullable=False),
+    Column('vin', String(17), nullable=False),
+    Column('daily_rate', Integer, nullable=False),
+    Column('status', String(20)),
+    Column('change_at', DateTime),
+    Index('ix_Cars_car_id', 'car_id'),
+    Index('ix_Cars_license_plate', 'license_plate', unique=True),
+    Index('ix_Cars_vin', 'vin', unique=True),
+)
+
+car_specifications = Table(
+    'CarSpecifications', metadata,
+    Column('car_id', Integer, ForeignKey('Cars.car_id', ondelete='CASCADE', onupdate='CASCADE'),
+           primary_key=True, nullable=False),
+    Column('name', String(255), nullable=False),
+    Column('mileage', Integer, nullable=False),
+    Column('power', Integer, nullable=False),
+    Column('overclocking', DECIMAL(5, 2), nullable=False),
+    Column('consump_in_city', DECIMAL(5, 2), nullable=False),
+    Column('transmission', String(50), nullable=False),
+    Column('actuator', String(50), nullable=False),
+    Column('wheel', String(50), nullable=False),
+    Column('color', String(50), nullable=False),
+)
+
+clients = Table(
+    'Clients', metadata,
+    Column('client_id', Integer, primary_key=True),
+    Column('name', String(255), nullable=False),
+    Column('phone', String(11), nullable=False),
+    Column('telegram_id', String(30)),
+    Column('license_number', String(50), nullable=False),
+    Column('created_at', DateTime),
+    UniqueConstraint('license_number'),
+    Index('ix_Clients_client_id', 'client_id'),
+    Index('ix_Clients_phone', 'phone', unique=True),
+    Index('ix_Clients_telegram_id', 'telegram_id', unique=True),
+)
+
+rentals = Table(
+    'Rentals', metadata,
+    Column('rent_id', Integer, primary_key=True),
+    Column('start_date', DateTime, nullable=False),
+    Column('end_date', DateTime, nullable=False),
+    Column('actual_return_date', DateTime),
+    Column('total_cost', Numeric(precision=10, scale=2)),
+    Column('status', String(20)),
+    Column('notes', String(1000)),
+    Column('created_at', DateTime),
+    Column('car_id', Integer, ForeignKey('Cars.car_id')),
+    Column('client_id', Integer, ForeignKey('Clients.client_id')),
+    Column('user_id', Integer, ForeignKey('Users.user_id')),
+    Index('ix_Rentals_rent_id', 'rent_id'),
+)
+
+
+def upgrade(connection):
+    metadata.create_all(connection, checkfirst=True)
+
+
+def downgrade(connection):
+    metadata.drop_all(connection, checkfirst=True)
@@ -0,0 +1,28 @@
+"""
+Составные индексы под частые запросы: пересечение аренд по автомобилю,
+фильтры аренд, сортировка автомобилей по цене и фильтры характеристик.
+"""
+from ..runner import create_indexes, drop_indexes
+
+VERSION = 2
+DESCRIPTION = 'Индексы для частых запросов'
+
+# (таблица, индекс, столбцы)
+INDEXES = (
+    ('Rentals', 'ix_rentals_car_status_period', ('car_id', 'status', 'start_date', 'end_date')),
+    ('Rentals', 'ix_rentals_client_status', ('client_id', 'status')),
+    ('Rentals', 'ix_rentals_user_id', ('user_id',)),
+    ('Rentals', 'ix_rentals_start_end', ('start_date', 'end_date')),
+    ('Cars', 'ix_cars_daily_rate', ('daily_rate',)),
+    ('Cars', 'ix_cars_status_daily_rate', ('status', 'daily_rate')),
+    ('CarSpecifications', 'ix_car_specifications_name', ('name', 'car_id')),
+    ('CarSpecifications', 'ix_car_specifications_transmission_color', ('transmission', 'color', 'car_id')),
+)
+
+
+def upgrade(connection):
+    create_indexes(connection, INDEXES)
+
+
+def downgrade(connection):
+    drop_indexes(connection, INDEXES)
@@ -0,0 +1,23 @@
+"""
+Индексы под ключи сортировки постраничной выдачи:
+клиенты по имени и дате создания, аренды по дате создания.
+"""
+from ..runner import create_indexes, drop_indexes
+
+VERSION = 3
+DESCRIPTION = 'Индексы для сортировки страниц'
+
+# (таблица, индекс, столбцы)
+INDEXES = (
+    ('Clients', 'ix_clients_name', ('name', 'client_id')),
+    ('Clients', 'ix_clients_created_at', ('created_at', 'client_id')),
+    ('Rentals', 'ix_rentals_created_at', ('created_at', 'rent_id')),
+)
+
+
+def upgrade(connection):
+    create_indexes(connection, INDEXES)
+
+
+def downgrade(connection):
+    drop_indexes(connection, INDEXES)
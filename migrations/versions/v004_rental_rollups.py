@@ -0,0 +1,170 @@
+"""
+Сводные таблицы аренд по дням, автомобилям и клиентам для отчётов.
+Заполняются по всей истории закрытых аренд; дальше их обновляет
+репозиторий аренд в транзакции каждой записи.
+"""
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from sqlalchemy import (Column, Date, DateTime, Index, Integer, MetaData, Numeric, String, Table, column, func,
+                        insert, select, table)
+
+VERSION = 4
+DESCRIPTION = 'Сводки аренд для отчётов'
+
+# Дней в одном куске заполнения
+CHUNK_DAYS = 92
+
+# Статусы и правила подсчёта зафиксированы на момент версии 4: миграция не
+# зависит от кода приложения, который потом может измениться
+COMPLETED, CANCELLED = 'COMPLETED', 'CANCELLED'
+CLOSED_STATUSES = (COMPLETED, CANCELLED)
+HOUR = Decimal(3600)
+CENT = Decimal('0.01')
+
+metadata = MetaData()
+
+day_rollups = Table(
+    'RentalDayRollups', metadata,
+    Column('day', Date, primary_key=True),
+    Column('started', Integer, nullable=False),
+    Column('completed', Integer, nullable=False),
+    Column('cancelled', Integer, nullable=False),
+    Column('revenue', Numeric(precision=12, scale=2), nullable=False),
+    Column('completed_hours', Numeric(precision=12, scale=2), nullable=False),
+    Column('busy_hours', Numeric(precision=12, scale=2), nullable=False),
+)
+
+car_day_rollups = Table(
+    'RentalCarDayRollups', metadata,
+    Column('day', Date, primary_key=True),
+    Column('car_id', Integer, primary_key=True),
+    Column('completed', Integer, nullable=False),
+    Column('revenue', Numeric(precision=12, scale=2), nullable=False),
+    Column('busy_hours', Numeric(precision=12, scale=2), nullable=False),
+    Index('ix_rental_car_day_rollups_car_day', 'car_id', 'day'),
+)
+
+client_day_rollups = Table(
+    'RentalClientDayRollups', metadata,
+    Column('day', Date, primary_key=True),
+    Column('client_id', Integer, primary_key=True),
+    Column('started', Integer, nullable=False),
+    Column('completed', Integer, nullable=False),
+    Column('revenue', Numeric(precision=12, scale=2), nullable=False),
+    Index('ix_rental_client_day_rollups_client_day', 'client_id', 'day'),
+)
+
+# Столбцы аренд, которые читает заполнение (есть с версии 1)
+rentals = table(
+    'Rentals', column('car_id', Integer), column('client_id', Integer), column('start_date', DateTime),
+    column('actual_return_date', DateTime), column('status', String), column('total_cost', Numeric(10, 2)),
+)
+
+
+def _hours(seconds: float) -> Decimal:
+    return (Decimal(seconds) / HOUR).quantize(CENT)
+
+
+def _aggregate(rows, first_day: date, last_day: date):
+    """
+    Сводки по дням first_day..last_day из закрытых аренд: отмена — в день
+    начала, завершённая аренда — начало в день начала, завершение и выручка
+    в день возврата, занятость во все дни между ними.
+    """
+    days, cars, clients = {}, {}, {}
+
+    def day_row(day):
+        if day not in days:
+            days[day] = dict(started=0, completed=0, cancelled=0, revenue=Decimal(0),
+                             completed_hours=Decimal(0), busy_hours=Decimal(0))
+        return days[day]
+
+    def car_row(day, car_id):
+        if (day, car_id) not in cars:
+            cars[(day, car_id)] = dict(completed=0, revenue=Decimal(0), busy_hours=Decimal(0))
+        return cars[(day, car_id)]
+
+    def client_row(day, client_id):
+        if (day, client_id) not in clients:
+            clients[(day, client_id)] = dict(started=0, completed=0, revenue=Decimal(0))
+        return clients[(day, client_id)]
+
+    for car_id, client_id, start, returned, status, cost in rows:
+        start = start.replace(tzinfo=None)
+        start_day = start.date()
+        in_range = first_day <= start_day <= last_day
+
+        if status == CANCELLED:
+            if in_range:
+                day_row(start_day)['cancelled'] += 1
+            continue
+        if status != COMPLETED or returned is None:
+            continue
+
+        returned = returned.replace(tzinfo=None)
+        if in_range:
+            day_row(start_day)['started'] += 1
+            client_row(start_day, client_id)['started'] += 1
+
+        if first_day <= returned.date() <= last_day:
+            revenue = Decimal(cost or 0)
+            row = day_row(returned.date())
+            row['completed'] += 1
+            row['revenue'] += revenue
+            row['completed_hours'] += _hours(max((returned - start).total_seconds(), 0))
+            for row in (car_row(returned.date(), car_id), client_row(returned.date(), client_id)):
+                row['completed'] += 1
+                row['revenue'] += revenue
+
+        day = max(start_day, first_day)
+        while day <= last_day:
+            day_start = datetime.combine(day, time.min)
+            if day_start >= returned:
+                break
+            busy = min(returned, day_start + timedelta(days=1)) - max(start, day_start)
+            if busy > timedelta(0):
+                hours = _hours(busy.total_seconds())
+                day_row(day)['busy_hours'] += hours
+                car_row(day, car_id)['busy_hours'] += hours
+            day += timedelta(days=1)
+
+    return days, cars, clients
+
+
+def _fill(connection):
+    closed = rentals.c.status.in_(CLOSED_STATUSES)
+    touched = func.coalesce(rentals.c.actual_return_date, rentals.c.start_date)
+    first, last = connection.execute(select(func.min(rentals.c.start_date), func.max(touched)).where(closed)).one()
+    if first is None:
+        return
+
+    first_day, last_day = first.date(), last.date()
+    while first_day <= last_day:
+        chunk_end = min(first_day + timedelta(days=CHUNK_DAYS - 1), last_day)
+        start = datetime.combine(first_day, time.min)
+        end = datetime.combine(chunk_end + timedelta(days=1), time.min)
+        rows = connection.execute(select(
+            rentals.c.car_id, rentals.c.client_id, rentals.c.start_date,
+            rentals.c.actual_return_date, rentals.c.status, rentals.c.total_cost
+        ).where(closed, rentals.c.start_date < end, touched >= start))
+
+        days, cars, clients = _aggregate([tuple(row) for row in rows], first_day, chunk_end)
+        if days:
+            connection.execute(insert(day_rollups), [dict(day=day, **row) for day, row in days.items()])
+        if cars:
+            connection.execute(insert(car_day_rollups),
+                               [dict(day=day, car_id=car_id, **row) for (day, car_id), row in cars.items()])
+        if clients:
+            connection.execute(insert(client_day_rollups),
+                               [dict(day=day, client_id=client_id, **row) for (day, client_id), row in clients.items()])
+        first_day = chunk_end + timedelta(days=1)
+
+
+def upgrade(connection):
+    metadata.create_all(connection, checkfirst=True)
+    _fill(connection)
+
+
+def downgrade(connection):
+    metadata.drop_all(connection, checkfirst=True)
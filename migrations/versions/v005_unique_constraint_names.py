@@ -0,0 +1,51 @@
+"""
+Явные имена уникальных ограничений Users.email и Clients.license_number.
+MSSQL сообщает о нарушении имя ограничения, а без имени он генерирует
+своё (UQ__Clients__...), по которому столбец не определить.
+SQLite не умеет переименовывать ограничения без пересоздания таблицы и
+в ошибках пишет столбцы, а не имена, поэтому там схема не меняется.
+"""
+from sqlalchemy import MetaData, Table, UniqueConstraint, inspect
+from sqlalchemy.schema import AddConstraint, DropConstraint
+
+VERSION = 5
+DESCRIPTION = 'Имена уникальных ограничений'
+
+# (таблица, ограничение, столбцы)
+CONSTRAINTS = (
+    ('Users', 'uq_users_email', ('email',)),
+    ('Clients', 'uq_clients_license_number', ('license_number',)),
+)
+
+
+def _constraints(connection):
+    """(столбцы таблицы, текущее имя ограничения, нужное имя) для каждого ограничения"""
+    inspector = inspect(connection)
+    metadata = MetaData()
+    for table_name, name, columns in CONSTRAINTS:
+        table = Table(table_name, metadata, autoload_with=connection)
+        current = next((constraint['name'] for constraint in inspector.get_unique_constraints(table_name)
+                        if tuple(constraint['column_names']) == columns), None)
+        yield [table.c[column] for column in columns], current, name
+
+
+def upgrade(connection):
+    if connection.dialect.name == 'sqlite':
+        return
+    for columns, current, name in _constraints(connection):
+        if current == name:
+            continue
+        if current is not None:
+            connection.execute(DropConstraint(UniqueConstraint(*columns, name=current)))
+        connection.execute(AddConstraint(UniqueConstraint(*columns, name=name)))
+
+
+def downgrade(connection):
+    if connection.dialect.name == 'sqlite':
+        return
+    for columns, current, name in _constraints(connection):
+        if current != name:
+            continue
+        connection.execute(DropConstraint(UniqueConstraint(*columns, name=name)))
+        # Без имени сервер, как и до версии 5, подберёт его сам
+        connection.execute(AddConstraint(UniqueConstraint(*columns)))
@@ -0,0 +1,33 @@
+"""
+Время изменения клиентов и аренд в отдельном столбце updated_at.
+Раньше правка записи перезаписывала created_at, а по нему идёт
+постраничная сортировка: изменённая запись перескакивала между
+страницами, и обход по курсору пропускал или повторял её.
+"""
+from sqlalchemy import DateTime, inspect, text
+
+VERSION = 6
+DESCRIPTION = 'Столбец updated_at у клиентов и аренд'
+
+TABLES = ('Clients', 'Rentals')
+COLUMN = 'updated_at'
+
+
+def _tables_with_column(connection, present: bool):
+    inspector = inspect(connection)
+    quote = connection.dialect.identifier_preparer.quote
+    for table_name in TABLES:
+        columns = {column['name'] for column in inspector.get_columns(table_name)}
+        if (COLUMN in columns) == present:
+            yield quote(table_name)
+
+
+def upgrade(connection):
+    column_type = DateTime().compile(dialect=connection.dialect)
+    for table_name in list(_tables_with_column(connection, present=False)):
+        connection.execute(text(f'ALTER TABLE {table_name} ADD {COLUMN} {column_type} NULL'))
+
+
+def downgrade(connection):
+    for table_name in list(_tables_with_column(connection, present=True)):
+        connection.execute(text(f'ALTER TABLE {table_name} DROP COLUMN {COLUMN}'))
@@ -0,0 +1,47 @@
+from entity import Car
+from dto import CarFilterDTO
+from dto import PageRequestDTO
+from .CarRepository import compile_car_filter, CAR_KEYSET
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import Optional, List, Dict, Tuple
+
+
+class AsyncCarRepository:
+    """Асинхронный репозиторий автомобилей (чтение)"""
+
+    def __init__(self, session: AsyncSession):
+        self.session_db = session
+
+    async def get_by_id(self, car_id: int) -> Optional[Car]:
+        """Автомобиль вместе с характеристиками: ленивой загрузки в async нет"""
+        result = await self.session_db.execute(
+            select(Car).options(selectinload(Car.car_specifications)).where(Car.car_id == car_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def find_by_filters(self, car_filter_dto: CarFilterDTO) -> List[Car]:
+        query, params = compile_car_filter(car_filter_dto)
+        result = await self.session_db.execute(query, params)
+        return list(result.scalars().all())
+
+    async def find_page(self, car_filter_dto: CarFilterDTO, page: PageRequestDTO) -> Tuple[List[Car], Optional[str]]:
+        query, params = compile_car_filter(car_filter_dto)
+        query, state = CAR_KEYSET.apply(query, page)
+        result = await self.session_db.execute(query, params)
+        return CAR_KEYSET.page(result.scalars().all(), state)
+
+    async def get_status_distribution(self) -> Dict[str, int]:
+        result = await self.session_db.execute(
+            select(Car.status, func.count(Car.car_id)).group_by(Car.status)
+        )
+        return {status: count for status, count in result.all()}
+
+    async def exists(self, car_id: int) -> bool:
+        result = await self.session_db.execute(select(Car.car_id).where(Car.car_id == car_id))
+        return result.first() is not None
+
+    async def count_all(self) -> int:
+        return await self.session_db.scalar(select(func.count(Car.car_id)))
@@ -0,0 +1,46 @@
+from entity import Client
+from dto import ClientFilterDTO, PageRequestDTO
+from .ClientRepository import build_client_filters, CLIENT_KEYSET
+
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+
+
+class AsyncClientRepository:
+    """Асинхронный репозиторий клиентов (чтение)"""
+
+    def __init__(self, session: AsyncSession):
+        self.session_db = session
+
+    async def get_by_id(self, client_id: int) -> Optional[Client]:
+        return await self.session_db.get(Client, client_id)
+
+    async def get_by_name(self, name: str) -> List[Client]:
+        result = await self.session_db.execute(select(Client).where(Client.name.ilike(f'%{name}%')))
+        return list(result.scalars().all())
+
+    async def find_by_filters(self, client_filter_dto: ClientFilterDTO) -> List[Client]:
+        query = select(Client)
+        filters = build_client_filters(client_filter_dto)
+
+        if filters:
+            query = query.where(and_(*filters))
+
+        result = await self.session_db.execute(query)
+        return list(result.scalars().all())
+
+    async def find_page(self, client_filter_dto: ClientFilterDTO,
+                        page: PageRequestDTO) -> Tuple[List[Client], Optional[str]]:
+        query, state = CLIENT_KEYSET.apply(select(Client).where(*build_client_filters(client_filter_dto)), page)
+        result = await self.session_db.execute(query)
+        return CLIENT_KEYSET.page(result.scalars().all(), state)
+
+    async def get_page_by_name(self, name: str, page: PageRequestDTO) -> Tuple[List[Client], Optional[str]]:
+        query, state = CLIENT_KEYSET.apply(select(Client).where(Client.name.ilike(f'%{name}%')), page)
+        result = await self.session_db.execute(query)
+        return CLIENT_KEYSET.page(result.scalars().all(), state)
+
+    async def exists(self, client_id: int) -> bool:
+        result = await self.session_db.execute(select(Client.client_id).where(Client.client_id == client_id))
+        return result.first() is not None
@@ -0,0 +1,45 @@
+from entity import Rental, Car
+from dto import RentalFilterDTO, PageRequestDTO
+from .RentalRepository import build_rental_filters, RENTAL_KEYSET
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Optional, Tuple
+
+# Аренда со всеми связями: в async-сессии обращаться к незагруженным связям нельзя
+_WITH_RELATIONS = (
+    selectinload(Rental.car).selectinload(Car.car_specifications),
+    selectinload(Rental.client),
+    selectinload(Rental.user),
+)
+
+
+class AsyncRentalRepository:
+    """Асинхронный репозиторий аренд (чтение)"""
+
+    def __init__(self, session: AsyncSession):
+        self.session_db = session
+
+    async def get_by_rent_id(self, rent_id: int) -> Optional[Rental]:
+        result = await self.session_db.execute(
+            select(Rental).options(*_WITH_RELATIONS).where(Rental.rent_id == rent_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def find_by_filters(self, rental_filter_dto: RentalFilterDTO) -> List[Rental]:
+        query = select(Rental).options(*_WITH_RELATIONS)
+        filters = build_rental_filters(rental_filter_dto)
+
+        if filters:
+            query = query.where(*filters)
+
+        result = await self.session_db.execute(query)
+        return list(result.scalars().all())
+
+    async def find_page(self, rental_filter_dto: RentalFilterDTO,
+                        page: PageRequestDTO) -> Tuple[List[Rental], Optional[str]]:
+        query = select(Rental).options(*_WITH_RELATIONS).where(*build_rental_filters(rental_filter_dto))
+        query, state = RENTAL_KEYSET.apply(query, page)
+        result = await self.session_db.execute(query)
+        return RENTAL_KEYSET.page(result.scalars().all(), state)
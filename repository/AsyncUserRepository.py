@@ -0,0 +1,22 @@
+from entity import User
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+
+class AsyncUserRepository:
+    """Асинхронный репозиторий сотрудников (чтение)"""
+
+    def __init__(self, session: AsyncSession):
+        self.session_db = session
+
+    async def get_by_user_id(self, user_id: int) -> Optional[User]:
+        return await self.session_db.get(User, user_id)
+
+    async def exists(self, user_id: int) -> bool:
+        result = await self.session_db.execute(select(User.user_id).where(User.user_id == user_id))
+        return result.first() is not None
+
+    async def count_all(self) -> int:
+        return await self.session_db.scalar(select(func.count(User.user_id)))
@@ -1,13 +1,77 @@
 from dto.CarDTO import CarFilterDTO
 from entity import Car, CarStatus, CarSpecifications
 from dto import CarUpdateDTO, CarFilterDTO
-
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, func, desc, asc
-from typing import Optional, List, Dict
+from dto import PageRequestDTO
+from config.replicas import read_only
+from .Keyset import Keyset
+from .UniqueViolation import UniqueViolation
+
+from sqlalchemy.orm import Session, joinedload, contains_eager
+from sqlalchemy import Row, Select, and_, bindparam, func, desc, asc, insert, select
+from sqlalchemy.exc import IntegrityError
+from functools import lru_cache
+from typing import Any, Optional, List, Dict, Iterator, Sequence, Tuple
 from datetime import datetime
 
 
+def _contains(value: str) -> str:
+    return f'%{value}%'
+
+
+# Поле CarFilterDTO -> (условие по параметру запроса, преобразование значения)
+CAR_FILTERS = {
+    'license_plate': (Car.license_plate.ilike, _contains),
+    'vin': (Car.vin.ilike, _contains),
+    'status': (Car.status.ilike, None),
+    'min_rate': (Car.daily_rate.__gt__, None),
+    'max_rate': (Car.daily_rate.__lt__, None),
+    'model': (CarSpecifications.name.ilike, _contains),
+    'transmission': (CarSpecifications.transmission.ilike, None),
+    'actuator': (CarSpecifications.actuator.ilike, None),
+    'color': (CarSpecifications.color.ilike, _contains),
+    'min_power': (CarSpecifications.power.__ge__, None),
+    'max_power': (CarSpecifications.power.__le__, None),
+}
+SPEC_FILTERS = frozenset(('model', 'transmission', 'actuator', 'color', 'min_power', 'max_power'))
+
+
+@lru_cache(maxsize=256)
+def _car_query_for_shape(shape: Tuple[str, ...], ids_only: bool) -> Select:
+    """
+    Запрос для набора заполненных полей фильтра. Значения передаются
+    параметрами, поэтому запрос строится один раз на форму фильтра, а
+    SQLAlchemy переиспользует для него скомпилированный SQL.
+    """
+    if ids_only:
+        query = select(Car.car_id)
+        if SPEC_FILTERS.intersection(shape):
+            query = query.join(Car.car_specifications)
+    else:
+        # Один JOIN и для условий, и для загрузки характеристик
+        query = select(Car).outerjoin(Car.car_specifications).options(contains_eager(Car.car_specifications))
+
+    conditions = [CAR_FILTERS[name][0](bindparam(name)) for name in shape]
+    if conditions:
+        query = query.where(and_(*conditions))
+    return query.order_by(Car.car_id)
+
+
+def compile_car_filter(car_filter_dto: CarFilterDTO, ids_only: bool = False) -> Tuple[Select, Dict[str, Any]]:
+    """Запрос и параметры поиска автомобилей (общие для синхронного и асинхронного репозиториев)"""
+    values = car_filter_dto.model_dump()
+    shape = tuple(name for name in CAR_FILTERS if values.get(name) not in (None, ''))
+
+    params = {}
+    for name in shape:
+        convert = CAR_FILTERS[name][1]
+        params[name] = convert(values[name]) if convert else values[name]
+    return _car_query_for_shape(shape, ids_only), params
+
+
+# Ключи сортировки страниц: каждый покрыт индексом
+CAR_KEYSET = Keyset(Car, 'car_id', ('daily_rate',))
+
+
 class CarRepository:
     """Репозиторий для работы с автомобилями"""
 
@@ -21,6 +85,25 @@ class CarRepository:
         self.session_db.refresh(car)
         return car
 
+    def insert_with_specs(self, car: Dict[str, Any], specifications: Optional[Dict[str, Any]] = None) -> Row:
+        """
+        Автомобиль и его характеристики одной транзакцией с одним commit.
+        Уникальность VIN и номера заранее не проверяется — дубликат отклоняет
+        уникальный индекс (UniqueViolation). Возвращает строку автомобиля (RETURNING / OUTPUT).
+        """
+        try:
+            row = self.session_db.execute(insert(Car).values(**car).returning(*Car.__table__.c)).one()
+            if specifications is not None:
+                self.session_db.execute(insert(CarSpecifications).values(car_id=row.car_id, **specifications))
+            self.session_db.commit()
+        except IntegrityError as error:
+            self.session_db.rollback()
+            violation = UniqueViolation.from_error(error, Car.__table__)
+            if violation is None:
+                raise
+            raise violation from error
+        return row
+
     def update(self, update_data: Optional[CarUpdateDTO]) -> Optional[Car]:
         """Обновление информации об автомобиле"""
         car = self.get_by_id(update_data.car_id)
@@ -49,55 +132,82 @@ class CarRepository:
         return self.session_db.query(Car).filter(Car.car_id == car_id).first()
 
 
+    @read_only
     def find_by_filters(self, car_filter_dto: CarFilterDTO) -> List[type[Car]]:
-        """Поиск по нескольким фильтрам"""
-
-        query = self.session_db.query(Car)
-        filters = []
-
-        if car_filter_dto.license_plate:
-            filters.append(Car.license_plate.olike(f'%{car_filter_dto.license_plate}%'))
-        if car_filter_dto.vin:
-            filters.append(Car.vin.ilike(f'%{car_filter_dto.vin}%'))
-        if car_filter_dto.status:
-            filters.append(Car.status.ilike(car_filter_dto.status))
-        if car_filter_dto.min_rate is not None:
-            filters.append(Car.daily_rate > car_filter_dto.min_rate)
-        if car_filter_dto.max_rate is not None:
-            filters.append(Car.daily_rate < car_filter_dto.max_rate)
-
-        if car_filter_dto.model:
-            filters.append(
-                Car.car_specifications.has(CarSpecifications.name.ilike(f'%{car_filter_dto.model}%'))
-            )
-        if car_filter_dto.transmission:
-            filters.append(
-                Car.car_specifications.has(CarSpecifications.transmission.ilike(car_filter_dto.transmission))
+        """Поиск по нескольким фильтрам; характеристики загружаются тем же запросом"""
+        query, params = compile_car_filter(car_filter_dto)
+        return list(self.session_db.execute(query, params).scalars())
+
+    @read_only
+    def find_page(self, car_filter_dto: CarFilterDTO, page: PageRequestDTO) -> Tuple[List[Car], Optional[str]]:
+        """Страница find_by_filters и курсор следующей страницы"""
+        query, params = compile_car_filter(car_filter_dto)
+        query, state = CAR_KEYSET.apply(query, page)
+        return CAR_KEYSET.page(self.session_db.execute(query, params).scalars().all(), state)
+
+    def stream_by_filters(self, car_filter_dto: CarFilterDTO, chunk_size: int) -> Iterator[Sequence[Car]]:
+        """
+        find_by_filters пачками по chunk_size строк. Запрос читается курсором
+        на стороне сервера (yield_per включает stream_results), поэтому
+        в памяти одновременно находится только одна пачка.
+        """
+        query, params = compile_car_filter(car_filter_dto)
+        result = self.session_db.execute(query.execution_options(yield_per=chunk_size), params)
+        yield from result.scalars().partitions()
+
+    @read_only
+    def get_search_rows(self) -> List[Tuple[int, str, str, Optional[str]]]:
+        """(car_id, номер, VIN, модель) всех автомобилей для поискового индекса"""
+        query = select(Car.car_id, Car.license_plate, Car.vin, CarSpecifications.name) \
+            .outerjoin(CarSpecifications, CarSpecifications.car_id == Car.car_id)
+        return [tuple(row) for row in self.session_db.execute(query)]
+
+    @read_only
+    def get_stats_rows(self) -> List[Tuple[int, str, int]]:
+        """(car_id, статус, стоимость суток) всех автомобилей для счётчиков парка"""
+        return [tuple(row) for row in self.session_db.execute(select(Car.car_id, Car.status, Car.daily_rate))]
+
+    @read_only
+    def get_car_models(self) -> List[Tuple[int, str]]:
+        """(car_id, модель) всех автомобилей с характеристиками"""
+        query = select(CarSpecifications.car_id, CarSpecifications.name)
+        return [tuple(row) for row in self.session_db.execute(query)]
+
+    @read_only
+    def get_fleet_models(self) -> List[Tuple[int, Optional[str]]]:
+        """(car_id, модель) всех автомобилей по возрастанию car_id; без характеристик — None"""
+        query = select(Car.car_id, CarSpecifications.name) \
+            .outerjoin(CarSpecifications, CarSpecifications.car_id == Car.car_id) \
+            .order_by(Car.car_id)
+        return [tuple(row) for row in self.session_db.execute(query)]
+
+    @read_only
+    def get_all_ids(self) -> List[int]:
+        return [car_id for car_id, in self.session_db.query(Car.car_id).order_by(Car.car_id)]
+
+    @read_only
+    def find_ids_by_filters(self, car_filter_dto: CarFilterDTO) -> List[int]:
+        """Как find_by_filters, но только идентификаторы"""
+        query, params = compile_car_filter(car_filter_dto, ids_only=True)
+        return list(self.session_db.execute(query, params).scalars())
+
+    @read_only
+    def get_with_specifications_by_ids(self, car_ids: List[int], chunk_size: int = 1000) -> List[Car]:
+        """Автомобили с характеристиками по списку id; IN разбивается на части (лимит параметров MSSQL)"""
+        cars = []
+        for i in range(0, len(car_ids), chunk_size):
+            cars.extend(
+                self.session_db.query(Car)
+                .options(joinedload(Car.car_specifications))
+                .filter(Car.car_id.in_(car_ids[i:i + chunk_size]))
+                .order_by(Car.car_id)
+                .all()
             )
-        if car_filter_dto.actuator:
-            filters.append(
-                Car.car_specifications.has(CarSpecifications.actuator.ilike(car_filter_dto.actuator))
-            )
-        if car_filter_dto.color:
-            filters.append(
-                Car.car_specifications.has(CarSpecifications.color.ilike(f'%{car_filter_dto.color}%'))
-            )
-        if car_filter_dto.min_power is not None:
-            filters.append(
-                Car.car_specifications.has(CarSpecifications.power >= car_filter_dto.min_power)
-            )
-        if car_filter_dto.max_power is not None:
-            filters.append(
-                Car.car_specifications.has(CarSpecifications.power <= car_filter_dto.max_power)
-            )
-
-        if filters:
-            query = query.filter(and_(*filters))
-
-        return query.all()
+        return cars
 
     # ==================== СТАТИСТИКА И АНАЛИТИКА ====================
 
+    @read_only
     def get_status_distribution(self) -> Dict[str, int]:
         """Распределение автомобилей по статусам"""
         results = self.session_db.query(
@@ -107,10 +217,12 @@ class CarRepository:
 
         return {status: count for status, count in results}
 
+    @read_only
     def get_most_expensive_cars(self, limit: int = 10) -> list[type[Car]]:
         """Самые дорогие автомобили для аренды"""
         return self.session_db.query(Car).order_by(desc(Car.daily_rate)).limit(limit).all()
 
+    @read_only
     def get_cheapest_cars(self, limit: int = 10) -> List[Car]:
         """Самые дешевые автомобили для аренды"""
         return self.session_db.query(Car).filter(
@@ -150,7 +262,7 @@ class CarRepository:
         """Обновление стоимости аренды"""
         if new_rate <= 0:
             raise ValueError("Стоимость аренды должна быть положительной")
-        return self.update(car_id, {'daily_rate': new_rate})
+        return self.update(CarUpdateDTO(car_id=car_id, daily_rate=new_rate))
 
     def is_car_available(self, car_id: int) -> bool:
         """Проверка доступности автомобиля для аренды"""
@@ -190,10 +302,12 @@ class CarRepository:
         query = self.session_db.query(Car).filter(Car.car_id == car_id)
         return query.first() is not None
 
+    @read_only
     def count_all(self) -> int:
         """Общее количество автомобилей"""
         return self.session_db.query(Car).count()
 
+    @read_only
     def count_by_status(self, status: str) -> int:
         """Количество автомобилей по статусу"""
         return self.session_db.query(Car) \
@@ -1,10 +1,32 @@
 from entity import Client, Rental
-from dto import ClientUpdateDTO, ClientFilterDTO
+from dto import ClientUpdateDTO, ClientFilterDTO, PageRequestDTO
+from config.replicas import read_only
+from .Keyset import Keyset
+from .UniqueViolation import UniqueViolation
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import Row, and_, insert, select
+from sqlalchemy.exc import IntegrityError
+
+
+def build_client_filters(client_filter_dto: ClientFilterDTO) -> list:
+    """Условия поиска клиентов (общие для синхронного и асинхронного репозиториев)"""
+    filters = []
+    if client_filter_dto.name:
+        filters.append(Client.name.ilike(f'%{client_filter_dto.name}%'))
+    if client_filter_dto.phone:
+        filters.append(Client.phone.ilike(f'%{client_filter_dto.phone}%'))
+    if client_filter_dto.telegram_id:
+        filters.append(Client.telegram_id.ilike(f'%{client_filter_dto.telegram_id}%'))
+    if client_filter_dto.license_number:
+        filters.append(Client.license_number.ilike(f'%{client_filter_dto.license_number}%'))
+    return filters
+
+
+# Ключи сортировки страниц: каждый покрыт индексом
+CLIENT_KEYSET = Keyset(Client, 'client_id', ('name', 'created_at'))
 
 
 class ClientRepository:
@@ -18,6 +40,22 @@ class ClientRepository:
         self.session_db.refresh(client)
         return client
 
+    def insert(self, client: Dict[str, Any]) -> Row:
+        """
+        Создать клиента одним INSERT ... RETURNING и одним commit: дубликаты телефона,
+        Telegram ID и ВУ отклоняют уникальные индексы (UniqueViolation)
+        """
+        try:
+            row = self.session_db.execute(insert(Client).values(**client).returning(*Client.__table__.c)).one()
+            self.session_db.commit()
+        except IntegrityError as error:
+            self.session_db.rollback()
+            violation = UniqueViolation.from_error(error, Client.__table__)
+            if violation is None:
+                raise
+            raise violation from error
+        return row
+
     def update(self, update_data: Optional[ClientUpdateDTO]) -> Optional[Client]:
         """Обновление информации о клиенте"""
         client = self.get_by_id(update_data.client_id)
@@ -27,7 +65,7 @@ class ClientRepository:
             for key, value in client_info.items():
                 if hasattr(client, key) and value is not None:
                     setattr(client, key, value)
-            client.created_at = datetime.now()  # Обновляем время изменения
+            client.updated_at = datetime.now()  # Обновляем время изменения
             self.session_db.commit()
             self.session_db.refresh(client)
         return client
@@ -44,6 +82,13 @@ class ClientRepository:
     def get_by_id(self, client_id: int) -> Optional[Client]:
         return self.session_db.query(Client).filter(Client.client_id == client_id).first()
 
+    @read_only
+    def get_search_rows(self) -> List[Tuple[int, str, str, Optional[str], str]]:
+        """(client_id, имя, телефон, Telegram ID, ВУ) всех клиентов для поискового индекса"""
+        query = select(Client.client_id, Client.name, Client.phone, Client.telegram_id, Client.license_number)
+        return [tuple(row) for row in self.session_db.execute(query)]
+
+    @read_only
     def get_by_name(self, name: str) -> List[type[Client]]:
         return self.session_db.query(Client).filter(Client.name.ilike(f'%{name}%')).all()
 
@@ -74,20 +119,22 @@ class ClientRepository:
         return query.first() is not None
 
 
+    @read_only
     def find_by_filters(self, client_filter_dto: ClientFilterDTO) -> List[type[Client]]:
         query = self.session_db.query(Client)
-        filters = []
-        if client_filter_dto.name:
-            filters.append(Client.name.ilike(f'%{client_filter_dto.name}%'))
-        if client_filter_dto.phone:
-            filters.append(Client.phone.ilike(f'%{client_filter_dto.phone}%'))
-        if client_filter_dto.telegram_id:
-            filters.append(Client.telegram_id.ilike(f'%{client_filter_dto.telegram_id}%'))
-        if client_filter_dto.license_number:
-            filters.append(Client.license_number.ilike(f'%{client_filter_dto.license_number}%'))
+        filters = build_client_filters(client_filter_dto)
 
         if filters:
             query = query.filter(and_(*filters))
         return query.all()
 
+    @read_only
+    def find_page(self, client_filter_dto: ClientFilterDTO, page: PageRequestDTO) -> Tuple[List[Client], Optional[str]]:
+        """Страница find_by_filters и курсор следующей страницы"""
+        query, state = CLIENT_KEYSET.apply(select(Client).where(*build_client_filters(client_filter_dto)), page)
+        return CLIENT_KEYSET.page(self.session_db.execute(query).scalars().all(), state)
 
+    @read_only
+    def get_page_by_name(self, name: str, page: PageRequestDTO) -> Tuple[List[Client], Optional[str]]:
+        query, state = CLIENT_KEYSET.apply(select(Client).where(Client.name.ilike(f'%{name}%')), page)
+        return CLIENT_KEYSET.page(self.session_db.execute(query).scalars().all(), state)
@@ -0,0 +1,137 @@
+from dto import PageRequestDTO
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, and_, or_
+
+
+class InvalidCursorError(ValueError):
+    """Курсор повреждён или получен для другой сортировки"""
+
+
+class PageLimits:
+    """Размер страницы по умолчанию и максимальный (секция pagination конфигурации)"""
+
+    def __init__(self, default_size: int = 50, max_size: int = 500):
+        self.default_size = default_size
+        self.max_size = max_size
+
+    def resolve(self, limit: Optional[int]) -> int:
+        if limit is None:
+            return min(self.default_size, self.max_size)
+        return min(limit, self.max_size)
+
+
+page_limits = PageLimits()
+
+
+class KeysetState:
+    """Параметры уже применённой к запросу страницы"""
+
+    def __init__(self, sort: str, limit: int):
+        self.sort = sort
+        self.limit = limit
+
+
+class Keyset:
+    """
+    Пагинация по ключу (keyset): вместо OFFSET следующая страница
+    начинается после значения (ключ сортировки, первичный ключ) последней
+    строки. Запрос любой страницы идёт по индексу сортировки и стоит
+    столько же, сколько первая. Курсор — base64 от JSON с сортировкой
+    и значениями ключа; для клиента он непрозрачен.
+    """
+
+    def __init__(self, entity, primary_key: str, sort_keys: Iterable[str], default_sort: Optional[str] = None):
+        self.entity = entity
+        self.primary_key = primary_key
+        self.sort_keys = frozenset(sort_keys) | {primary_key}
+        self.default_sort = default_sort or primary_key
+
+    def _column(self, name: str):
+        return getattr(self.entity, name)
+
+    def _resolve_sort(self, sort: Optional[str]) -> Tuple[str, bool]:
+        sort = sort or self.default_sort
+        descending = sort.startswith('-')
+        name = sort.lstrip('-')
+        if name not in self.sort_keys:
+            raise ValueError(f"Сортировка по {name} недоступна. Допустимые ключи: {sorted(self.sort_keys)}")
+        return name, descending
+
+    # ==================== КУРСОР ====================
+
+    @staticmethod
+    def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+        payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+        raw = json.dumps({'s': sort, 'v': payload}, separators=(',', ':'), ensure_ascii=False)
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor: str, sort: str) -> List[Any]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            data = json.loads(raw)
+            if data['s'] != sort:
+                raise InvalidCursorError("Курсор получен для другой сортировки")
+
+            name = sort.lstrip('-')
+            value, key = data['v']
+            if value is not None and self._column(name).type.python_type is datetime:
+                value = datetime.fromisoformat(value)
+            return [value, key]
+        except InvalidCursorError:
+            raise
+        except (binascii.Error, ValueError, KeyError, TypeError, NotImplementedError):
+            raise InvalidCursorError("Некорректный курсор")
+
+    # ==================== ЗАПРОС ====================
+
+    def _after(self, name: str, descending: bool, value: Any, key: Any):
+        """Условие «строка идёт после (value, key)» при NULL в начале возрастающего порядка"""
+        column, pk = self._column(name), self._column(self.primary_key)
+        pk_after = pk < key if descending else pk > key
+
+        if name == self.primary_key:
+            return pk_after
+        if value is None:
+            # NULL-значения идут первыми по возрастанию и последними по убыванию
+            return and_(column.is_(None), pk_after) if descending \
+                else or_(column.is_not(None), and_(column.is_(None), pk_after))
+
+        after = column < value if descending else column > value
+        condition = or_(after, and_(column == value, pk_after))
+        return or_(condition, column.is_(None)) if descending else condition
+
+    def apply(self, query: Select, page: PageRequestDTO) -> Tuple[Select, KeysetState]:
+        """Добавить к запросу сортировку, условие курсора и LIMIT (на одну строку больше страницы)"""
+        name, descending = self._resolve_sort(page.sort)
+        sort = f"-{name}" if descending else name
+        limit = page_limits.resolve(page.limit)
+
+        column, pk = self._column(name), self._column(self.primary_key)
+        order = [column.desc() if descending else column.asc()]
+        if name != self.primary_key:
+            order.append(pk.desc() if descending else pk.asc())
+        query = query.order_by(None).order_by(*order)
+
+        if page.cursor:
+            value, key = self.decode_cursor(page.cursor, sort)
+            query = query.where(self._after(name, descending, value, key))
+
+        # Лишняя строка показывает, есть ли следующая страница
+        return query.limit(limit + 1), KeysetState(sort, limit)
+
+    def page(self, rows: Sequence[Any], state: KeysetState) -> Tuple[List[Any], Optional[str]]:
+        """Строки страницы и курсор следующей страницы"""
+        rows = list(rows)
+        if len(rows) <= state.limit:
+            return rows, None
+
+        rows = rows[:state.limit]
+        last = rows[-1]
+        name = state.sort.lstrip('-')
+        return rows, self.encode_cursor(state.sort, [getattr(last, name), getattr(last, self.primary_key)])
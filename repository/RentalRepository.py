@@ -1,25 +1,141 @@
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, between
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import Row, and_, or_, between, func, insert, literal, select, update
 
-from dto import RentalUpdateDTO, RentalStatusEnum, RentalFilterDTO
-from entity import Rental
+from dto import RentalUpdateDTO, RentalStatusEnum, RentalFilterDTO, PageRequestDTO
+from entity import Rental, Car, Client, User
 from entity import RentalStatus
+from config.replicas import read_only
+from .Keyset import Keyset
+from .RentalRollupRepository import RentalRollupRepository, rollup_source
+
+
+def build_rental_filters(rental_filter_dto: RentalFilterDTO) -> list:
+    """Условия поиска аренд (общие для синхронного и асинхронного репозиториев)"""
+    filters = []
+
+    if rental_filter_dto.client_id:
+        filters.append(Rental.client_id == rental_filter_dto.client_id)
+    if rental_filter_dto.car_id:
+        filters.append(Rental.car_id == rental_filter_dto.car_id)
+    if rental_filter_dto.user_id:
+        filters.append(Rental.user_id == rental_filter_dto.user_id)
+    if rental_filter_dto.time_range:
+        if len(rental_filter_dto.time_range) != 2:
+            raise ValueError("time_range должен иметь длину 2.")
+        filters.append(or_(
+            Rental.start_date.between(*rental_filter_dto.time_range),
+            Rental.end_date.between(*rental_filter_dto.time_range)
+        ))
+    if rental_filter_dto.status:
+        filters.append(Rental.status == rental_filter_dto.status)
+
+    return filters
+
+
+# Аренда с автомобилем, характеристиками, клиентом и сотрудником одним запросом:
+# все связи «многие к одному», поэтому JOIN не размножает строки
+RENTAL_WITH_RELATIONS = (
+    joinedload(Rental.car).joinedload(Car.car_specifications),
+    joinedload(Rental.client),
+    joinedload(Rental.user),
+)
+
+def overlapping_rentals(car_id: int, start: datetime, end: datetime, exclude_rent_id: Optional[int] = None):
+    """
+    Подзапрос аренд автомобиля, пересекающих [start, end], для условия NOT EXISTS.
+    В MSSQL блокировка диапазона не даёт двум одновременным записям пройти проверку вместе.
+    """
+    query = select(Rental.rent_id).where(
+        Rental.car_id == car_id,
+        Rental.status != RentalStatus.CANCELLED,
+        Rental.start_date <= end,
+        func.coalesce(Rental.actual_return_date, Rental.end_date) >= start
+    )
+    if exclude_rent_id is not None:
+        query = query.where(Rental.rent_id != exclude_rent_id)
+    return query.with_hint(Rental, 'WITH (UPDLOCK, HOLDLOCK)', 'mssql')
+
+
+# Ключи сортировки страниц: каждый покрыт индексом
+RENTAL_KEYSET = Keyset(Rental, 'rent_id', ('start_date', 'created_at'))
 
 
 class RentalRepository:
-    """Репозиторий для работы с арендами автомобилей"""
+    """
+    Репозиторий для работы с арендами автомобилей. Изменения закрытых аренд
+    попадают в сводки отчётов той же транзакцией, что и сама аренда.
+    """
 
     def __init__(self, session: Session):
         self.session_db = session
+        self.rollup_repo = RentalRollupRepository(session)
 
     def create(self, rental: Rental) -> Rental:
-        """Сохранить аренду (создать или обновить)"""
+        """Сохранить аренду (создать или обновить); возвращает аренду со связями"""
+        # Сводки меняет только новая аренда: изменения существующих идут через update
+        is_new = rental.rent_id is None
         self.session_db.add(rental)
+        self.session_db.flush()
+        # rent_id читаем до commit: после него обращение к атрибуту перечитало бы строку
+        rent_id = rental.rent_id
+        if is_new:
+            self.rollup_repo.apply(None, rollup_source(rental))
         self.session_db.commit()
-        self.session_db.refresh(rental)
-        return rental
+        return self.get_with_relations(rent_id)
+
+    def create_if_available(self, values: Dict[str, Any]) -> Optional[Row]:
+        """
+        Создать аренду одним запросом INSERT ... SELECT ... WHERE NOT EXISTS:
+        строка вставляется, только если у автомобиля нет пересекающейся аренды,
+        существование клиента, автомобиля и сотрудника проверяют внешние ключи
+        (IntegrityError). Возвращает вставленную строку (RETURNING / OUTPUT)
+        или None, если автомобиль занят.
+        """
+        table = Rental.__table__
+        overlapping = overlapping_rentals(values['car_id'], values['start_date'], values['end_date'])
+
+        names = list(values)
+        source = select(*(literal(values[name], table.c[name].type) for name in names)) \
+            .where(~overlapping.exists())
+        row = self.session_db.execute(insert(Rental).from_select(names, source).returning(*table.c)).first()
+        if row is not None:
+            # Новая бронь открыта, сводки меняются только для аренды, созданной сразу закрытой
+            self.rollup_repo.apply(None, rollup_source(row))
+        self.session_db.commit()
+        return row
+
+    def extend_if_available(self, rent_id: int, car_id: int, start: datetime, new_end_date: datetime) -> Optional[Row]:
+        """
+        Продлить аренду до new_end_date одним запросом UPDATE ... WHERE NOT EXISTS:
+        срок меняется, только если у автомобиля нет другой аренды, пересекающей
+        [start, new_end_date]. Проверку делает БД, поэтому брони других процессов
+        тоже учитываются. Возвращает обновлённую строку или None, если автомобиль занят.
+        Сводки не меняются: плановый конец в них не входит.
+        """
+        row = self.session_db.execute(
+            update(Rental)
+            .where(Rental.rent_id == rent_id,
+                   ~overlapping_rentals(car_id, start, new_end_date, exclude_rent_id=rent_id).exists())
+            .values(end_date=new_end_date)
+            .returning(*Rental.__table__.c)
+            .execution_options(synchronize_session=False)
+        ).first()
+        self.session_db.commit()
+        return row
+
+    def get_booking_relations(self, car_id: int, client_id: int,
+                              user_id: int) -> Tuple[Optional[Car], Optional[Client], Optional[User]]:
+        """Автомобиль с характеристиками, клиент и сотрудник одним запросом; отсутствующие — None"""
+        anchor = select(literal(1).label('anchor')).subquery()
+        query = select(Car, Client, User).select_from(anchor) \
+            .outerjoin(Car, Car.car_id == car_id) \
+            .outerjoin(Client, Client.client_id == client_id) \
+            .outerjoin(User, User.user_id == user_id) \
+            .options(joinedload(Car.car_specifications))
+        car, client, user = self.session_db.execute(query).one()
+        return car, client, user
 
     def update(self, update_data: Optional[RentalUpdateDTO]) -> Optional[Rental]:
         """Обновление информации о клиенте"""
@@ -27,12 +143,16 @@ class RentalRepository:
         rental_info = update_data.model_dump()
 
         if rental:
+            before = rollup_source(rental)
             for key, value in rental_info.items():
                 if hasattr(rental, key) and value is not None:
                     setattr(rental, key, value)
-            rental.created_at = datetime.now()  # Обновляем время изменения
+            rental.updated_at = datetime.now()  # Обновляем время изменения
+            rent_id = rental.rent_id
+            self.rollup_repo.apply(before, rollup_source(rental))
             self.session_db.commit()
-            self.session_db.refresh(rental)
+            # После commit сущности просрочены: один запрос со связями обновляет весь граф
+            rental = self.get_with_relations(rent_id)
         return rental
 
     def extend_rental(self, rental_id: int, new_end_date: datetime) -> Optional[Rental]:
@@ -72,56 +192,89 @@ class RentalRepository:
 
     def delete(self, rental_id: int) -> bool:
         """Удаление клиента"""
-        car = self.get_by_rent_id(rental_id)
-        if car:
-            self.session_db.delete(car)
+        rental = self.get_by_rent_id(rental_id)
+        if rental:
+            self.rollup_repo.apply(rollup_source(rental), None)
+            self.session_db.delete(rental)
             self.session_db.commit()
             return True
         return False
 
+    @read_only
     def find_by_filters(self, rental_filter_dto: RentalFilterDTO) -> List[type[Rental]]:
-        query = self.session_db.query(Rental)
-        filters = []
-
-        if rental_filter_dto.client_id:
-            filters.append(Rental.client_id == rental_filter_dto.client_id)
-        if rental_filter_dto.car_id:
-            filters.append(Rental.car_id == rental_filter_dto.car_id)
-        if rental_filter_dto.user_id:
-            filters.append(Rental.user_id == rental_filter_dto.user_id)
-        if rental_filter_dto.time_range:
-            if len(rental_filter_dto.time_range) != 2:
-                raise ValueError("time_range должен иметь длину 2.")
-            filters.append(or_(
-                Rental.start_date.between(*rental_filter_dto.time_range),
-                Rental.end_date.between(*rental_filter_dto.time_range)
-            ))
-        if rental_filter_dto.status:
-            filters.append(Rental.status == rental_filter_dto.status)
+        query = self.session_db.query(Rental).options(*RENTAL_WITH_RELATIONS)
+        filters = build_rental_filters(rental_filter_dto)
 
         if filters:
             query = query.filter(*filters)
         return query.all()
 
+    @read_only
+    def find_page(self, rental_filter_dto: RentalFilterDTO, page: PageRequestDTO) -> Tuple[List[Rental], Optional[str]]:
+        """Страница find_by_filters (со связями) и курсор следующей страницы"""
+        query = select(Rental).options(*RENTAL_WITH_RELATIONS).where(*build_rental_filters(rental_filter_dto))
+        query, state = RENTAL_KEYSET.apply(query, page)
+        return RENTAL_KEYSET.page(self.session_db.execute(query).scalars().all(), state)
+
+    def stream_by_filters(self, rental_filter_dto: RentalFilterDTO, chunk_size: int) -> Iterator[Sequence[Rental]]:
+        """find_by_filters со связями пачками по chunk_size строк через курсор на стороне сервера"""
+        query = select(Rental) \
+            .options(*RENTAL_WITH_RELATIONS) \
+            .where(*build_rental_filters(rental_filter_dto)) \
+            .order_by(Rental.rent_id) \
+            .execution_options(yield_per=chunk_size)
+        yield from self.session_db.execute(query).scalars().partitions()
+
     def get_by_rent_id(self, rent_id: int) -> Optional[Rental]:
-        return self.session_db.query(Rental).filter(Rental.rent_id == rent_id).first()
+        # Уже загруженная в сессию аренда берётся из identity map без запроса
+        return self.session_db.get(Rental, rent_id)
+
+    def get_with_relations(self, rent_id: int) -> Optional[Rental]:
+        """Аренда с автомобилем, характеристиками, клиентом и сотрудником одним запросом"""
+        return self.session_db.query(Rental) \
+            .options(*RENTAL_WITH_RELATIONS) \
+            .filter(Rental.rent_id == rent_id) \
+            .first()
 
     def is_car_available(self, car_id: int, start_date: datetime, end_date: datetime) -> bool:
         """Проверить, доступен ли автомобиль для аренды в указанный период"""
 
-        res = self.session_db.query(Rental).filter(
+        # Периоды пересекаются, если каждый начинается не позже конца другого:
+        # так находятся и аренды, целиком накрывающие запрошенный период
+        res = self.session_db.query(Rental.rent_id).filter(
             and_(
                 Rental.car_id == car_id,
                 Rental.status != RentalStatus.CANCELLED,
-                or_(
-                    and_(start_date <= Rental.start_date, Rental.start_date <= end_date),
-                    and_(start_date <= Rental.end_date, Rental.end_date <= end_date)
-                )
+                Rental.start_date <= end_date,
+                func.coalesce(Rental.actual_return_date, Rental.end_date) >= start_date
             )
         ).first()
 
         return res is None
 
+    def get_busy_intervals(self, car_id: int) -> List[Tuple[int, datetime, datetime]]:
+        """Занятые периоды автомобиля (rent_id, начало, конец) для индекса занятости"""
+        rows = self.session_db.query(
+            Rental.rent_id,
+            Rental.start_date,
+            func.coalesce(Rental.actual_return_date, Rental.end_date)
+        ).filter(
+            Rental.car_id == car_id,
+            Rental.status != RentalStatus.CANCELLED
+        ).all()
+        return [tuple(row) for row in rows]
+
+    @read_only
+    def get_busy_intervals_between(self, start: datetime, end: datetime) -> List[Tuple[int, datetime, datetime]]:
+        """Занятые периоды всех автомобилей (car_id, начало, конец), пересекающие [start, end]"""
+        actual_end = func.coalesce(Rental.actual_return_date, Rental.end_date)
+        rows = self.session_db.query(Rental.car_id, Rental.start_date, actual_end).filter(
+            Rental.status != RentalStatus.CANCELLED,
+            Rental.start_date <= end,
+            actual_end >= start
+        ).all()
+        return [tuple(row) for row in rows]
+
     def exist(self, rent_id: int):
         res = self.session_db.query(Rental).filter(Rental.rent_id == rent_id).first()
         return res is not None
@@ -0,0 +1,271 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.dialects import sqlite
+
+from entity import Rental, RentalStatus, RentalDayRollup, RentalCarDayRollup, RentalClientDayRollup
+from config.replicas import read_only
+
+HOUR = Decimal(3600)
+CENT = Decimal('0.01')
+
+# (car_id, client_id, начало, фактический возврат, статус, стоимость)
+RollupSourceRow = Tuple[int, int, datetime, Optional[datetime], str, Optional[Decimal]]
+
+# Сводки считаются только по закрытым арендам: открытая аренда (бронь, выдача,
+# продление) в отчёты не попадает и не трогает сводные таблицы
+CLOSED_STATUSES = (RentalStatus.COMPLETED, RentalStatus.CANCELLED)
+
+# Таблица сводки и её ключ
+ROLLUP_KEYS = (
+    (RentalDayRollup, ('day',)),
+    (RentalCarDayRollup, ('day', 'car_id')),
+    (RentalClientDayRollup, ('day', 'client_id')),
+)
+ROLLUP_TABLES = tuple(table for table, _ in ROLLUP_KEYS)
+
+
+def _naive(moment: datetime) -> datetime:
+    return moment.replace(tzinfo=None)
+
+
+def _hours(seconds: float) -> Decimal:
+    return (Decimal(seconds) / HOUR).quantize(CENT)
+
+
+def rollup_source(rental) -> Optional[RollupSourceRow]:
+    """Строка для сводок из аренды (сущность или строка RETURNING); None — аренды нет"""
+    if rental is None:
+        return None
+    return (rental.car_id, rental.client_id, rental.start_date, rental.actual_return_date,
+            rental.status, rental.total_cost)
+
+
+def aggregate_rollups(rows: Iterable[RollupSourceRow], first_day: date, last_day: date
+                      ) -> Tuple[Dict[date, dict], Dict[Tuple[date, int], dict], Dict[Tuple[date, int], dict]]:
+    """
+    Сводки по дням first_day..last_day из закрытых аренд. Отмена относится
+    ко дню начала аренды; завершённая аренда даёт начало в день начала,
+    завершение и выручку в день возврата и занятость во все дни между ними.
+    Аренды в других статусах пропускаются.
+    """
+    days: Dict[date, dict] = {}
+    cars: Dict[Tuple[date, int], dict] = {}
+    clients: Dict[Tuple[date, int], dict] = {}
+
+    def day_row(day: date) -> dict:
+        row = days.get(day)
+        if row is None:
+            row = days[day] = dict(started=0, completed=0, cancelled=0, revenue=Decimal(0),
+                                   completed_hours=Decimal(0), busy_hours=Decimal(0))
+        return row
+
+    def car_row(day: date, car_id: int) -> dict:
+        row = cars.get((day, car_id))
+        if row is None:
+            row = cars[(day, car_id)] = dict(completed=0, revenue=Decimal(0), busy_hours=Decimal(0))
+        return row
+
+    def client_row(day: date, client_id: int) -> dict:
+        row = clients.get((day, client_id))
+        if row is None:
+            row = clients[(day, client_id)] = dict(started=0, completed=0, revenue=Decimal(0))
+        return row
+
+    for car_id, client_id, start, returned, status, cost in rows:
+        start = _naive(start)
+        start_day = start.date()
+        in_range = first_day <= start_day <= last_day
+
+        if status == RentalStatus.CANCELLED:
+            if in_range:
+                day_row(start_day)['cancelled'] += 1
+            continue
+        if status != RentalStatus.COMPLETED or returned is None:
+            continue
+
+        returned = _naive(returned)
+        if in_range:
+            day_row(start_day)['started'] += 1
+            client_row(start_day, client_id)['started'] += 1
+
+        if first_day <= returned.date() <= last_day:
+            revenue = Decimal(cost or 0)
+            row = day_row(returned.date())
+            row['completed'] += 1
+            row['revenue'] += revenue
+            row['completed_hours'] += _hours(max((returned - start).total_seconds(), 0))
+            for row in (car_row(returned.date(), car_id), client_row(returned.date(), client_id)):
+                row['completed'] += 1
+                row['revenue'] += revenue
+
+        # Занятость: пересечение [начало, возврат) с каждым днём диапазона
+        day = max(start_day, first_day)
+        while day <= last_day:
+            day_start = datetime.combine(day, time.min)
+            if day_start >= returned:
+                break
+            busy = min(returned, day_start + timedelta(days=1)) - max(start, day_start)
+            if busy > timedelta(0):
+                hours = _hours(busy.total_seconds())
+                day_row(day)['busy_hours'] += hours
+                car_row(day, car_id)['busy_hours'] += hours
+            day += timedelta(days=1)
+
+    return days, cars, clients
+
+
+def _contribution(row: Optional[RollupSourceRow]) -> Tuple[dict, dict, dict]:
+    """Вклад одной аренды во все дни, которых она касается"""
+    if row is None or row[4] not in CLOSED_STATUSES:
+        return {}, {}, {}
+    start = _naive(row[2])
+    finish = _naive(row[3]) if row[3] is not None else start
+    return aggregate_rollups([row], start.date(), max(start, finish).date())
+
+
+def _subtract(after: dict, before: dict) -> dict:
+    delta = {}
+    for key in after.keys() | before.keys():
+        new, old = after.get(key), before.get(key)
+        row = {name: (new[name] if new else 0) - (old[name] if old else 0) for name in (new or old)}
+        if any(row.values()):
+            delta[key] = row
+    return delta
+
+
+def rollup_delta(before: Optional[RollupSourceRow], after: Optional[RollupSourceRow]
+                 ) -> Tuple[dict, dict, dict]:
+    """Изменение сводок (по дням, автомобилям и клиентам), когда аренда переходит из before в after"""
+    return tuple(_subtract(new, old) for new, old in zip(_contribution(after), _contribution(before)))
+
+
+class RentalRollupRepository:
+    """Сводные таблицы аренд по дням, автомобилям и клиентам"""
+
+    def __init__(self, session: Session):
+        self.session_db = session
+
+    def apply(self, before: Optional[RollupSourceRow], after: Optional[RollupSourceRow]):
+        """
+        Добавить к сводкам разницу между состояниями аренды before и after (None — аренды нет)
+        в текущей транзакции, без commit: его делает репозиторий аренд вместе с изменением аренды.
+        Прибавление коммутативно, поэтому одновременные записи за одни и те же дни не теряют
+        друг друга. Если закрытая часть аренды не изменилась, запросов нет.
+        """
+        for (table, keys), delta in zip(ROLLUP_KEYS, rollup_delta(before, after)):
+            if delta:
+                self._add(table, keys, [dict(zip(keys, key if isinstance(key, tuple) else (key,)), **row)
+                                        for key, row in delta.items()])
+
+    def _add(self, table, keys: Sequence[str], rows: List[dict]):
+        """Прибавить значения rows к строкам сводки по ключу keys, создавая недостающие строки"""
+        values = [name for name in rows[0] if name not in keys]
+        if self.session_db.get_bind().dialect.name == 'mssql':
+            self.session_db.execute(_merge_statement(table, keys, values), rows)
+            return
+        statement = sqlite.insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={name: getattr(table, name) + statement.excluded[name] for name in values}
+        )
+        self.session_db.execute(statement, rows)
+
+    def _source_rows(self, start: datetime, end: datetime) -> List[RollupSourceRow]:
+        """Закрытые аренды, которые касаются [start, end): отмены по дню начала, завершённые до дня возврата"""
+        rows = self.session_db.execute(select(
+            Rental.car_id, Rental.client_id, Rental.start_date,
+            Rental.actual_return_date, Rental.status, Rental.total_cost
+        ).where(
+            Rental.status.in_(CLOSED_STATUSES),
+            Rental.start_date < end,
+            func.coalesce(Rental.actual_return_date, Rental.start_date) >= start
+        # Блокировка диапазона: аренды периода не закроются, пока пересчёт не зафиксирован
+        ).with_hint(Rental, 'WITH (HOLDLOCK)', 'mssql'))
+        return [tuple(row) for row in rows]
+
+    def refresh(self, first_day: date, last_day: date):
+        """
+        Пересчитать сводки за дни first_day..last_day из таблицы аренд целиком.
+        Идемпотентно; нужно для первичного заполнения и сверки, текущие изменения
+        аренд приходят через apply.
+        """
+        if last_day < first_day:
+            first_day, last_day = last_day, first_day
+        start = datetime.combine(first_day, time.min)
+        end = datetime.combine(last_day + timedelta(days=1), time.min)
+
+        for table in ROLLUP_TABLES:
+            self.session_db.execute(delete(table).where(table.day.between(first_day, last_day)))
+        days, cars, clients = aggregate_rollups(self._source_rows(start, end), first_day, last_day)
+        if days:
+            self.session_db.execute(insert(RentalDayRollup), [dict(day=day, **row) for day, row in days.items()])
+        if cars:
+            self.session_db.execute(insert(RentalCarDayRollup),
+                                    [dict(day=day, car_id=car_id, **row) for (day, car_id), row in cars.items()])
+        if clients:
+            self.session_db.execute(insert(RentalClientDayRollup),
+                                    [dict(day=day, client_id=client_id, **row)
+                                     for (day, client_id), row in clients.items()])
+        self.session_db.commit()
+
+    def rental_span(self) -> Optional[Tuple[date, date]]:
+        """Первый и последний день, которых касаются закрытые аренды (для первичного заполнения)"""
+        first, last = self.session_db.execute(select(
+            func.min(Rental.start_date), func.max(func.coalesce(Rental.actual_return_date, Rental.start_date))
+        ).where(Rental.status.in_(CLOSED_STATUSES))).one()
+        if first is None:
+            return None
+        return first.date(), last.date()
+
+    @read_only
+    def get_totals(self, first_day: date, last_day: date) -> dict:
+        """Суммы дневных сводок за first_day..last_day"""
+        columns = ('started', 'completed', 'cancelled', 'revenue', 'completed_hours', 'busy_hours')
+        row = self.session_db.execute(select(
+            *(func.coalesce(func.sum(getattr(RentalDayRollup, column)), 0) for column in columns)
+        ).where(RentalDayRollup.day.between(first_day, last_day))).one()
+        return dict(zip(columns, row))
+
+    @read_only
+    def get_top_cars(self, first_day: date, last_day: date, limit: int) -> List[Tuple[int, int, Decimal, Decimal]]:
+        """(car_id, завершено, выручка, часы занятости) по убыванию выручки"""
+        revenue = func.sum(RentalCarDayRollup.revenue)
+        rows = self.session_db.execute(select(
+            RentalCarDayRollup.car_id, func.sum(RentalCarDayRollup.completed),
+            revenue, func.sum(RentalCarDayRollup.busy_hours)
+        ).where(
+            RentalCarDayRollup.day.between(first_day, last_day)
+        ).group_by(RentalCarDayRollup.car_id).order_by(revenue.desc(), RentalCarDayRollup.car_id).limit(limit))
+        return [tuple(row) for row in rows]
+
+    @read_only
+    def get_top_clients(self, first_day: date, last_day: date, limit: int) -> List[Tuple[int, int, int, Decimal]]:
+        """(client_id, начато, завершено, выручка) по убыванию выручки"""
+        revenue = func.sum(RentalClientDayRollup.revenue)
+        rows = self.session_db.execute(select(
+            RentalClientDayRollup.client_id, func.sum(RentalClientDayRollup.started),
+            func.sum(RentalClientDayRollup.completed), revenue
+        ).where(
+            RentalClientDayRollup.day.between(first_day, last_day)
+        ).group_by(RentalClientDayRollup.client_id).order_by(revenue.desc(), RentalClientDayRollup.client_id).limit(limit))
+        return [tuple(row) for row in rows]
+
+
+def _merge_statement(table, keys: Sequence[str], values: Sequence[str]):
+    """
+    MERGE для MSSQL: UPDLOCK и HOLDLOCK держат строку (или диапазон ключа, если строки
+    ещё нет) до конца транзакции, поэтому два писателя не вставят один ключ дважды
+    """
+    columns = list(keys) + list(values)
+    return text(
+        f"MERGE [{table.__tablename__}] WITH (UPDLOCK, HOLDLOCK) AS target "
+        f"USING (SELECT {', '.join(f':{name} AS [{name}]' for name in columns)}) AS source "
+        f"ON {' AND '.join(f'target.[{name}] = source.[{name}]' for name in keys)} "
+        f"WHEN MATCHED THEN UPDATE SET "
+        f"{', '.join(f'[{name}] = target.[{name}] + source.[{name}]' for name in values)} "
+        f"WHEN NOT MATCHED THEN INSERT ({', '.join(f'[{name}]' for name in columns)}) "
+        f"VALUES ({', '.join(f'source.[{name}]' for name in columns)});"
+    )
@@ -0,0 +1,48 @@
+import re
+from typing import Dict, Optional
+
+from sqlalchemy import Table, UniqueConstraint
+from sqlalchemy.exc import IntegrityError
+
+
+def _unique_names(table: Table) -> Dict[str, str]:
+    """Имя уникального индекса или ограничения -> его (первый) столбец"""
+    names = {}
+    for index in table.indexes:
+        if index.unique and index.name:
+            names[index.name] = next(iter(index.columns)).name
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint) and constraint.name:
+            names[constraint.name] = next(iter(constraint.columns)).name
+    return names
+
+
+class UniqueViolation(ValueError):
+    """Вставка нарушила уникальный индекс; column — его столбец или None, если драйвер его не назвал"""
+
+    def __init__(self, table: str, column: Optional[str]):
+        super().__init__(f"В {table} уже есть запись с таким значением {column or ''}".rstrip())
+        self.table = table
+        self.column = column
+
+    @classmethod
+    def from_error(cls, error: IntegrityError, table: Table) -> Optional['UniqueViolation']:
+        """
+        Столбец по сообщению драйвера. MSSQL называет индекс или ограничение
+        («... unique index 'ix_Cars_vin' ...», «... UNIQUE KEY constraint
+        'uq_clients_license_number' ...»), поэтому у каждого уникального ключа
+        в моделях есть явное имя. SQLite имён не сообщает и пишет столбцы:
+        «UNIQUE constraint failed: Cars.vin». None, если ошибка не про
+        уникальность (внешний ключ, NOT NULL).
+        """
+        # В MSSQL дальше идёт само значение, оно не должно совпасть с именем
+        message = str(error.orig).split('The duplicate key value')[0]
+        if 'UNIQUE' not in message.upper() and 'DUPLICATE' not in message.upper():
+            return None
+        for name, column in _unique_names(table).items():
+            if re.search(rf'(?<![A-Za-z0-9_]){re.escape(name)}(?![A-Za-z0-9_])', message):
+                return cls(table.name, column)
+        match = re.search(rf'(?<![A-Za-z0-9_]){re.escape(table.name)}\.(\w+)', message)
+        if match and match.group(1) in table.columns:
+            return cls(table.name, match.group(1))
+        return cls(table.name, None)
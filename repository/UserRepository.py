@@ -1,9 +1,10 @@
 from entity import User
 from dto import UserUpdateDTO
-from utils import hash_password
+from utils import make_password_hash
+from config.replicas import read_only
 
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, Tuple
 from datetime import datetime
 
 class UserRepository:
@@ -18,13 +19,16 @@ class UserRepository:
         self.session_db.refresh(user)
         return user
 
-    def update(self, update_data: Optional[UserUpdateDTO]) -> Optional[User]:
+    def update(self, update_data: Optional[UserUpdateDTO], password_hash: Optional[bytes] = None) -> Optional[User]:
+        """Обновить сотрудника; password_hash — заранее посчитанный хеш нового пароля"""
         user = self.get_by_user_id(update_data.user_id)
         user_info = update_data.model_dump()
 
         if user:
-            if user_info.get('password', None) is not None:
-                user_info['password'] =  hash_password(user_info['password'])
+            if password_hash is not None:
+                user_info['password'] = password_hash
+            elif user_info.get('password', None) is not None:
+                user_info['password'] = make_password_hash(user_info['password'])
 
             for key, value in user_info.items():
                 if hasattr(user, key) and value is not None:
@@ -42,6 +46,11 @@ class UserRepository:
             return True
         return False
 
+    def update_password(self, user_id: int, password_hash: bytes) -> None:
+        """Заменить хеш пароля без загрузки сущности (перехеширование при входе)"""
+        self.session_db.query(User).filter(User.user_id == user_id).update({User.password: password_hash})
+        self.session_db.commit()
+
     def get_by_user_id(self, user_id: int) -> Optional[User]:
         return self.session_db.query(User).filter(User.user_id == user_id).first()
 
@@ -51,6 +60,11 @@ class UserRepository:
     def get_password_by_email(self, email: str) -> Optional[bytes]:
         return self.session_db.query(User.password).filter(User.email == email).scalar()
 
+    def get_credentials_by_email(self, email: str) -> Optional[Tuple[int, bytes]]:
+        """Пара (user_id, хеш пароля) одним запросом"""
+        row = self.session_db.query(User.user_id, User.password).filter(User.email == email).first()
+        return tuple(row) if row is not None else None
+
     def email_exists(self, email: str) -> bool:
         query = self.session_db.query(User).filter(User.email == email)
         return query.first() is not None
@@ -59,5 +73,6 @@ class UserRepository:
         query = self.session_db.query(User).filter(User.user_id == user_id)
         return query.first() is not None
 
+    @read_only
     def count_all(self) -> int:
         return self.session_db.query(User).count()
@@ -3,6 +3,13 @@ from .CarSpecificationsRepository import CarSpecificationsRepository
 from .ClientRepository import ClientRepository
 from .RentalRepository import RentalRepository
 from .UserRepository import UserRepository
+from .RentalRollupRepository import RentalRollupRepository
+from .AsyncCarRepository import AsyncCarRepository
+from .AsyncClientRepository import AsyncClientRepository
+from .AsyncRentalRepository import AsyncRentalRepository
+from .AsyncUserRepository import AsyncUserRepository
+from .Keyset import Keyset, InvalidCursorError, page_limits
+from .UniqueViolation import UniqueViolation
 
 __all__ = [
     'CarRepository',
@@ -10,4 +17,13 @@ __all__ = [
     'ClientRepository',
     'RentalRepository',
     'UserRepository',
+    'RentalRollupRepository',
+    'AsyncCarRepository',
+    'AsyncClientRepository',
+    'AsyncRentalRepository',
+    'AsyncUserRepository',
+    'Keyset',
+    'InvalidCursorError',
+    'page_limits',
+    'UniqueViolation',
 ]
\ No newline at end of file
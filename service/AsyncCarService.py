@@ -0,0 +1,29 @@
+from repository import AsyncCarRepository, page_limits
+from dto import CarWithSpecsResponseDTO, CarFilterDTO, PageDTO, PageRequestDTO
+from .CarService import car_with_specs_dto
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+
+class AsyncCarService:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+        self.car_repo = AsyncCarRepository(db_session)
+
+    async def get_car_by_id(self, car_id: int) -> CarWithSpecsResponseDTO:
+        car_entity = await self.car_repo.get_by_id(car_id)
+        if not car_entity:
+            raise ValueError(f"Автомобиль с ID {car_id} не найден")
+        return car_with_specs_dto(car_entity)
+
+    async def get_cars_by_filter(self, cars_filter: CarFilterDTO) -> List[CarWithSpecsResponseDTO]:
+        """Получение списка автомобилей с учетом заданного фильтра"""
+        return [car_with_specs_dto(entity) for entity in await self.car_repo.find_by_filters(cars_filter)]
+
+    async def get_cars_page(self, cars_filter: CarFilterDTO, page: PageRequestDTO) -> PageDTO[CarWithSpecsResponseDTO]:
+        cars, next_cursor = await self.car_repo.find_page(cars_filter, page)
+        return PageDTO[CarWithSpecsResponseDTO](
+            items=[car_with_specs_dto(entity) for entity in cars],
+            next_cursor=next_cursor, limit=page_limits.resolve(page.limit)
+        )
@@ -0,0 +1,39 @@
+from repository import AsyncClientRepository, page_limits
+from dto import ClientResponseDTO, ClientFilterDTO, PageDTO, PageRequestDTO
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+
+class AsyncClientService:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+        self.client_repo = AsyncClientRepository(db_session)
+
+    async def get_client_by_id(self, client_id: int) -> ClientResponseDTO:
+        client_entity = await self.client_repo.get_by_id(client_id)
+        if not client_entity:
+            raise ValueError(f"Клиент с ID {client_id} не найден")
+        return ClientResponseDTO.model_validate(client_entity)
+
+    async def get_clients_by_filter(self, clients_filter_dto: ClientFilterDTO) -> List[ClientResponseDTO]:
+        clients = await self.client_repo.find_by_filters(clients_filter_dto)
+        return [ClientResponseDTO.model_validate(client) for client in clients]
+
+    async def get_by_name(self, name: str) -> List[ClientResponseDTO]:
+        return [ClientResponseDTO.model_validate(client) for client in await self.client_repo.get_by_name(name)]
+
+    async def get_clients_page(self, clients_filter_dto: ClientFilterDTO,
+                               page: PageRequestDTO) -> PageDTO[ClientResponseDTO]:
+        clients, next_cursor = await self.client_repo.find_page(clients_filter_dto, page)
+        return PageDTO[ClientResponseDTO](
+            items=[ClientResponseDTO.model_validate(client) for client in clients],
+            next_cursor=next_cursor, limit=page_limits.resolve(page.limit)
+        )
+
+    async def get_page_by_name(self, name: str, page: PageRequestDTO) -> PageDTO[ClientResponseDTO]:
+        clients, next_cursor = await self.client_repo.get_page_by_name(name, page)
+        return PageDTO[ClientResponseDTO](
+            items=[ClientResponseDTO.model_validate(client) for client in clients],
+            next_cursor=next_cursor, limit=page_limits.resolve(page.limit)
+        )
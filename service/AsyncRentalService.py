@@ -0,0 +1,30 @@
+from repository import AsyncRentalRepository, page_limits
+from dto import RentalWithRelationsDTO, RentalFilterDTO, PageDTO, PageRequestDTO
+from .RentalService import rental_with_relations_dto
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+
+class AsyncRentalService:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+        self.rental_repo = AsyncRentalRepository(db_session)
+
+    async def get_rent_by_id(self, rent_id: int) -> RentalWithRelationsDTO:
+        rental = await self.rental_repo.get_by_rent_id(rent_id)
+        if rental is None:
+            raise ValueError(f'{rent_id=} не существует')
+        return rental_with_relations_dto(rental)
+
+    async def get_rentals_by_filter(self, rentals_filter: RentalFilterDTO) -> List[RentalWithRelationsDTO]:
+        rentals = await self.rental_repo.find_by_filters(rentals_filter)
+        return [rental_with_relations_dto(rental) for rental in rentals]
+
+    async def get_rentals_page(self, rentals_filter: RentalFilterDTO,
+                               page: PageRequestDTO) -> PageDTO[RentalWithRelationsDTO]:
+        rentals, next_cursor = await self.rental_repo.find_page(rentals_filter, page)
+        return PageDTO[RentalWithRelationsDTO](
+            items=[rental_with_relations_dto(rental) for rental in rentals],
+            next_cursor=next_cursor, limit=page_limits.resolve(page.limit)
+        )
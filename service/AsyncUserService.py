@@ -0,0 +1,31 @@
+from repository import AsyncUserRepository
+from dto import UserResponseDTO, UserLoginResponseDTO
+from .FleetStats import fleet_stats
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class AsyncUserService:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+        self.user_repo = AsyncUserRepository(db_session)
+
+    async def get_user_by_id(self, user_id: int) -> UserResponseDTO:
+        user_entity = await self.user_repo.get_by_user_id(user_id)
+        if not user_entity:
+            raise ValueError(f"Сотрудник с ID {user_id} не найден")
+        return UserResponseDTO.model_validate(user_entity)
+
+    async def get_user_login_response(self, user_id: int) -> UserLoginResponseDTO:
+        user_entity = await self.user_repo.get_by_user_id(user_id)
+        if user_entity is None:
+            raise ValueError(f"{user_id=} не существует.")
+        return UserLoginResponseDTO.model_validate(user_entity)
+
+    async def exists(self, user_id: int) -> bool:
+        return await self.user_repo.exists(user_id)
+
+    async def count_all(self) -> int:
+        if not fleet_stats.is_user_count_fresh():
+            fleet_stats.set_user_count(await self.user_repo.count_all())
+        return fleet_stats.users
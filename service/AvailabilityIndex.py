@@ -0,0 +1,164 @@
+import threading
+import time
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# (rent_id, начало, конец) — занятый период автомобиля
+Interval = Tuple[int, datetime, datetime]
+
+
+def _normalize(value: datetime) -> datetime:
+    """Даты в БД хранятся без пояса (UTC): приводим к тому же виду"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class CarIntervals:
+    """
+    Занятые периоды одного автомобиля, отсортированные по началу.
+    Над концами периодов построено дерево отрезков по максимуму: поиск
+    пересечений спускается только в поддеревья, где есть конец не раньше
+    начала окна, поэтому один длинный период не заставляет перебирать все
+    короткие после него. Границы включительные, как в
+    RentalRepository.is_car_available.
+    """
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        items = sorted(((rent_id, _normalize(start), _normalize(end)) for rent_id, start, end in intervals),
+                       key=lambda item: item[1])
+        self.rent_ids: List[int] = [rent_id for rent_id, _, _ in items]
+        self.starts: List[datetime] = [start for _, start, _ in items]
+        self.ends: List[datetime] = [end for _, _, end in items]
+        self._size = 1
+        self._tree: List[datetime] = []
+        self._rebuild()
+
+    def __len__(self):
+        return len(self.rent_ids)
+
+    def _rebuild(self):
+        # Листья — концы периодов в порядке начала, узел — максимум своих детей
+        size = 1
+        while size < len(self.ends):
+            size *= 2
+        tree = [datetime.min] * (2 * size)
+        tree[size:size + len(self.ends)] = self.ends
+        for node in range(size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        self._size, self._tree = size, tree
+
+    def add(self, rent_id: int, start: datetime, end: datetime):
+        self.remove(rent_id)
+        start, end = _normalize(start), _normalize(end)
+        position = bisect_right(self.starts, start)
+        self.rent_ids.insert(position, rent_id)
+        self.starts.insert(position, start)
+        self.ends.insert(position, end)
+        self._rebuild()
+
+    def remove(self, rent_id: int) -> bool:
+        try:
+            position = self.rent_ids.index(rent_id)
+        except ValueError:
+            return False
+        del self.rent_ids[position], self.starts[position], self.ends[position]
+        self._rebuild()
+        return True
+
+    def overlapping(self, start: datetime, end: datetime) -> Iterator[int]:
+        """rent_id периодов, пересекающих [start, end]: O(log n) на каждый найденный"""
+        start, end = _normalize(start), _normalize(end)
+        # Кандидаты — периоды, начавшиеся не позже конца окна; из них нужны те, что кончаются не раньше начала
+        last = bisect_right(self.starts, end) - 1
+        if last < 0:
+            return
+        stack = [(1, 0, self._size - 1)]
+        while stack:
+            node, low, high = stack.pop()
+            if low > last or self._tree[node] < start:
+                continue
+            if low == high:
+                yield self.rent_ids[low]
+                continue
+            middle = (low + high) // 2
+            stack.append((2 * node + 1, middle + 1, high))
+            stack.append((2 * node, low, middle))
+
+
+class AvailabilityIndex:
+    """
+    Индекс занятости автомобилей в памяти процесса.
+    Периоды автомобиля загружаются из БД при первой проверке и дальше
+    обновляются сервисом аренд после каждой записи, так что проверка
+    пересечения не обращается к базе. БД остаётся источником истины:
+    invalidate() сбрасывает данные, и они перечитываются при следующей
+    проверке. Аренды, созданные другими процессами, видны после истечения
+    ttl (0 — без истечения).
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._cars: Dict[int, Tuple[CarIntervals, float]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, car_id: int) -> Optional[CarIntervals]:
+        entry = self._cars.get(car_id)
+        if entry is None:
+            return None
+        intervals, loaded_at = entry
+        if self.ttl and time.monotonic() - loaded_at > self.ttl:
+            del self._cars[car_id]
+            return None
+        return intervals
+
+    def _load(self, car_id: int, loader: Callable[[], Iterable[Interval]]) -> CarIntervals:
+        with self._lock:
+            intervals = self._get(car_id)
+        if intervals is not None:
+            return intervals
+
+        # Загрузка идёт без блокировки: запрос к БД не задерживает проверки других автомобилей
+        intervals = CarIntervals(loader())
+        with self._lock:
+            current = self._get(car_id)
+            if current is not None:
+                return current
+            self._cars[car_id] = (intervals, time.monotonic())
+        return intervals
+
+    def conflicts(self, car_id: int, start: datetime, end: datetime,
+                  loader: Callable[[], Iterable[Interval]], exclude_rent_id: Optional[int] = None) -> List[int]:
+        """Аренды автомобиля, пересекающие [start, end]"""
+        intervals = self._load(car_id, loader)
+        with self._lock:
+            return [rent_id for rent_id in intervals.overlapping(start, end) if rent_id != exclude_rent_id]
+
+    def is_free(self, car_id: int, start: datetime, end: datetime,
+                loader: Callable[[], Iterable[Interval]], exclude_rent_id: Optional[int] = None) -> bool:
+        return not self.conflicts(car_id, start, end, loader, exclude_rent_id)
+
+    def add(self, car_id: int, rent_id: int, start: datetime, end: datetime):
+        """Учесть новую или изменённую аренду (если автомобиль уже загружен)"""
+        with self._lock:
+            intervals = self._get(car_id)
+            if intervals is not None:
+                intervals.add(rent_id, start, end)
+
+    def remove(self, car_id: int, rent_id: int):
+        with self._lock:
+            intervals = self._get(car_id)
+            if intervals is not None:
+                intervals.remove(rent_id)
+
+    def invalidate(self, car_id: Optional[int] = None):
+        """Сбросить один автомобиль или весь индекс; данные перечитаются из БД"""
+        with self._lock:
+            if car_id is None:
+                self._cars.clear()
+            else:
+                self._cars.pop(car_id, None)
+
+
+availability_index = AvailabilityIndex()
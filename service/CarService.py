@@ -1,11 +1,27 @@
 from repository import CarRepository
 from repository import CarSpecificationsRepository
+from repository import RentalRepository
+from repository import page_limits, UniqueViolation
 from dto import CarCreateDTO, CarResponseDTO, CarWithSpecsResponseDTO, CarWithSpecsUpdateDTO, CarFilterDTO
-from dto import CarSpecificationsResponseDTO
-from entity import Car, CarSpecifications
+from dto import CarModelSuggestionDTO, CarRateDTO, CarStatsDTO
+from dto import CarSpecificationsResponseDTO, PageDTO, PageRequestDTO
+from entity import Car
+from .FleetAvailability import fleet_availability
+from .SearchIndex import search_index, car_document
+from .ModelIndex import model_index
+from .FleetStats import fleet_stats
 
 from sqlalchemy.orm import Session
-from typing import Dict, List
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+def car_with_specs_dto(car_entity: Car) -> CarWithSpecsResponseDTO:
+    """DTO автомобиля из сущности с уже загруженными характеристиками"""
+    specs_dto = None
+    if car_entity.car_specifications is not None:
+        specs_dto = CarSpecificationsResponseDTO.model_validate(car_entity.car_specifications)
+    return CarWithSpecsResponseDTO(car=CarResponseDTO.model_validate(car_entity), specifications=specs_dto)
 
 
 class CarService:
@@ -14,32 +30,21 @@ class CarService:
         self.db_session = db_session
         self.car_repo = CarRepository(db_session)
         self.specs_repo = CarSpecificationsRepository(db_session)
+        self.rental_repo = RentalRepository(db_session)
 
     def create_car(self, car_dto: CarCreateDTO) -> CarResponseDTO:
         """Создание автомобиля с DTO"""
-        # Проверка уникальности VIN и номера
-        if self.car_repo.vin_exists(car_dto.vin):
-            raise ValueError(f"VIN {car_dto.vin} уже существует")
-        if self.car_repo.license_plate_exists(car_dto.license_plate):
-            raise ValueError(f"Номерной знак {car_dto.license_plate} уже существует")
-
-        # Создаем автомобиль
-        car_entity = Car(
+        car_values = dict(
             license_plate=car_dto.license_plate,
             vin=car_dto.vin,
             daily_rate=car_dto.daily_rate,
             status=car_dto.status
         )
 
-        created_car = self.car_repo.create(car_entity)
-
-        # Создаем характеристики, если они есть
+        specs_values = None
         if car_dto.specifications is not None:
             specs_dto = car_dto.specifications
-            specs_dto.car_id = created_car.car_id
-
-            specs_entity = CarSpecifications(
-                car_id=specs_dto.car_id,
+            specs_values = dict(
                 name=specs_dto.name,
                 mileage=specs_dto.mileage,
                 power=specs_dto.power,
@@ -49,9 +54,25 @@ class CarService:
                 actuator=specs_dto.actuator.value,
                 wheel=specs_dto.wheel.value,
                 color=specs_dto.color,
-
             )
-            self.specs_repo.create(specs_entity)
+
+        # Автомобиль и характеристики одной транзакцией; уникальность VIN и номера проверяют индексы
+        try:
+            created_car = self.car_repo.insert_with_specs(car_values, specs_values)
+        except UniqueViolation as error:
+            messages = {
+                'vin': f"VIN {car_dto.vin} уже существует",
+                'license_plate': f"Номерной знак {car_dto.license_plate} уже существует",
+            }
+            raise ValueError(messages.get(error.column, str(error))) from error
+        if car_dto.specifications is not None:
+            car_dto.specifications.car_id = created_car.car_id
+
+        model = car_dto.specifications.name if car_dto.specifications is not None else None
+        fleet_availability.add_car(created_car.car_id)
+        search_index.put(car_document(created_car.car_id, created_car.license_plate, created_car.vin, model))
+        model_index.set_car_model(created_car.car_id, model)
+        fleet_stats.put_car(created_car.car_id, created_car.status, created_car.daily_rate)
 
         # Используем model_validate вместо from_orm
         return CarResponseDTO.model_validate(created_car)
@@ -67,30 +88,40 @@ class CarService:
         else:
             specifications = None
         car_response_dto = CarWithSpecsResponseDTO(car=car, specifications=specifications)
+
+        if specifications is None:
+            # Характеристики не менялись: модель для индексов берём текущую
+            specifications = self.specs_repo.get_by_car_id(car.car_id)
+        model = specifications.name if specifications is not None else None
+        search_index.put(car_document(car.car_id, car.license_plate, car.vin, model))
+        model_index.set_car_model(car.car_id, model)
+        fleet_stats.put_car(car.car_id, car.status, car.daily_rate)
         return car_response_dto
 
     def delete_car(self, car_id: int) -> bool:
         """Удаление автомобиля по ID"""
-        return self.car_repo.delete(car_id)
+        deleted = self.car_repo.delete(car_id)
+        if deleted:
+            fleet_availability.remove_car(car_id)
+            search_index.remove('car', car_id)
+            model_index.remove_car(car_id)
+            fleet_stats.remove_car(car_id)
+        return deleted
 
     def get_cars_by_filter(
             self,
             cars_filter: CarFilterDTO) -> List[CarWithSpecsResponseDTO]:
         """Получение списка автомобилей с учетом заданного фильтра"""
-        cars_entity_list = self.car_repo.find_by_filters(cars_filter)
-        cars_with_specs = []
-
-        for entity in cars_entity_list:
-            car_dto = CarResponseDTO.model_validate(entity)
-            if entity.car_specifications is not None:
-                spec_dto = CarSpecificationsResponseDTO.model_validate(entity.car_specifications)
-            else:
-                spec_dto = None
-
-            combined_dto = CarWithSpecsResponseDTO(car=car_dto, specifications=spec_dto).model_dump()
-            cars_with_specs.append(combined_dto)
-
-        return cars_with_specs
+        # Характеристики приходят тем же запросом, что и автомобили
+        return [car_with_specs_dto(entity).model_dump() for entity in self.car_repo.find_by_filters(cars_filter)]
+
+    def get_cars_page(self, cars_filter: CarFilterDTO, page: PageRequestDTO) -> PageDTO[CarWithSpecsResponseDTO]:
+        """Страница автомобилей по фильтру"""
+        cars, next_cursor = self.car_repo.find_page(cars_filter, page)
+        return PageDTO[CarWithSpecsResponseDTO](
+            items=[car_with_specs_dto(entity) for entity in cars],
+            next_cursor=next_cursor, limit=page_limits.resolve(page.limit)
+        )
 
     def get_car_by_id(self, car_id: int) -> CarWithSpecsResponseDTO:
         car_entity = self.car_repo.get_by_id(car_id)
@@ -107,11 +138,58 @@ class CarService:
 
     def get_available_cars(self) -> List[CarWithSpecsResponseDTO]:
         """Получение списка доступных автомобилей"""
-        filter_dict = {"status": "AVAILABLE"}
-        return self.get_cars_by_filter(filter_dict)
+        return self.get_cars_by_filter(CarFilterDTO(status="AVAILABLE"))
 
     def get_cars_by_price_range(self, min_price: float, max_price: float) -> list[CarWithSpecsResponseDTO]:
         """Получение автомобилей в диапазоне цен"""
-        filter_dict = {"min_rate": min_price, "max_rate": max_price}
-        return self.get_cars_by_filter(filter_dict)
+        return self.get_cars_by_filter(CarFilterDTO(min_rate=min_price, max_rate=max_price))
+
+    def change_status(self, car_id: int, new_status: str) -> CarResponseDTO:
+        car = self.car_repo.change_status(car_id, new_status)
+        if car is None:
+            raise ValueError(f"Автомобиль с ID {car_id} не найден")
+        fleet_stats.put_car(car.car_id, car.status, car.daily_rate)
+        return CarResponseDTO.model_validate(car)
+
+    def update_daily_rate(self, car_id: int, new_rate: int) -> CarResponseDTO:
+        car = self.car_repo.update_daily_rate(car_id, new_rate)
+        if car is None:
+            raise ValueError(f"Автомобиль с ID {car_id} не найден")
+        fleet_stats.put_car(car.car_id, car.status, car.daily_rate)
+        return CarResponseDTO.model_validate(car)
+
+    def get_stats(self, top: int = 10) -> CarStatsDTO:
+        """Счётчики по статусам и рейтинги цен из памяти; БД читается только при первой загрузке"""
+        fleet_stats.ensure(self.car_repo.get_stats_rows)
+        return CarStatsDTO(
+            total=fleet_stats.count_all(),
+            by_status=fleet_stats.status_distribution(),
+            most_expensive=[CarRateDTO(car_id=car_id, daily_rate=rate)
+                            for car_id, rate in fleet_stats.most_expensive(top)],
+            cheapest_available=[CarRateDTO(car_id=car_id, daily_rate=rate)
+                                for car_id, rate in fleet_stats.cheapest_available(top)],
+        )
+
+    def get_model_suggestions(self, prefix: str, limit: int = 10) -> List[CarModelSuggestionDTO]:
+        """Модели для автодополнения CarFilterDTO.model: после первой загрузки без обращения к БД"""
+        model_index.ensure(self.car_repo.get_car_models)
+        return [CarModelSuggestionDTO(name=name, count=count) for name, count in model_index.suggest(prefix, limit)]
+
+    def _load_fleet(self, start: datetime, end: datetime):
+        return self.car_repo.get_all_ids(), self.rental_repo.get_busy_intervals_between(start, end)
+
+    def get_free_cars(
+            self, start: datetime, end: datetime,
+            cars_filter: Optional[CarFilterDTO] = None) -> List[CarWithSpecsResponseDTO]:
+        """Автомобили, свободные весь период [start, end] (с точностью до суток), с учётом фильтра"""
+        if start > end:
+            raise ValueError("Начало периода позже его конца")
+
+        fleet_availability.ensure(self._load_fleet)
+
+        candidates = None
+        if cars_filter is not None and cars_filter.model_dump(exclude_none=True):
+            candidates = self.car_repo.find_ids_by_filters(cars_filter)
 
+        car_ids = fleet_availability.free_car_ids(start, end, candidates)
+        return [car_with_specs_dto(entity) for entity in self.car_repo.get_with_specifications_by_ids(car_ids)]
@@ -1,6 +1,6 @@
-from entity import Client
-from repository import ClientRepository
-from dto import ClientCreateDTO, ClientUpdateDTO, ClientResponseDTO, ClientFilterDTO
+from repository import ClientRepository, UniqueViolation, page_limits
+from dto import ClientCreateDTO, ClientUpdateDTO, ClientResponseDTO, ClientFilterDTO, PageDTO, PageRequestDTO
+from .SearchIndex import search_index, client_document
 
 from sqlalchemy.orm import Session
 from typing import Dict, Any, List
@@ -12,30 +12,43 @@ class ClientService:
         self.client_repo: ClientRepository = ClientRepository(db_session)
 
     def create_client(self, client_dto: ClientCreateDTO) -> ClientResponseDTO:
-        """Создание клиента с DTO"""
-        # Проверка уникальности VIN и номера
-        if self.client_repo.phone_exists(client_dto.phone):
-            raise ValueError(f'Номер {client_dto.phone} уже есть в базе.')
-        if client_dto.telegram_id and self.client_repo.telegram_exists(client_dto.telegram_id):
-            raise ValueError(f'Телеграм ID {client_dto.telegram_id} уже есть в базе.')
-
-        client_entity = Client(
-            name=client_dto.name,
-            phone=client_dto.phone,
-            telegram_id=client_dto.telegram_id,
-            license_number=client_dto.license_number,
-        )
+        """Создание клиента с DTO: один INSERT, дубликаты отклоняют уникальные индексы"""
+        try:
+            created_client = self.client_repo.insert(dict(
+                name=client_dto.name,
+                phone=client_dto.phone,
+                telegram_id=client_dto.telegram_id,
+                license_number=client_dto.license_number,
+            ))
+        except UniqueViolation as error:
+            messages = {
+                'phone': f'Номер {client_dto.phone} уже есть в базе.',
+                'telegram_id': f'Телеграм ID {client_dto.telegram_id} уже есть в базе.',
+                'license_number': f'Водительское удостоверение {client_dto.license_number} уже есть в базе.',
+            }
+            raise ValueError(messages.get(error.column, str(error))) from error
 
-        created_client = self.client_repo.create(client_entity)
-        return ClientResponseDTO.model_validate(created_client)
+        client_response_dto = ClientResponseDTO.model_validate(created_client)
+        self._index_client(client_response_dto)
+        return client_response_dto
 
     def update_client(self, car_info_dto: ClientUpdateDTO) -> ClientResponseDTO:
         client_response_dto = ClientResponseDTO.model_validate(self.client_repo.update(car_info_dto))
+        self._index_client(client_response_dto)
         return client_response_dto
 
     def delete_client(self, client_id: int) -> bool:
         """Удаление автомобиля по ID"""
-        return self.client_repo.delete(client_id)
+        deleted = self.client_repo.delete(client_id)
+        if deleted:
+            search_index.remove('client', client_id)
+        return deleted
+
+    @staticmethod
+    def _index_client(client: ClientResponseDTO):
+        search_index.put(client_document(
+            client.client_id, client.name, client.phone, client.telegram_id, client.license_number
+        ))
 
     def get_clients_by_filter(self, clients_filter_dto: ClientFilterDTO) -> List[ClientResponseDTO]:
         """Получение списка клиентов с учетом заданного фильтра"""
@@ -45,6 +58,15 @@ class ClientService:
         ))
         return clients_dto_seq
 
+    def get_clients_page(self, clients_filter_dto: ClientFilterDTO,
+                         page: PageRequestDTO) -> PageDTO[ClientResponseDTO]:
+        """Страница клиентов по фильтру"""
+        clients, next_cursor = self.client_repo.find_page(clients_filter_dto, page)
+        return PageDTO[ClientResponseDTO](
+            items=[ClientResponseDTO.model_validate(client) for client in clients],
+            next_cursor=next_cursor, limit=page_limits.resolve(page.limit)
+        )
+
     def get_client_by_id(self, client_id: int) -> ClientResponseDTO:
         """Получение автомобиля с характеристиками по ID"""
         client_entity = self.client_repo.get_by_id(client_id)
@@ -55,4 +77,11 @@ class ClientService:
     def get_by_name(self, name: str) -> List[ClientResponseDTO]:
         return list(map(
             lambda x: ClientResponseDTO.model_validate(x), self.client_repo.get_by_name(name)
-        ))
\ No newline at end of file
+        ))
+
+    def get_page_by_name(self, name: str, page: PageRequestDTO) -> PageDTO[ClientResponseDTO]:
+        clients, next_cursor = self.client_repo.get_page_by_name(name, page)
+        return PageDTO[ClientResponseDTO](
+            items=[ClientResponseDTO.model_validate(client) for client in clients],
+            next_cursor=next_cursor, limit=page_limits.resolve(page.limit)
+        )
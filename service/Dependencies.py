@@ -1,17 +1,110 @@
 from . import CarService, UserService, ClientService, RentalService, UserDetailsService
-from config import get_db, get_data
+from . import AsyncCarService, AsyncClientService, AsyncUserService, AsyncRentalService
+from .ExportService import ExportService
+from .SearchService import SearchService
+from .ReportService import ReportService
+from .UtilizationService import UtilizationService
+from .SearchIndex import search_index
+from .ModelIndex import model_index
+from .FleetStats import fleet_stats
+from .AvailabilityIndex import availability_index
+from .FleetAvailability import fleet_availability
+from .IdentityCache import identity_cache
+from .LoginThrottle import login_throttle
+from repository import page_limits
+from dto import CarFilterDTO, ClientFilterDTO, PageRequestDTO
+from config import get_db, get_async_db, settings, Settings
+from utils import configure_hashing, configure_password_iterations, DEFAULT_ITERATIONS
 
 import datetime
+import threading
+from typing import Annotated
 from jose import jwt
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 
-data = get_data("auth-key", "auth-algorithm", "token-expires-minutes")
-SECRET_KEY = data["auth-key"]
-ALGORITHM = data["auth-algorithm"]
-ACCESS_TOKEN_EXPIRE_MINUTES = data["token-expires-minutes"]
+SECRET_KEY = ALGORITHM = ACCESS_TOKEN_EXPIRE_MINUTES = None
+_hashing_params = None
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def apply_settings(current: Settings):
+    """Применить настройки авторизации; вызывается при старте и после перезагрузки конфигурации"""
+    global SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, _hashing_params
+
+    data = current.section("auth-key", "auth-algorithm", "token-expires-minutes")
+    SECRET_KEY = data["auth-key"]
+    ALGORITHM = data["auth-algorithm"]
+    ACCESS_TOKEN_EXPIRE_MINUTES = data["token-expires-minutes"]
+
+    # Пул процессов для PBKDF2: размер, длина очереди и таймаут задачи.
+    # Пересоздаём пул только если параметры действительно изменились
+    hashing = current.get("hashing", {})
+    hashing_params = (hashing.get("workers"), hashing.get("queue-limit", 64), hashing.get("timeout-seconds", 10))
+    if hashing_params != _hashing_params:
+        configure_hashing(*hashing_params)
+        _hashing_params = hashing_params
+
+    # Стоимость PBKDF2 для новых хешей; старые пересчитываются при успешном входе
+    configure_password_iterations(current.get("password-hash-iterations", DEFAULT_ITERATIONS))
+
+    # Кэш пользователей по токену: размер и время жизни записи
+    identity_cache_config = current.get("identity-cache", {})
+    identity_cache.max_size = identity_cache_config.get("max-size", 10_000)
+    identity_cache.ttl = identity_cache_config.get("ttl-seconds", 300)
+
+    # Ограничение неудачных попыток входа
+    throttle_config = current.get("login-throttle", {})
+    login_throttle.configure(
+        max_attempts_per_email=throttle_config.get("max-attempts-per-email", 5),
+        max_attempts_per_ip=throttle_config.get("max-attempts-per-ip", 20),
+        window=throttle_config.get("window-seconds", 300),
+    )
+
+    # Индекс занятости автомобилей: через сколько секунд перечитывать периоды из БД
+    availability_index.ttl = current.get("availability-index", {}).get("ttl-seconds", 60)
+
+    # Посуточные карты свободных автомобилей: горизонт и период полной перестройки
+    fleet_config = current.get("fleet-availability", {})
+    horizon_days = fleet_config.get("horizon-days", 365)
+    if horizon_days != fleet_availability.horizon_days:
+        fleet_availability.horizon_days = horizon_days
+        fleet_availability.invalidate()
+    fleet_availability.ttl = fleet_config.get("ttl-seconds", 300)
+
+    # Поисковый индекс: через сколько секунд перестраивать его из БД целиком
+    search_index.ttl = current.get("search-index", {}).get("ttl-seconds", 600)
+    model_index.ttl = current.get("model-index", {}).get("ttl-seconds", 600)
+
+    # Счётчики парка и пользователей: период сверки с БД
+    fleet_stats.ttl = current.get("fleet-stats", {}).get("ttl-seconds", 60)
+
+    # Размер страниц списков (/filter, /clients/name)
+    pagination_config = current.get("pagination", {})
+    page_limits.default_size = pagination_config.get("default-page-size", 50)
+    page_limits.max_size = pagination_config.get("max-page-size", 500)
+
+
+def configure():
+    """
+    Применить настройки и подписаться на их перезагрузку. Вызывается при
+    старте приложения, а не при импорте модуля: импорт не читает
+    конфигурацию и не создаёт пул хеширования. Повторный вызов ничего не делает.
+    """
+    global _configured
+    if _configured:
+        return
+    with _configure_lock:
+        if _configured:
+            return
+        apply_settings(settings)
+        settings.subscribe(apply_settings)
+        _configured = True
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
@@ -35,26 +128,104 @@ def get_rental_service(db: Session = Depends(get_db)) -> RentalService:
     return RentalService(db_session=db)
 
 
+def get_search_service(db: Session = Depends(get_db)) -> SearchService:
+    return SearchService(db_session=db)
+
+
+def get_report_service(db: Session = Depends(get_db)) -> ReportService:
+    return ReportService(db_session=db)
+
+
+def get_utilization_service(db: Session = Depends(get_db)) -> UtilizationService:
+    return UtilizationService(db_session=db)
+
+
+def get_export_service() -> ExportService:
+    # Сессию выгрузка открывает сама: get_db закрылся бы до конца ответа
+    return ExportService()
+
+
+# Зависимости асинхронных маршрутов объявлены через async def: обычные функции
+# и классы FastAPI вызывает в пуле потоков, а асинхронные — прямо в цикле событий
+
+async def get_async_car_service(db: AsyncSession = Depends(get_async_db)) -> AsyncCarService:
+    return AsyncCarService(db_session=db)
+
+
+async def get_async_client_service(db: AsyncSession = Depends(get_async_db)) -> AsyncClientService:
+    return AsyncClientService(db_session=db)
+
+
+async def get_async_user_service(db: AsyncSession = Depends(get_async_db)) -> AsyncUserService:
+    return AsyncUserService(db_session=db)
+
+
+async def get_async_rental_service(db: AsyncSession = Depends(get_async_db)) -> AsyncRentalService:
+    return AsyncRentalService(db_session=db)
+
+
+async def get_page_request(page: Annotated[PageRequestDTO, Query()]) -> PageRequestDTO:
+    return page
+
+
+async def get_car_filter(car_filter: Annotated[CarFilterDTO, Query()]) -> CarFilterDTO:
+    return car_filter
+
+
+async def get_client_filter(client_filter: Annotated[ClientFilterDTO, Query()]) -> ClientFilterDTO:
+    return client_filter
+
+
 def create_access_token(data: dict):
+    configure()
     to_encode = data.copy()
     expire = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def _decode_token(token: str) -> dict:
+    configure()
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    if payload.get("sub") is None:
+        raise HTTPException(status_code=401, detail="Токен пустой")
+    return payload
+
+
 async def get_current_user(
         token: str = Depends(oauth2_scheme),
         auth_service: UserDetailsService = Depends(get_auth_service)
 ):
 
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode_token(token)
+        user_id: str = payload.get("sub")
+
+        res = identity_cache.get(token)
+        if res is None:
+            # Синхронный запрос к БД уводим в пул потоков, чтобы не блокировать цикл событий
+            res = await run_in_threadpool(auth_service.get_user_login_response, int(user_id))
+            identity_cache.put(token, res, payload.get("exp"))
+        return res
+
+    except Exception as e:
+        raise HTTPException(status_code=401, detail=str(e))
+
+
+async def get_current_user_async(
+        token: str = Depends(oauth2_scheme),
+        user_service: AsyncUserService = Depends(get_async_user_service)
+):
+    """То же, что get_current_user, но пользователь читается асинхронной сессией маршрута"""
+    try:
+        payload = _decode_token(token)
         user_id: str = payload.get("sub")
 
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Токен пустой")
-        res = auth_service.get_user_login_response(int(user_id))
+        res = identity_cache.get(token)
+        if res is None:
+            res = await user_service.get_user_login_response(int(user_id))
+            identity_cache.put(token, res, payload.get("exp"))
         return res
 
     except Exception as e:
-        raise HTTPException(status_code=401, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=401, detail=str(e))
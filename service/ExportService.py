@@ -0,0 +1,125 @@
+from repository import CarRepository, RentalRepository
+from repository.CarRepository import compile_car_filter
+from repository.RentalRepository import build_rental_filters
+from dto import CarFilterDTO, CarWithSpecsResponseDTO, RentalFilterDTO, RentalWithRelationsDTO, ExportFormatEnum
+from config import SessionLocal
+from .CarService import car_with_specs_dto
+from .RentalService import rental_with_relations_dto
+
+import csv
+import io
+import json
+from contextlib import contextmanager
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Type, get_args
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+# Строк в пачке: столько объектов одновременно держит сессия и столько строк уходит одним куском ответа
+EXPORT_CHUNK_SIZE = 1000
+
+MEDIA_TYPES = {
+    ExportFormatEnum.NDJSON: "application/x-ndjson",
+    ExportFormatEnum.CSV: "text/csv; charset=utf-8",
+}
+
+
+@contextmanager
+def export_session() -> Iterator[Session]:
+    """
+    Собственная сессия выгрузки. Сессия запроса (get_db) закрывается раньше,
+    чем StreamingResponse отдаст последнюю строку, поэтому генератор открывает
+    свою. Выгрузка только читает, её запросы можно отправлять на реплику.
+    """
+    session = SessionLocal()
+    session.info['read_only'] = True
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _nested_model(annotation) -> Optional[Type[BaseModel]]:
+    """Модель из аннотации поля (в том числе Optional[Model]), иначе None"""
+    for candidate in (annotation, *get_args(annotation)):
+        if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+            return candidate
+    return None
+
+
+def csv_columns(model: Type[BaseModel], prefix: str = '') -> List[str]:
+    """Колонки CSV по схеме DTO: вложенные модели разворачиваются в car.specifications.name и т.п."""
+    columns = []
+    for name, field in model.model_fields.items():
+        nested = _nested_model(field.annotation)
+        if nested is not None:
+            columns.extend(csv_columns(nested, f'{prefix}{name}.'))
+        else:
+            columns.append(f'{prefix}{name}')
+    return columns
+
+
+def _flatten(data: Dict[str, Any], prefix: str = '', flat: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    flat = {} if flat is None else flat
+    for key, value in data.items():
+        if isinstance(value, dict):
+            _flatten(value, f'{prefix}{key}.', flat)
+        elif isinstance(value, list):
+            flat[f'{prefix}{key}'] = json.dumps(value, ensure_ascii=False)
+        else:
+            flat[f'{prefix}{key}'] = value
+    return flat
+
+
+class ExportService:
+    """
+    Выгрузка результатов фильтров потоком NDJSON или CSV. Строки читаются
+    из БД пачками через курсор на стороне сервера, каждая пачка сразу
+    сериализуется и отдаётся клиенту: память не растёт с размером выборки,
+    а первый байт уходит до того, как прочитана вся выборка.
+    """
+
+    def __init__(self, session_scope: Callable[[], ContextManager[Session]] = export_session,
+                 chunk_size: int = EXPORT_CHUNK_SIZE):
+        self.session_scope = session_scope
+        self.chunk_size = chunk_size
+
+    def export_cars(self, cars_filter: CarFilterDTO, export_format: ExportFormatEnum) -> Iterator[str]:
+        # Ошибки фильтра проверяются до начала ответа, пока ещё можно вернуть 400
+        compile_car_filter(cars_filter)
+        return self._stream(
+            lambda session: CarRepository(session).stream_by_filters(cars_filter, self.chunk_size),
+            car_with_specs_dto, CarWithSpecsResponseDTO, export_format
+        )
+
+    def export_rentals(self, rentals_filter: RentalFilterDTO, export_format: ExportFormatEnum) -> Iterator[str]:
+        build_rental_filters(rentals_filter)
+        return self._stream(
+            lambda session: RentalRepository(session).stream_by_filters(rentals_filter, self.chunk_size),
+            rental_with_relations_dto, RentalWithRelationsDTO, export_format
+        )
+
+    def _stream(self, chunks: Callable[[Session], Iterable[Iterable[Any]]], to_dto: Callable[[Any], BaseModel],
+                model: Type[BaseModel], export_format: ExportFormatEnum) -> Iterator[str]:
+        if export_format == ExportFormatEnum.CSV:
+            columns = csv_columns(model)
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore')
+            writer.writeheader()
+            # Заголовок уходит сразу, ещё до первого запроса к БД
+            yield self._drain(buffer)
+
+        with self.session_scope() as session:
+            for chunk in chunks(session):
+                if export_format == ExportFormatEnum.CSV:
+                    writer.writerows(_flatten(to_dto(entity).model_dump(mode='json')) for entity in chunk)
+                    yield self._drain(buffer)
+                else:
+                    yield ''.join(to_dto(entity).model_dump_json() + '\n' for entity in chunk)
+
+    @staticmethod
+    def _drain(buffer: io.StringIO) -> str:
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
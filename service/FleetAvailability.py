@@ -0,0 +1,205 @@
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# (car_id, начало, конец) — занятый период
+CarInterval = Tuple[int, datetime, datetime]
+
+
+def _to_day(value: datetime) -> date:
+    """Даты в БД хранятся без пояса (UTC)"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+class FleetAvailability:
+    """
+    Посуточные битовые карты свободных автомобилей на horizon_days вперёд.
+    Каждому автомобилю выделяется бит; free[d] — целое, в котором
+    установлены биты автомобилей, свободных весь день d. Запрос «кто
+    свободен с X по Y» — побитовое AND карт нужных дней, то есть десятки
+    тысяч автомобилей обрабатываются одной операцией на день.
+
+    Точность — сутки: день с частичной занятостью считается занятым,
+    окончательную проверку по времени делает создание аренды. Карты
+    строятся из БД при первом запросе, обновляются сервисами при записи
+    и перестраиваются при смене дня или по истечении ttl (0 — без истечения).
+    """
+
+    def __init__(self, horizon_days: int = 365, ttl: float = 300.0):
+        self.horizon_days = horizon_days
+        self.ttl = ttl
+
+        self._origin: Optional[date] = None
+        self._built_at = 0.0
+        self._slots: Dict[int, int] = {}
+        self._car_ids: List[Optional[int]] = []
+        self._fleet_mask = 0
+        self._free: List[int] = []
+        self._lock = threading.Lock()
+
+    @property
+    def is_built(self) -> bool:
+        return self._origin is not None
+
+    def _is_stale(self) -> bool:
+        if self._origin is None or self._origin != _today():
+            return True
+        return bool(self.ttl) and time.monotonic() - self._built_at > self.ttl
+
+    def _day_range(self, start: datetime, end: datetime, origin: date) -> Tuple[int, int]:
+        """Номера первого и последнего дня периода внутри горизонта (first > last — вне горизонта)"""
+        first = max((_to_day(start) - origin).days, 0)
+        last = min((_to_day(end) - origin).days, self.horizon_days - 1)
+        return first, last
+
+    def ensure(self, loader: Callable[[datetime, datetime], Tuple[Iterable[int], Iterable[CarInterval]]]):
+        """
+        Построить карты, если их нет или они устарели.
+        loader(начало, конец) возвращает id всех автомобилей и занятые периоды горизонта.
+        """
+        if not self._is_stale():
+            return
+        origin = _today()
+        start = datetime.combine(origin, datetime.min.time())
+        car_ids, intervals = loader(start, start + timedelta(days=self.horizon_days))
+        self.build(car_ids, intervals, origin)
+
+    def build(self, car_ids: Iterable[int], intervals: Iterable[CarInterval], origin: Optional[date] = None):
+        origin = origin or _today()
+        car_ids = list(car_ids)
+        slots = {car_id: slot for slot, car_id in enumerate(car_ids)}
+        size = (len(car_ids) + 7) // 8
+
+        # Занятость набирается в байтовых массивах: установка бита не создаёт новое целое
+        busy = [bytearray(size) for _ in range(self.horizon_days)]
+        for car_id, start, end in intervals:
+            slot = slots.get(car_id)
+            if slot is None:
+                continue
+            first, last = self._day_range(start, end, origin)
+            for day in range(first, last + 1):
+                busy[day][slot >> 3] |= 1 << (slot & 7)
+
+        fleet_mask = (1 << len(car_ids)) - 1
+        free = [fleet_mask & ~int.from_bytes(day, 'little') for day in busy]
+
+        with self._lock:
+            self._origin = origin
+            self._built_at = time.monotonic()
+            self._slots = slots
+            self._car_ids = car_ids
+            self._fleet_mask = fleet_mask
+            self._free = free
+
+    def free_mask(self, start: datetime, end: datetime) -> int:
+        """Биты автомобилей, свободных во все дни периода"""
+        if start > end:
+            raise ValueError("Начало периода позже его конца")
+
+        with self._lock:
+            origin, free, mask = self._origin, self._free, self._fleet_mask
+        if origin is None:
+            raise ValueError("Карты занятости не построены")
+        if _to_day(start) < origin or (_to_day(end) - origin).days >= self.horizon_days:
+            raise ValueError(
+                f"Период должен лежать в пределах {self.horizon_days} дней начиная с {origin.isoformat()}"
+            )
+
+        first, last = self._day_range(start, end, origin)
+        for day in range(first, last + 1):
+            mask &= free[day]
+            if not mask:
+                break
+        return mask
+
+    def mask_of(self, car_ids: Iterable[int]) -> int:
+        mask = 0
+        slots = self._slots
+        for car_id in car_ids:
+            slot = slots.get(car_id)
+            if slot is not None:
+                mask |= 1 << slot
+        return mask
+
+    def car_ids_of(self, mask: int) -> List[int]:
+        """id автомобилей по битовой маске, по возрастанию слота"""
+        car_ids = self._car_ids
+        # bin() разворачивается в C, это быстрее, чем снимать биты по одному
+        return [car_ids[slot] for slot, bit in enumerate(reversed(bin(mask)[2:])) if bit == '1']
+
+    def free_car_ids(self, start: datetime, end: datetime, candidates: Optional[Iterable[int]] = None) -> List[int]:
+        mask = self.free_mask(start, end)
+        if candidates is not None:
+            mask &= self.mask_of(candidates)
+        return self.car_ids_of(mask)
+
+    # ==================== ОБНОВЛЕНИЕ ПРИ ЗАПИСИ ====================
+
+    def set_car_intervals(self, car_id: int, intervals: Iterable[Tuple[int, datetime, datetime]]):
+        """Пересчитать строку автомобиля по его занятым периодам (rent_id, начало, конец)"""
+        with self._lock:
+            slot = self._slots.get(car_id)
+            if self._origin is None or slot is None:
+                return
+            busy_days = set()
+            for _, start, end in intervals:
+                first, last = self._day_range(start, end, self._origin)
+                busy_days.update(range(first, last + 1))
+
+            bit = 1 << slot
+            free = self._free
+            for day in range(self.horizon_days):
+                is_free = bool(free[day] & bit)
+                if day in busy_days and is_free:
+                    free[day] &= ~bit
+                elif day not in busy_days and not is_free:
+                    free[day] |= bit
+
+    def add_interval(self, car_id: int, start: datetime, end: datetime):
+        """Отметить новый занятый период автомобиля, не перечитывая остальные его аренды"""
+        with self._lock:
+            slot = self._slots.get(car_id)
+            if self._origin is None or slot is None:
+                return
+            first, last = self._day_range(start, end, self._origin)
+            bit = ~(1 << slot)
+            free = self._free
+            for day in range(first, last + 1):
+                free[day] &= bit
+
+    def add_car(self, car_id: int):
+        """Новый автомобиль свободен на весь горизонт"""
+        with self._lock:
+            if self._origin is None or car_id in self._slots:
+                return
+            slot = len(self._car_ids)
+            self._slots[car_id] = slot
+            self._car_ids.append(car_id)
+            bit = 1 << slot
+            self._fleet_mask |= bit
+            self._free = [day | bit for day in self._free]
+
+    def remove_car(self, car_id: int):
+        with self._lock:
+            slot = self._slots.pop(car_id, None)
+            if slot is None:
+                return
+            self._car_ids[slot] = None
+            bit = 1 << slot
+            self._fleet_mask &= ~bit
+            self._free = [day & ~bit for day in self._free]
+
+    def invalidate(self):
+        """Сбросить карты: при следующем запросе они перестроятся из БД"""
+        with self._lock:
+            self._origin = None
+
+
+fleet_availability = FleetAvailability()
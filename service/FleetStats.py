@@ -0,0 +1,168 @@
+import heapq
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+AVAILABLE = "AVAILABLE"
+
+# (car_id, статус, стоимость суток)
+CarRow = Tuple[int, str, int]
+
+
+class FleetStats:
+    """
+    Счётчики парка в памяти процесса: число автомобилей по статусам,
+    рейтинги по цене и число пользователей. Данные загружаются из БД
+    один раз, дальше сервисы обновляют их при каждой записи, так что
+    опрос дашборда не выполняет ни COUNT, ни ORDER BY.
+
+    Рейтинги — кучи с ленивым удалением: при изменении автомобиля в кучу
+    добавляется новая запись с новой версией, а устаревшие выбрасываются,
+    когда доходят до вершины. Автомобили и пользователи перечитываются
+    из БД по истечении ttl (0 — без истечения): так видны записи других
+    процессов.
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+
+        self._cars_loaded_at: Optional[float] = None
+        self._cars: Dict[int, Tuple[str, int, int]] = {}  # car_id -> (статус, цена, версия)
+        self._status_counts: Dict[str, int] = {}
+        self._expensive: List[Tuple[int, int, int]] = []  # (-цена, car_id, версия)
+        self._cheapest: List[Tuple[int, int, int]] = []   # (цена, car_id, версия), только доступные
+        self._version = 0
+
+        self._users_loaded_at: Optional[float] = None
+        self._users = 0
+        self._lock = threading.Lock()
+
+    def _is_stale(self, loaded_at: Optional[float]) -> bool:
+        if loaded_at is None:
+            return True
+        return bool(self.ttl) and time.monotonic() - loaded_at > self.ttl
+
+    @property
+    def is_built(self) -> bool:
+        return self._cars_loaded_at is not None
+
+    # ==================== АВТОМОБИЛИ ====================
+
+    def ensure(self, loader: Callable[[], Iterable[CarRow]]):
+        """Загрузить автомобили, если их нет или данные устарели"""
+        if self._is_stale(self._cars_loaded_at):
+            self.build(loader())
+
+    def build(self, rows: Iterable[CarRow]):
+        with self._lock:
+            self._cars, self._status_counts = {}, {}
+            for car_id, status, daily_rate in rows:
+                self._put_locked(car_id, status, daily_rate, push=False)
+            self._rebuild_heaps_locked()
+            self._cars_loaded_at = time.monotonic()
+
+    def _rebuild_heaps_locked(self):
+        self._expensive = [(-rate, car_id, version) for car_id, (_, rate, version) in self._cars.items()]
+        self._cheapest = [(rate, car_id, version) for car_id, (status, rate, version) in self._cars.items()
+                          if status == AVAILABLE]
+        heapq.heapify(self._expensive)
+        heapq.heapify(self._cheapest)
+
+    def _release_locked(self, car_id: int):
+        previous = self._cars.pop(car_id, None)
+        if previous is not None:
+            status = previous[0]
+            self._status_counts[status] -= 1
+            if not self._status_counts[status]:
+                del self._status_counts[status]
+
+    def _put_locked(self, car_id: int, status: str, daily_rate: int, push: bool = True):
+        self._release_locked(car_id)
+        self._version += 1
+        self._cars[car_id] = (status, daily_rate, self._version)
+        self._status_counts[status] = self._status_counts.get(status, 0) + 1
+        if not push:
+            return
+        heapq.heappush(self._expensive, (-daily_rate, car_id, self._version))
+        if status == AVAILABLE:
+            heapq.heappush(self._cheapest, (daily_rate, car_id, self._version))
+        # Устаревших записей стало больше, чем живых: пересобираем кучи целиком
+        if len(self._expensive) > 2 * len(self._cars) + 64:
+            self._rebuild_heaps_locked()
+
+    def put_car(self, car_id: int, status: str, daily_rate: int):
+        """Новый автомобиль, смена статуса или цены (если данные уже загружены)"""
+        status = getattr(status, 'value', status)
+        with self._lock:
+            if self._cars_loaded_at is not None:
+                self._put_locked(car_id, status, daily_rate)
+
+    def remove_car(self, car_id: int):
+        with self._lock:
+            self._release_locked(car_id)
+
+    def count_all(self) -> int:
+        return len(self._cars)
+
+    def count_by_status(self, status: str) -> int:
+        return self._status_counts.get(status, 0)
+
+    def status_distribution(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._status_counts)
+
+    def _top_locked(self, heap: List[Tuple[int, int, int]], limit: int) -> List[Tuple[int, int]]:
+        """Первые limit живых записей кучи: O(limit · log n), устаревшие удаляются насовсем"""
+        taken = []
+        while heap and len(taken) < limit:
+            entry = heapq.heappop(heap)
+            current = self._cars.get(entry[1])
+            if current is not None and current[2] == entry[2]:
+                taken.append(entry)
+        for entry in taken:
+            heapq.heappush(heap, entry)
+        return [(car_id, self._cars[car_id][1]) for _, car_id, _ in taken]
+
+    def most_expensive(self, limit: int = 10) -> List[Tuple[int, int]]:
+        """(car_id, цена) самых дорогих автомобилей"""
+        with self._lock:
+            return self._top_locked(self._expensive, limit)
+
+    def cheapest_available(self, limit: int = 10) -> List[Tuple[int, int]]:
+        """(car_id, цена) самых дешёвых доступных автомобилей"""
+        with self._lock:
+            return self._top_locked(self._cheapest, limit)
+
+    # ==================== ПОЛЬЗОВАТЕЛИ ====================
+
+    @property
+    def users(self) -> int:
+        return self._users
+
+    def user_count(self, loader: Callable[[], int]) -> int:
+        if self._is_stale(self._users_loaded_at):
+            self.set_user_count(loader())
+        return self._users
+
+    def is_user_count_fresh(self) -> bool:
+        return not self._is_stale(self._users_loaded_at)
+
+    def set_user_count(self, count: int):
+        with self._lock:
+            self._users = count
+            self._users_loaded_at = time.monotonic()
+
+    def add_users(self, delta: int):
+        with self._lock:
+            if self._users_loaded_at is not None:
+                self._users += delta
+
+    def invalidate(self):
+        """Сбросить всё: при следующем запросе данные перечитаются из БД"""
+        with self._lock:
+            self._cars_loaded_at = None
+            self._users_loaded_at = None
+            self._cars, self._status_counts, self._expensive, self._cheapest = {}, {}, [], []
+
+
+fleet_stats = FleetStats()
@@ -0,0 +1,79 @@
+from dto import UserLoginResponseDTO
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+
+class IdentityCache:
+    """
+    LRU-кэш пользователей, найденных по JWT.
+    Запись живёт не дольше ttl секунд и не дольше срока действия токена.
+    При изменении или удалении пользователя все его записи сбрасываются.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl: float = 300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._entries: OrderedDict[str, Tuple[float, UserLoginResponseDTO]] = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[UserLoginResponseDTO]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+
+            expires_at, identity = entry
+            if expires_at <= now:
+                self._remove(token)
+                return None
+
+            self._entries.move_to_end(token)
+            return identity
+
+    def put(self, token: str, identity: UserLoginResponseDTO, token_exp: Optional[float] = None):
+        """Сохранить пользователя; token_exp — поле exp токена (unix-время)"""
+        ttl = self.ttl
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (time.monotonic() + ttl, identity)
+            self._tokens_by_user.setdefault(identity.user_id, set()).add(token)
+
+            while len(self._entries) > self.max_size:
+                oldest_token = next(iter(self._entries))
+                self._remove(oldest_token)
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            for token in self._tokens_by_user.pop(user_id, set()):
+                self._entries.pop(token, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def _remove(self, token: str):
+        _, identity = self._entries.pop(token)
+        tokens = self._tokens_by_user.get(identity.user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[identity.user_id]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+identity_cache = IdentityCache()
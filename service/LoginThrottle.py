@@ -0,0 +1,130 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Optional, Tuple
+
+
+class SlidingWindowCounter:
+    """Счётчик событий по ключу в скользящем окне"""
+
+    def __init__(self, limit: int, window: float, max_keys: int = 100_000):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._events: OrderedDict[str, Deque[float]] = OrderedDict()
+
+    def _trim(self, key: str, now: float) -> Optional[Deque[float]]:
+        events = self._events.get(key)
+        if events is None:
+            return None
+        while events and events[0] <= now - self.window:
+            events.popleft()
+        if not events:
+            del self._events[key]
+            return None
+        return events
+
+    def retry_after(self, key: str, now: float) -> float:
+        """Сколько секунд ждать до следующей попытки (0 — можно сейчас)"""
+        events = self._trim(key, now)
+        if events is None or len(events) < self.limit:
+            return 0.0
+        return events[-self.limit] + self.window - now
+
+    def hit(self, key: str, now: float):
+        events = self._trim(key, now)
+        if events is None:
+            events = self._events[key] = deque()
+        events.append(now)
+        self._events.move_to_end(key)
+
+        # Ограничиваем память: выбрасываем самые давние ключи
+        while len(self._events) > self.max_keys:
+            self._events.popitem(last=False)
+
+    def refund(self, key: str, at: float):
+        """Вернуть попытку, засчитанную в момент at"""
+        events = self._events.get(key)
+        if events is None:
+            return
+        try:
+            events.remove(at)
+        except ValueError:
+            return  # Уже вышла из окна или вытеснена
+        if not events:
+            del self._events[key]
+
+    def reset(self, key: str):
+        self._events.pop(key, None)
+
+
+class LoginThrottle:
+    """
+    Ограничение неудачных попыток входа по паре (email, IP) и по IP клиента.
+    Проверка выполняется до обращения к БД и до PBKDF2, поэтому перебор
+    паролей не расходует ни процессор, ни соединения с базой.
+
+    Попытка засчитывается сразу при проверке (reserve), ещё до хеширования:
+    иначе одновременные запросы успели бы пройти проверку раньше, чем
+    первый из них запишет неудачу. Успешный вход её возвращает. Счётчик
+    по email привязан к IP, чтобы чужие неверные пароли не блокировали
+    вход самому агенту.
+    """
+
+    def __init__(self, max_attempts_per_email: int = 5, max_attempts_per_ip: int = 20, window: float = 300.0):
+        self.by_email = SlidingWindowCounter(max_attempts_per_email, window)
+        self.by_ip = SlidingWindowCounter(max_attempts_per_ip, window)
+        self._lock = threading.Lock()
+
+    def configure(self, max_attempts_per_email: int, max_attempts_per_ip: int, window: float):
+        with self._lock:
+            self.by_email.limit, self.by_email.window = max_attempts_per_email, window
+            self.by_ip.limit, self.by_ip.window = max_attempts_per_ip, window
+
+    @staticmethod
+    def _email_key(email: str, ip: Optional[str]) -> str:
+        return f'{email.lower()}|{ip or ""}'
+
+    def _retry_after(self, email_key: str, ip: Optional[str], now: float) -> float:
+        wait = self.by_email.retry_after(email_key, now)
+        if ip:
+            wait = max(wait, self.by_ip.retry_after(ip, now))
+        return wait
+
+    def retry_after(self, email: str, ip: Optional[str]) -> float:
+        """Сколько секунд ждать до следующей попытки, ничего не засчитывая"""
+        with self._lock:
+            return self._retry_after(self._email_key(email, ip), ip, time.monotonic())
+
+    def reserve(self, email: str, ip: Optional[str]) -> Tuple[float, float]:
+        """
+        Проверить лимиты и засчитать попытку одним шагом.
+        Возвращает (retry_after, attempt): при retry_after > 0 попытка
+        не засчитана, attempt нужен для refund и register_success.
+        """
+        now = time.monotonic()
+        email_key = self._email_key(email, ip)
+        with self._lock:
+            wait = self._retry_after(email_key, ip, now)
+            if wait > 0:
+                return wait, now
+            self.by_email.hit(email_key, now)
+            if ip:
+                self.by_ip.hit(ip, now)
+            return 0.0, now
+
+    def refund(self, email: str, ip: Optional[str], attempt: float):
+        """Вернуть попытку, которая не дошла до проверки пароля"""
+        with self._lock:
+            self.by_email.refund(self._email_key(email, ip), attempt)
+            if ip:
+                self.by_ip.refund(ip, attempt)
+
+    def register_success(self, email: str, ip: Optional[str], attempt: float):
+        with self._lock:
+            self.by_email.reset(self._email_key(email, ip))
+            if ip:
+                self.by_ip.refund(ip, attempt)
+
+
+login_throttle = LoginThrottle()
@@ -0,0 +1,122 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+def _key(text: str) -> str:
+    return ' '.join(text.casefold().replace('ё', 'е').split())
+
+
+def _word_keys(name: str) -> List[str]:
+    """Ключи с начала каждого слова: «Toyota Supra MK4» находится и по «sup», и по «mk»"""
+    words = _key(name).split(' ')
+    return [' '.join(words[i:]) for i in range(len(words))]
+
+
+class ModelIndex:
+    """
+    Отсортированный список моделей автомобилей для автодополнения.
+    Для каждой различной модели хранится число автомобилей, а в списке
+    лежат ключи, начинающиеся с каждого слова названия: подсказки по
+    префиксу — бинарный поиск и проход по непрерывному диапазону.
+
+    Модели загружаются из БД при первом запросе, CarService обновляет
+    индекс при создании, изменении и удалении автомобиля, полная
+    перезагрузка — по истечении ttl (0 — без истечения).
+    """
+
+    def __init__(self, ttl: float = 600.0):
+        self.ttl = ttl
+        self._built_at: Optional[float] = None
+        self._car_models: Dict[int, str] = {}
+        self._counts: Dict[str, int] = {}
+        self._keys: List[Tuple[str, str]] = []  # (ключ с начала слова, модель)
+        self._lock = threading.Lock()
+
+    @property
+    def is_built(self) -> bool:
+        return self._built_at is not None
+
+    def _is_stale(self) -> bool:
+        if self._built_at is None:
+            return True
+        return bool(self.ttl) and time.monotonic() - self._built_at > self.ttl
+
+    def ensure(self, loader: Callable[[], Iterable[Tuple[int, str]]]):
+        """Построить индекс, если его нет или он устарел; loader возвращает пары (car_id, модель)"""
+        if self._is_stale():
+            self.build(loader())
+
+    def build(self, car_models: Iterable[Tuple[int, str]]):
+        models, counts = {}, {}
+        for car_id, name in car_models:
+            if name:
+                models[car_id] = name
+                counts[name] = counts.get(name, 0) + 1
+        keys = sorted((key, name) for name in counts for key in _word_keys(name))
+
+        with self._lock:
+            self._car_models, self._counts, self._keys = models, counts, keys
+            self._built_at = time.monotonic()
+
+    # ==================== ОБНОВЛЕНИЕ ПРИ ЗАПИСИ ====================
+
+    def _release_locked(self, car_id: int):
+        name = self._car_models.pop(car_id, None)
+        if name is None:
+            return
+        self._counts[name] -= 1
+        if self._counts[name]:
+            return
+        del self._counts[name]
+        for key in _word_keys(name):
+            position = bisect_left(self._keys, (key, name))
+            if position < len(self._keys) and self._keys[position] == (key, name):
+                del self._keys[position]
+
+    def set_car_model(self, car_id: int, name: Optional[str]):
+        """Модель автомобиля после записи (None — характеристик нет)"""
+        with self._lock:
+            if self._built_at is None or self._car_models.get(car_id) == name:
+                return
+            self._release_locked(car_id)
+            if not name:
+                return
+            self._car_models[car_id] = name
+            if name not in self._counts:
+                self._counts[name] = 0
+                for key in _word_keys(name):
+                    insort(self._keys, (key, name))
+            self._counts[name] += 1
+
+    def remove_car(self, car_id: int):
+        with self._lock:
+            self._release_locked(car_id)
+
+    def invalidate(self):
+        """Сбросить индекс: при следующем запросе он перестроится из БД"""
+        with self._lock:
+            self._built_at = None
+            self._car_models, self._counts, self._keys = {}, {}, []
+
+    # ==================== ПОДСКАЗКИ ====================
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Модели, одно из слов которых начинается с prefix: (модель, число автомобилей), частые первыми"""
+        key = _key(prefix)
+        with self._lock:
+            counts = self._counts
+            if not key:
+                names = counts.keys()
+            else:
+                names = set()
+                position = bisect_left(self._keys, (key,))
+                while position < len(self._keys) and self._keys[position][0].startswith(key):
+                    names.add(self._keys[position][1])
+                    position += 1
+            return [(name, counts[name]) for name in heapq.nsmallest(limit, names, key=lambda n: (-counts[n], n))]
+
+
+model_index = ModelIndex()
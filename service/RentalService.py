@@ -1,15 +1,34 @@
-from repository import RentalRepository, CarRepository, ClientRepository, UserRepository
+from repository import RentalRepository, CarRepository, ClientRepository, UserRepository, page_limits
 from dto import (RentalUpdateDTO, RentalCreateDTO, RentalResponseDTO,
-                 RentalStatusEnum, RentalWithRelationsDTO, RentalFilterDTO)
+                 RentalWithRelationsDTO, RentalFilterDTO,
+                 ClientResponseDTO, UserResponseDTO, PageDTO, PageRequestDTO)
 from entity import Rental, RentalStatus
 from service import CarService, ClientService, UserService
+from .CarService import car_with_specs_dto
+from .AvailabilityIndex import availability_index
+from .FleetAvailability import fleet_availability
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 from typing import Dict, Optional, List
 from math import ceil
 
 
+class RentalConflictError(ValueError):
+    """Автомобиль уже забронирован на запрошенный период"""
+
+
+def rental_with_relations_dto(rental: Rental) -> RentalWithRelationsDTO:
+    """DTO аренды из сущности с уже загруженными связями"""
+    return RentalWithRelationsDTO(
+        rental=RentalResponseDTO.model_validate(rental),
+        car=car_with_specs_dto(rental.car) if rental.car is not None else None,
+        client=ClientResponseDTO.model_validate(rental.client) if rental.client is not None else None,
+        user=UserResponseDTO.model_validate(rental.user) if rental.user is not None else None,
+    )
+
+
 class RentalService:
     def __init__(self, db_session: Session):
         self.db_session = db_session
@@ -24,50 +43,88 @@ class RentalService:
         self.user_repo = UserRepository(db_session)
         self.user_service = UserService(db_session)
 
-    def create_rental(self, rental_dto: RentalCreateDTO) -> Optional[RentalWithRelationsDTO]:
-        client_id = rental_dto.client_id
-        car_id = rental_dto.car_id
-        user_id = rental_dto.user_id
+    def _busy_intervals_loader(self, car_id: int):
+        return lambda: self.rental_repo.get_busy_intervals(car_id)
+
+    def _refresh_fleet(self, car_id: int):
+        """Пересчитать строку автомобиля в битовых картах занятости, если они построены"""
+        if fleet_availability.is_built:
+            fleet_availability.set_car_intervals(car_id, self.rental_repo.get_busy_intervals(car_id))
 
-        if not self.client_repo.exists(client_id):
+    def _booking_relations(self, car_id: int, client_id: int, user_id: int) -> RentalWithRelationsDTO:
+        """Автомобиль, клиент и сотрудник для ответа; заодно проверка, что все они существуют"""
+        car, client, user = self.rental_repo.get_booking_relations(car_id, client_id, user_id)
+        if client is None:
             raise ValueError(f'{client_id=} не существует')
-        if not self.car_repo.exists(car_id):
+        if car is None:
             raise ValueError(f'{car_id=} не существует')
-        if not self.user_repo.exists(user_id):
+        if user is None:
             raise ValueError(f'{user_id=} не существует')
+        return RentalWithRelationsDTO(
+            car=car_with_specs_dto(car),
+            client=ClientResponseDTO.model_validate(client),
+            user=UserResponseDTO.model_validate(user),
+        )
 
-        if not self.rental_repo.is_car_available(
-                car_id, rental_dto.start_date, rental_dto.end_date):
-            raise ValueError(
-                f'Автомобиль {car_id} не доступен в данный промежуток времени:'
-                f' {(rental_dto.start_date, rental_dto.end_date)=}'
-            )
+    def create_rental(self, rental_dto: RentalCreateDTO) -> Optional[RentalWithRelationsDTO]:
+        """
+        Бронирование ровно двумя запросами: связи для ответа и INSERT ... SELECT,
+        который сам проверяет, что автомобиль свободен, и возвращает вставленную строку.
+        Новая бронь открыта и сводки отчётов не меняет
+        """
+        client_id = rental_dto.client_id
+        car_id = rental_dto.car_id
+        user_id = rental_dto.user_id
+
+        # DTO связей собирается до commit: после него сущности пришлось бы перечитывать
+        result = self._booking_relations(car_id, client_id, user_id)
 
         rental_dto.start_date = rental_dto.start_date.replace(tzinfo=timezone.utc)
         if rental_dto.start_date > datetime.now(timezone.utc):
-            status = RentalStatusEnum.AWAITING
+            status = RentalStatus.AWAITING
         else:
             status = RentalStatus.ACTIVE
 
-        rental_entity = Rental(
-            car_id=car_id,
-            client_id=client_id,
-            user_id=user_id,
-            start_date=rental_dto.start_date,
-            end_date=rental_dto.end_date,
-            status=status,
-            notes=rental_dto.notes,
-        )
+        try:
+            row = self.rental_repo.create_if_available(dict(
+                car_id=car_id,
+                client_id=client_id,
+                user_id=user_id,
+                start_date=rental_dto.start_date,
+                end_date=rental_dto.end_date,
+                status=status,
+                notes=rental_dto.notes,
+                created_at=datetime.now(),
+            ))
+        except IntegrityError:
+            # Клиента, автомобиль или сотрудника удалили после чтения связей
+            self.db_session.rollback()
+            self._booking_relations(car_id, client_id, user_id)
+            raise
+        if row is None:
+            raise ValueError(
+                f'Автомобиль {car_id} не доступен в данный промежуток времени:'
+                f' {(rental_dto.start_date, rental_dto.end_date)=}'
+            )
 
-        res = self.rental_repo.create(rental_entity)
-        return self.get_rent_by_id(res.rent_id)
+        result.rental = RentalResponseDTO.model_validate(row._mapping)
+        # Индексы в памяти дополняются вставленной строкой, без запросов к БД
+        availability_index.add(car_id, row.rent_id, row.start_date, row.end_date)
+        fleet_availability.add_interval(car_id, row.start_date, row.end_date)
+        return result
 
     def update_rental(self, rental_info_dto: RentalUpdateDTO) -> RentalWithRelationsDTO:
-        self.rental_repo.update(rental_info_dto)
-        return self.get_rent_by_id(rental_info_dto.rent_id)
+        rental = self.rental_repo.update(rental_info_dto)
+        if rental is None:
+            raise ValueError(f'rent_id={rental_info_dto.rent_id} не существует')
+
+        # Произвольное изменение: период автомобиля перечитается из БД
+        availability_index.invalidate(rental.car_id)
+        self._refresh_fleet(rental.car_id)
+        return rental_with_relations_dto(rental)
 
     def extend_rental(self, rent_id: int, new_end_date: datetime) -> Optional[RentalWithRelationsDTO]:
-        rental = self.rental_repo.get_by_rent_id(rent_id)
+        rental = self.rental_repo.get_with_relations(rent_id)
         if rental is None:
             raise ValueError(f'{rent_id=} не существует')
 
@@ -75,63 +132,83 @@ class RentalService:
         new_end_date = new_end_date.replace(tzinfo=timezone.utc)
 
         if end_date > new_end_date:
-            return self.get_rent_by_id(rent_id)
-        return self.update_rental(
-            RentalUpdateDTO(rent_id=rent_id, end_date=new_end_date)
+            return rental_with_relations_dto(rental)
+
+        # Индекс в памяти — быстрая предварительная проверка; решает условный UPDATE в БД
+        car_id = rental.car_id
+        conflicts = availability_index.conflicts(
+            car_id, end_date, new_end_date, self._busy_intervals_loader(car_id), exclude_rent_id=rent_id
         )
+        row = None if conflicts else self.rental_repo.extend_if_available(rent_id, car_id, end_date, new_end_date)
+        if row is None:
+            if not conflicts:
+                # Бронь записал другой процесс: индекс устарел, перечитаем его из БД
+                availability_index.invalidate(car_id)
+            raise RentalConflictError(
+                f'Нельзя продлить аренду {rent_id} до {new_end_date}: '
+                f'автомобиль {car_id} уже забронирован' + (f' (аренды {conflicts})' if conflicts else '')
+            )
+
+        availability_index.add(car_id, rent_id, row.start_date, row.end_date)
+        self._refresh_fleet(car_id)
+        return rental_with_relations_dto(self.rental_repo.get_with_relations(rent_id))
 
     def complete_rental(self, rent_id: int, actual_return_date: datetime) -> Optional[RentalWithRelationsDTO]:
-        if not self.rental_repo.exist(rent_id):
+        rental = self.rental_repo.get_with_relations(rent_id)
+        if rental is None:
             raise ValueError(f'{rent_id=} не существует')
 
-        car_id = self.rental_repo.get_by_rent_id(rent_id).car_id
-        car_json = self.car_service.get_car_by_id(car_id)
-
-        start_date, cost = car_json['start_date'], car_json['daily_rate']
-        total_cost = int(cost * ceil((actual_return_date - start_date).total_seconds() / 3600))
+        # Оплата за каждые начатые сутки по тарифу автомобиля (автомобиль уже загружен вместе с арендой)
+        car_id, daily_rate = rental.car_id, rental.car.daily_rate
+        duration = actual_return_date.replace(tzinfo=None) - rental.start_date.replace(tzinfo=None)
+        total_cost = int(daily_rate * max(ceil(duration.total_seconds() / 86400), 1))
 
-        self.rental_repo.complete_rental(rent_id, actual_return_date, total_cost)
-        return self.get_rent_by_id(rent_id)
+        rental = self.rental_repo.complete_rental(rent_id, actual_return_date, total_cost)
+        if rental.status == RentalStatus.COMPLETED:
+            # Автомобиль свободен с момента фактического возврата
+            availability_index.add(car_id, rent_id, rental.start_date, actual_return_date)
+            self._refresh_fleet(car_id)
+        return rental_with_relations_dto(rental)
 
     def cancel_rental(self, rent_id: int) -> RentalWithRelationsDTO:
-        if not self.rental_repo.exist(rent_id):
+        rental = self.rental_repo.get_with_relations(rent_id)
+        if rental is None:
             raise ValueError(f'{rent_id=} не существует')
 
-        self.rental_repo.cancel_rental(rent_id)
-        return self.get_rent_by_id(rent_id)
+        rental = self.rental_repo.cancel_rental(rent_id)
+        if rental.status == RentalStatus.CANCELLED:
+            availability_index.remove(rental.car_id, rent_id)
+            self._refresh_fleet(rental.car_id)
+        return rental_with_relations_dto(rental)
 
     def delete_rental(self, rental_id: int) -> bool:
-        return self.rental_repo.delete(rental_id)
+        rental = self.rental_repo.get_by_rent_id(rental_id)
+        deleted = self.rental_repo.delete(rental_id)
+        if deleted:
+            availability_index.remove(rental.car_id, rental_id)
+            self._refresh_fleet(rental.car_id)
+        return deleted
 
     def get_rent_by_id(self, rent_id: int) -> Optional[RentalWithRelationsDTO]:
-        res = self.rental_repo.get_by_rent_id(rent_id)
-        if res is None:
+        rental = self.rental_repo.get_with_relations(rent_id)
+        if rental is None:
             raise ValueError(f'{rent_id=} не существует')
-
-        rental_dto = RentalResponseDTO.model_validate(self.rental_repo.get_by_rent_id(rent_id))
-        car_dto = self.car_service.get_car_by_id(rental_dto.car_id)
-        client_dto = self.client_service.get_client_by_id(rental_dto.client_id)
-        user_dto = self.user_service.get_user_by_id(rental_dto.user_id)
-
-        return RentalWithRelationsDTO(rental=rental_dto, car=car_dto, client=client_dto, user=user_dto)
+        return rental_with_relations_dto(rental)
 
     def get_rentals_by_filter(self, rentals_filter: RentalFilterDTO) -> List[RentalWithRelationsDTO]:
-
+        # Связи приходят тем же запросом, DTO собирается без обращений к БД
         rentals = self.rental_repo.find_by_filters(rentals_filter)
-        rentals_with_relations = []
-
-        for rental in rentals:
-            car_id, client_id, user_id = rental.car_id, rental.client_id, rental.user_id
-
-            rental = RentalResponseDTO.model_validate(rental).model_dump()
-            car_with_specs_dto = self.car_service.get_car_by_id(car_id)
-            client_dto = self.client_service.get_client_by_id(client_id)
-            user_dto = self.user_service.get_user_by_id(user_id)
-
-            rentals_with_relations.append(
-                RentalWithRelationsDTO(rental=rental, car=car_with_specs_dto, client=client_dto, user=user_dto)
-            )
-        return rentals_with_relations
+        return [rental_with_relations_dto(rental) for rental in rentals]
+
+    def get_rentals_page(self, rentals_filter: RentalFilterDTO,
+                         page: PageRequestDTO) -> PageDTO[RentalWithRelationsDTO]:
+        """Страница аренд по фильтру, связи загружаются тем же запросом"""
+        rentals, next_cursor = self.rental_repo.find_page(rentals_filter, page)
+        return PageDTO[RentalWithRelationsDTO](
+            items=[rental_with_relations_dto(rental) for rental in rentals],
+            next_cursor=next_cursor, limit=page_limits.resolve(page.limit)
+        )
 
     def is_car_available(self, car_id: int, start_date: datetime, end_date: datetime) -> bool:
-        return self.rental_repo.is_car_available(car_id, start_date, end_date)
+        """Проверка по индексу занятости; БД читается только при первой проверке автомобиля"""
+        return availability_index.is_free(car_id, start_date, end_date, self._busy_intervals_loader(car_id))
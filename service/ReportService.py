@@ -0,0 +1,86 @@
+from repository import RentalRollupRepository, CarRepository
+from dto import ReportPeriodEnum, RentalReportDTO, CarRevenueDTO, ClientRevenueDTO
+from .FleetStats import fleet_stats
+
+from sqlalchemy.orm import Session
+from datetime import date, timedelta
+from typing import Optional, Tuple
+
+MONTHS_IN_PERIOD = {ReportPeriodEnum.MONTH: 1, ReportPeriodEnum.QUARTER: 3, ReportPeriodEnum.YEAR: 12}
+PERIOD_COUNT = {ReportPeriodEnum.MONTH: 12, ReportPeriodEnum.QUARTER: 4, ReportPeriodEnum.YEAR: 1}
+
+
+def period_bounds(period: ReportPeriodEnum, year: int, number: int = 1) -> Tuple[date, date]:
+    """Первый и последний день number-го месяца/квартала года (для года number = 1)"""
+    if not 1 <= number <= PERIOD_COUNT[period]:
+        raise ValueError(f"Номер периода {period.value} должен быть от 1 до {PERIOD_COUNT[period]}")
+    months = MONTHS_IN_PERIOD[period]
+    first_month = (number - 1) * months + 1
+    first_day = date(year, first_month, 1)
+    next_month = first_month + months
+    next_start = date(year + 1, 1, 1) if next_month > 12 else date(year, next_month, 1)
+    return first_day, next_start - timedelta(days=1)
+
+
+class ReportService:
+    """
+    Отчёты по закрытым арендам из сводных таблиц по дням. Репозиторий аренд
+    обновляет сводки той же транзакцией, что и аренду, поэтому отчёт читает
+    не больше строк, чем дней в периоде, независимо от длины истории.
+    """
+
+    def __init__(self, db_session: Session, top: int = 10):
+        self.db_session = db_session
+        self.rollup_repo = RentalRollupRepository(db_session)
+        self.car_repo = CarRepository(db_session)
+        self.top = top
+
+    def rebuild(self, first_day: Optional[date] = None, last_day: Optional[date] = None, chunk_days: int = 92):
+        """
+        Пересчитать сводки за период (по умолчанию за всю историю) кусками по chunk_days дней:
+        первичное заполнение и сверка, на запись аренд это не нужно
+        """
+        if first_day is None or last_day is None:
+            span = self.rollup_repo.rental_span()
+            if span is None:
+                return
+            first_day, last_day = first_day or span[0], last_day or span[1]
+        while first_day <= last_day:
+            chunk_end = min(first_day + timedelta(days=chunk_days - 1), last_day)
+            self.rollup_repo.refresh(first_day, chunk_end)
+            first_day = chunk_end + timedelta(days=1)
+
+    def get_report(self, period: ReportPeriodEnum, year: int, number: int = 1) -> RentalReportDTO:
+        first_day, last_day = period_bounds(period, year, number)
+        totals = self.rollup_repo.get_totals(first_day, last_day)
+
+        # Загрузка считается от текущего размера парка: дата ввода автомобиля не хранится
+        fleet_stats.ensure(self.car_repo.get_stats_rows)
+        fleet_size = fleet_stats.count_all()
+        period_hours = ((last_day - first_day).days + 1) * 24
+
+        completed = int(totals['completed'])
+        busy_hours = float(totals['busy_hours'])
+        return RentalReportDTO(
+            period=period,
+            first_day=first_day,
+            last_day=last_day,
+            started=int(totals['started']),
+            completed=completed,
+            cancelled=int(totals['cancelled']),
+            revenue=float(totals['revenue']),
+            average_cost=round(float(totals['revenue']) / completed, 2) if completed else 0.0,
+            average_duration_hours=round(float(totals['completed_hours']) / completed, 2) if completed else 0.0,
+            busy_hours=busy_hours,
+            fleet_size=fleet_size,
+            utilization=round(busy_hours / (fleet_size * period_hours), 4) if fleet_size else 0.0,
+            top_cars=[
+                CarRevenueDTO(car_id=car_id, completed=done, revenue=float(revenue), busy_hours=float(hours))
+                for car_id, done, revenue, hours in self.rollup_repo.get_top_cars(first_day, last_day, self.top)
+            ],
+            top_clients=[
+                ClientRevenueDTO(client_id=client_id, started=started, completed=done, revenue=float(revenue))
+                for client_id, started, done, revenue
+                in self.rollup_repo.get_top_clients(first_day, last_day, self.top)
+            ],
+        )
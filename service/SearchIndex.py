@@ -0,0 +1,227 @@
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Латинские буквы, совпадающие по написанию с кириллическими в номерных знаках:
+# «A191AA» и «А191АА» должны находить одно и то же
+_LOOKALIKES = str.maketrans('abekmhopctyx', 'авекмнорстух')
+
+_NOT_ALNUM = re.compile(r'[\W_]+')
+
+MIN_QUERY_LENGTH = 3
+
+# Вид документа и его id: ('client', 1), ('car', 5)
+DocumentKey = Tuple[str, int]
+
+
+class SearchDocument(NamedTuple):
+    kind: str
+    key: int
+    title: str
+    fields: Tuple[Tuple[str, str], ...]  # (поле, значение) без пустых значений
+
+
+class SearchHit(NamedTuple):
+    kind: str
+    key: int
+    title: str
+    field: str
+    value: str
+    score: int
+
+
+def normalize(text: str) -> str:
+    """Только буквы и цифры в нижнем регистре: «+7 (999) 123-45» ищется по «999123»"""
+    return _NOT_ALNUM.sub('', text.casefold().replace('ё', 'е').translate(_LOOKALIKES))
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def client_document(client_id: int, name: str, phone: str, telegram_id: Optional[str],
+                    license_number: str) -> SearchDocument:
+    fields = (('name', name), ('phone', phone), ('telegram_id', telegram_id), ('license_number', license_number))
+    return SearchDocument('client', client_id, name, tuple((f, v) for f, v in fields if v))
+
+
+def car_document(car_id: int, license_plate: str, vin: str, model: Optional[str]) -> SearchDocument:
+    fields = (('license_plate', license_plate), ('vin', vin), ('model', model))
+    title = f"{model} {license_plate}" if model else license_plate
+    return SearchDocument('car', car_id, title, tuple((f, v) for f, v in fields if v))
+
+
+class SearchIndex:
+    """
+    Индекс строки поиска по клиентам и автомобилям.
+    Нормализованные значения полей лежат в отсортированном списке: полные
+    совпадения и совпадения с начала находятся бинарным поиском. Вхождения
+    в середину ищутся по триграммам — документы, содержащие все тройки
+    символов запроса, проверяются на подстроку, пока не наберётся limit.
+    Так «%...%» в любом месте строки ищется без прохода по таблицам.
+
+    Документы загружаются из БД при первом запросе, обновляются сервисами
+    при записи и перечитываются полностью по истечении ttl (0 — без истечения).
+    """
+
+    def __init__(self, ttl: float = 600.0):
+        self.ttl = ttl
+        self._built_at: Optional[float] = None
+        self._slots: Dict[DocumentKey, int] = {}
+        # Слот -> (документ, [(поле, значение, нормализованное значение)]); удалённые — None
+        self._entries: List[Optional[Tuple[SearchDocument, List[Tuple[str, str, str]]]]] = []
+        self._values: List[Tuple[str, int, int]] = []  # (нормализованное значение, слот, номер поля)
+        self._postings: Dict[str, Set[int]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def is_built(self) -> bool:
+        return self._built_at is not None
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _is_stale(self) -> bool:
+        if self._built_at is None:
+            return True
+        return bool(self.ttl) and time.monotonic() - self._built_at > self.ttl
+
+    def ensure(self, loader: Callable[[], Iterable[SearchDocument]]):
+        """Построить индекс, если его нет или он устарел"""
+        if self._is_stale():
+            self.build(loader())
+
+    def build(self, documents: Iterable[SearchDocument]):
+        slots, entries, values, postings = {}, [], [], {}
+        for document in documents:
+            key = (document.kind, document.key)
+            if key in slots:
+                continue
+            slot = len(entries)
+            slots[key] = slot
+            fields = self._normalize_fields(document)
+            entries.append((document, fields))
+            for number, (_, _, text) in enumerate(fields):
+                values.append((text, slot, number))
+            for gram in self._document_trigrams(fields):
+                slots_of_gram = postings.get(gram)
+                if slots_of_gram is None:
+                    postings[gram] = {slot}
+                else:
+                    slots_of_gram.add(slot)
+        values.sort()
+
+        with self._lock:
+            self._slots, self._entries, self._values, self._postings = slots, entries, values, postings
+            self._built_at = time.monotonic()
+
+    @staticmethod
+    def _normalize_fields(document: SearchDocument) -> List[Tuple[str, str, str]]:
+        return [(field, value, normalize(value)) for field, value in document.fields]
+
+    @staticmethod
+    def _document_trigrams(fields: List[Tuple[str, str, str]]) -> Set[str]:
+        grams = set()
+        for _, _, text in fields:
+            grams |= trigrams(text)
+        return grams
+
+    # ==================== ОБНОВЛЕНИЕ ПРИ ЗАПИСИ ====================
+
+    def _remove_locked(self, key: DocumentKey):
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return
+        _, fields = self._entries[slot]
+        self._entries[slot] = None
+        for number, (_, _, text) in enumerate(fields):
+            position = bisect_left(self._values, (text, slot, number))
+            if position < len(self._values) and self._values[position] == (text, slot, number):
+                del self._values[position]
+        for gram in self._document_trigrams(fields):
+            slots = self._postings.get(gram)
+            if slots is not None:
+                slots.discard(slot)
+                if not slots:
+                    del self._postings[gram]
+
+    def put(self, document: SearchDocument):
+        """Добавить или заменить документ (если индекс уже построен)"""
+        key = (document.kind, document.key)
+        fields = self._normalize_fields(document)
+        with self._lock:
+            if self._built_at is None:
+                return
+            self._remove_locked(key)
+            slot = len(self._entries)
+            self._slots[key] = slot
+            self._entries.append((document, fields))
+            for number, (_, _, text) in enumerate(fields):
+                insort(self._values, (text, slot, number))
+            for gram in self._document_trigrams(fields):
+                self._postings.setdefault(gram, set()).add(slot)
+
+    def remove(self, kind: str, key: int):
+        with self._lock:
+            self._remove_locked((kind, key))
+
+    def invalidate(self):
+        """Сбросить индекс: при следующем запросе он перестроится из БД"""
+        with self._lock:
+            self._built_at = None
+            self._slots, self._entries, self._values, self._postings = {}, [], [], {}
+
+    # ==================== ПОИСК ====================
+
+    def search(self, query: str, limit: int = 20, kind: Optional[str] = None) -> List[SearchHit]:
+        """
+        Документы, в поле которых встречается query. Сначала полные
+        совпадения поля, затем совпадения с начала (по алфавиту), затем
+        вхождения в середину (в порядке загрузки). Работа ограничена limit:
+        частый запрос не перебирает все подходящие записи.
+        """
+        needle = normalize(query)
+        if len(needle) < MIN_QUERY_LENGTH:
+            raise ValueError(f"Запрос должен содержать не менее {MIN_QUERY_LENGTH} букв или цифр")
+
+        hits: Dict[int, SearchHit] = {}
+
+        def add(slot: int, number: int, score: int):
+            document, fields = self._entries[slot]
+            field, value, _ = fields[number]
+            hits[slot] = SearchHit(document.kind, document.key, document.title, field, value, score)
+
+        with self._lock:
+            entries, values = self._entries, self._values
+
+            # Полные совпадения и совпадения с начала: непрерывный диапазон отсортированного списка
+            position = bisect_left(values, (needle,))
+            while position < len(values) and len(hits) < limit:
+                text, slot, number = values[position]
+                if not text.startswith(needle):
+                    break
+                if slot not in hits and (kind is None or entries[slot][0].kind == kind):
+                    add(slot, number, 3 if text == needle else 2)
+                position += 1
+
+            if len(hits) < limit:
+                # Вхождения в середину: пересечение триграмм от самого короткого списка
+                postings = sorted((self._postings.get(gram, set()) for gram in trigrams(needle)), key=len)
+                candidates = postings[0].intersection(*postings[1:])
+                for slot in sorted(candidates - hits.keys()):
+                    document, fields = entries[slot]
+                    if kind is not None and document.kind != kind:
+                        continue
+                    for number, (_, _, text) in enumerate(fields):
+                        if needle in text:
+                            add(slot, number, 1)
+                            break
+                    if len(hits) >= limit:
+                        break
+
+        return list(hits.values())
+
+
+search_index = SearchIndex()
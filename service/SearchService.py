@@ -0,0 +1,26 @@
+from repository import CarRepository, ClientRepository
+from dto import SearchHitDTO, SearchKindEnum
+from .SearchIndex import search_index, client_document, car_document, SearchDocument
+
+from sqlalchemy.orm import Session
+from typing import Iterator, List, Optional
+
+
+class SearchService:
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+        self.client_repo = ClientRepository(db_session)
+        self.car_repo = CarRepository(db_session)
+
+    def _load_documents(self) -> Iterator[SearchDocument]:
+        for row in self.client_repo.get_search_rows():
+            yield client_document(*row)
+        for row in self.car_repo.get_search_rows():
+            yield car_document(*row)
+
+    def search(self, query: str, limit: int = 20, kind: Optional[SearchKindEnum] = None) -> List[SearchHitDTO]:
+        """Клиенты и автомобили, у которых query входит в имя, телефон, Telegram ID, ВУ, номер, VIN или модель"""
+        search_index.ensure(self._load_documents)
+        hits = search_index.search(query, limit, kind.value if kind else None)
+        return [SearchHitDTO(kind=hit.kind, id=hit.key, title=hit.title, field=hit.field,
+                             value=hit.value, score=hit.score) for hit in hits]
@@ -1,25 +1,62 @@
 from repository import UserRepository
 from dto import UserLoginDTO, UserLoginResponseDTO
-from utils import verify_password
+from utils import (check_password, check_password_async, make_password_hash,
+                   make_password_hash_async, needs_rehash, HashingOverloadError)
 
 from sqlalchemy.orm import Session
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
 
 class UserDetailsService:
     def __init__(self, db_session: Session):
         self.db_session = db_session
         self.user_repo = UserRepository(db_session)
 
-    def check_authorization(self, email: str, password: str) -> bool:
-        if not self.user_repo.email_exists(email):
-            return False
+    def authenticate(self, email: str, password: str) -> Optional[int]:
+        """
+        Проверить учетные данные одним запросом; возвращает user_id или None.
+        Хеш со старыми параметрами после успешной проверки пересчитывается.
+        """
+        credentials = self.user_repo.get_credentials_by_email(email)
+        if credentials is None:
+            return None
+
+        user_id, hashed_password = credentials
+        if not check_password(hashed_password, password):
+            return None
+
+        if needs_rehash(hashed_password):
+            try:
+                self.user_repo.update_password(user_id, make_password_hash(password))
+            except HashingOverloadError:
+                pass  # Перехешируем при следующем входе
+        return user_id
+
+    async def authenticate_async(self, email: str, password: str) -> Optional[int]:
+        """То же, что authenticate, но PBKDF2 считается в пуле процессов без блокировки цикла событий"""
+        credentials = await run_in_threadpool(self.user_repo.get_credentials_by_email, email)
+        if credentials is None:
+            return None
 
-        hashed_password = self.user_repo.get_password_by_email(email)
-        return verify_password(hashed_password, password)
+        user_id, hashed_password = credentials
+        if not await check_password_async(hashed_password, password):
+            return None
+
+        if needs_rehash(hashed_password):
+            try:
+                new_hash = await make_password_hash_async(password)
+                await run_in_threadpool(self.user_repo.update_password, user_id, new_hash)
+            except HashingOverloadError:
+                pass  # Перехешируем при следующем входе
+        return user_id
+
+    def check_authorization(self, email: str, password: str) -> bool:
+        return self.authenticate(email, password) is not None
 
     def get_user_login_response(self, user_id: int) -> UserLoginResponseDTO:
         res = self.user_repo.get_by_user_id(user_id)
         if res is None:
-            ValueError(f"{user_id=} не существует.")
+            raise ValueError(f"{user_id=} не существует.")
         return UserLoginResponseDTO.model_validate(res)
 
 
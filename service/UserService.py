@@ -1,10 +1,13 @@
-from utils import hash_password
+from utils import make_password_hash, make_password_hash_async
 from repository import UserRepository
 from dto import UserCreateDTO, UserUpdateDTO, UserResponseDTO
+from .IdentityCache import identity_cache
+from .FleetStats import fleet_stats
 from entity import User
 
 from sqlalchemy.orm import Session
-from typing import Dict
+from typing import Dict, Optional
+from fastapi.concurrency import run_in_threadpool
 
 
 class UserService:
@@ -12,27 +15,50 @@ class UserService:
         self.db_session = db_session
         self.user_repo = UserRepository(db_session)
 
-    def create_user(self, user_dto: UserCreateDTO) -> UserResponseDTO:
+    def _check_email(self, user_dto: UserCreateDTO):
         email = str(user_dto.email)
         if self.user_repo.email_exists(email):
             raise ValueError(f"Email {email} уже используется")
 
+    def _create(self, user_dto: UserCreateDTO, password_hash: bytes) -> UserResponseDTO:
         user_entity = User(
             email=user_dto.email,
-            password=hash_password(user_dto.password),
+            password=password_hash,
             name=user_dto.name.strip(),
             position=user_dto.position
         )
 
         created_user = self.user_repo.create(user_entity)
+        fleet_stats.add_users(1)
         return UserResponseDTO.model_validate(created_user)
 
-    def update_user(self, user_info_dto: UserUpdateDTO) -> UserResponseDTO:
-        client_response_dto = UserResponseDTO.model_validate(self.user_repo.update(user_info_dto))
+    def create_user(self, user_dto: UserCreateDTO) -> UserResponseDTO:
+        self._check_email(user_dto)
+        return self._create(user_dto, make_password_hash(user_dto.password))
+
+    async def create_user_async(self, user_dto: UserCreateDTO) -> UserResponseDTO:
+        """То же, что create_user, но PBKDF2 ждётся в цикле событий, а не в потоке запроса"""
+        await run_in_threadpool(self._check_email, user_dto)
+        password_hash = await make_password_hash_async(user_dto.password)
+        return await run_in_threadpool(self._create, user_dto, password_hash)
+
+    def update_user(self, user_info_dto: UserUpdateDTO, password_hash: Optional[bytes] = None) -> UserResponseDTO:
+        client_response_dto = UserResponseDTO.model_validate(self.user_repo.update(user_info_dto, password_hash))
+        identity_cache.invalidate_user(user_info_dto.user_id)
         return client_response_dto
 
+    async def update_user_async(self, user_info_dto: UserUpdateDTO) -> UserResponseDTO:
+        password_hash = None
+        if user_info_dto.password is not None:
+            password_hash = await make_password_hash_async(user_info_dto.password)
+        return await run_in_threadpool(self.update_user, user_info_dto, password_hash)
+
     def delete_user(self, user_id: int) -> bool:
-        return self.user_repo.delete(user_id)
+        identity_cache.invalidate_user(user_id)
+        deleted = self.user_repo.delete(user_id)
+        if deleted:
+            fleet_stats.add_users(-1)
+        return deleted
 
     def get_user_by_id(self, user_id: int) -> UserResponseDTO:
         user_entity = self.user_repo.get_by_user_id(user_id)
@@ -44,5 +70,5 @@ class UserService:
         return self.user_repo.exists(user_id)
 
     def count_all(self) -> int:
-        """Общее количество автомобилей"""
-        return self.user_repo.count_all()
+        """Общее количество сотрудников (счётчик в памяти, COUNT только при загрузке)"""
+        return fleet_stats.user_count(self.user_repo.count_all)
@@ -0,0 +1,138 @@
+from repository import RentalRepository, CarRepository
+from dto import UtilizationReportDTO, CarUtilizationDTO, ModelUtilizationDTO
+
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+
+# NumPy импортируется при первом отчёте, а не при старте воркера
+if TYPE_CHECKING:
+    import numpy as np
+
+HOUR = 3600
+EPOCH = datetime(1970, 1, 1)
+SECOND = timedelta(seconds=1)
+
+
+def to_seconds(moments: Iterable[datetime], count: int) -> 'np.ndarray':
+    """
+    Секунды от эпохи (int64) для наивных дат, как они хранятся в БД.
+    Целочисленная арифметика timedelta в несколько раз быстрее, чем
+    преобразование объектов datetime в datetime64 средствами NumPy.
+    """
+    import numpy as np
+
+    return np.fromiter(((moment - EPOCH) // SECOND for moment in moments), dtype=np.int64, count=count)
+
+
+def busy_seconds(car_index: 'np.ndarray', starts: 'np.ndarray', ends: 'np.ndarray',
+                 window_start: int, window_end: int, car_count: int) -> 'np.ndarray':
+    """
+    Занятые секунды каждого автомобиля в окне [window_start, window_end).
+    car_index — номер автомобиля 0..car_count-1, starts и ends — секунды int64.
+    Пересекающиеся интервалы одного автомобиля считаются один раз: после
+    сортировки по (автомобиль, начало) каждый интервал добавляет только часть
+    после самого позднего конца предыдущих интервалов того же автомобиля.
+    Всё считается операциями над массивами, без цикла по арендам.
+    """
+    import numpy as np
+
+    starts = np.clip(starts, window_start, window_end) - window_start
+    ends = np.clip(ends, window_start, window_end) - window_start
+    keep = ends > starts
+    car_index, starts, ends = car_index[keep], starts[keep], ends[keep]
+    if not len(starts):
+        return np.zeros(car_count)
+
+    # Смещение на номер автомобиля отделяет группы: одна сортировка по starts + offset
+    # упорядочивает по (автомобиль, начало), а накопленный максимум концов
+    # внутри группы не видит концы предыдущих автомобилей
+    offset = car_index.astype(np.int64) * (window_end - window_start + 1)
+    order = np.argsort(starts + offset)
+    car_index, starts, ends, offset = car_index[order], starts[order], ends[order], offset[order]
+
+    reach = np.maximum.accumulate(ends + offset) - offset
+    previous = np.empty_like(reach)
+    previous[0] = 0
+    previous[1:] = reach[:-1]
+    previous[1:][car_index[1:] != car_index[:-1]] = 0
+
+    covered = np.clip(ends - np.maximum(starts, previous), 0, None)
+    return np.bincount(car_index, weights=covered, minlength=car_count)
+
+
+class UtilizationService:
+    """
+    Загрузка автомобилей и моделей за произвольное окно: занятые часы,
+    делённые на часы окна. Интервалы аренд загружаются в массивы NumPy
+    и обрабатываются векторно — миллион аренд считается за доли секунды.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+        self.rental_repo = RentalRepository(db_session)
+        self.car_repo = CarRepository(db_session)
+
+    def _load(self, start: datetime, end: datetime) -> Tuple['np.ndarray', List[Optional[str]], 'np.ndarray',
+                                                                'np.ndarray', 'np.ndarray']:
+        import numpy as np
+
+        fleet = self.car_repo.get_fleet_models()
+        car_ids = np.fromiter((car_id for car_id, _ in fleet), dtype=np.int64, count=len(fleet))
+        models = [model for _, model in fleet]
+
+        rows = self.rental_repo.get_busy_intervals_between(start, end)
+        rental_cars = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        starts = to_seconds((row[1] for row in rows), len(rows))
+        ends = to_seconds((row[2] for row in rows), len(rows))
+        return car_ids, models, rental_cars, starts, ends
+
+    def get_utilization(self, start: datetime, end: datetime) -> UtilizationReportDTO:
+        start, end = start.replace(tzinfo=None), end.replace(tzinfo=None)
+        if end <= start:
+            raise ValueError("Начало окна должно быть раньше конца")
+
+        import numpy as np
+
+        car_ids, models, rental_cars, starts, ends = self._load(start, end)
+        # Номер автомобиля аренды в списке парка (car_ids отсортированы)
+        car_index = np.searchsorted(car_ids, rental_cars)
+        known = car_index < len(car_ids)
+        known[known] = car_ids[car_index[known]] == rental_cars[known]
+
+        window_start, window_end = to_seconds((start, end), 2)
+        window = float(window_end - window_start)
+        busy = busy_seconds(car_index[known], starts[known], ends[known],
+                            int(window_start), int(window_end), len(car_ids))
+
+        # Модели: номер модели для каждого автомобиля, суммы — одним bincount
+        names = sorted({model for model in models if model is not None})
+        model_numbers = {name: number for number, name in enumerate(names)}
+        no_model = len(names)
+        model_index = np.fromiter((model_numbers.get(model, no_model) for model in models),
+                                  dtype=np.int64, count=len(models))
+        model_busy = np.bincount(model_index, weights=busy, minlength=no_model + 1)
+        model_cars = np.bincount(model_index, minlength=no_model + 1)
+
+        model_rows = [
+            ModelUtilizationDTO(model=name, cars=int(model_cars[number]),
+                                busy_hours=round(model_busy[number] / HOUR, 2),
+                                utilization=round(model_busy[number] / (model_cars[number] * window), 4))
+            for number, name in enumerate(names + [None]) if model_cars[number]
+        ]
+        car_rows = [
+            CarUtilizationDTO(car_id=int(car_id), model=model, busy_hours=round(seconds / HOUR, 2),
+                              utilization=round(seconds / window, 4))
+            for car_id, model, seconds in zip(car_ids.tolist(), models, busy.tolist())
+        ]
+        total = float(busy.sum())
+        return UtilizationReportDTO(
+            start=start,
+            end=end,
+            window_hours=round(window / HOUR, 2),
+            fleet_size=len(car_ids),
+            busy_hours=round(total / HOUR, 2),
+            utilization=round(total / (len(car_ids) * window), 4) if len(car_ids) else 0.0,
+            models=sorted(model_rows, key=lambda row: -row.utilization),
+            cars=sorted(car_rows, key=lambda row: -row.utilization),
+        )
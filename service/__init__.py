@@ -1,14 +1,34 @@
 from .CarService import CarService
 from .ClientService import ClientService
 from .UserService import UserService
-from .RentalService import RentalService
+from .RentalService import RentalService, RentalConflictError
 from .UserDetailsService import UserDetailsService
+from .AsyncCarService import AsyncCarService
+from .AsyncClientService import AsyncClientService
+from .AsyncUserService import AsyncUserService
+from .AsyncRentalService import AsyncRentalService
+from .ExportService import ExportService
+from .SearchService import SearchService
+from .ReportService import ReportService
+from .UtilizationService import UtilizationService
 from .Dependencies import (get_car_service,
                            get_client_service,
                            get_user_service,
                            get_rental_service,
+                           get_export_service,
+                           get_search_service,
+                           get_report_service,
+                           get_utilization_service,
                            get_current_user,
+                           get_current_user_async,
                            get_auth_service,
+                           get_async_car_service,
+                           get_async_client_service,
+                           get_async_user_service,
+                           get_async_rental_service,
+                           get_page_request,
+                           get_car_filter,
+                           get_client_filter,
                            create_access_token)
 
 __all__ = [
@@ -16,13 +36,34 @@ __all__ = [
     "ClientService",
     "UserService",
     "RentalService",
+    "RentalConflictError",
     "UserDetailsService",
+    "AsyncCarService",
+    "AsyncClientService",
+    "AsyncUserService",
+    "AsyncRentalService",
+    "ExportService",
+    "SearchService",
+    "ReportService",
+    "UtilizationService",
 
     "get_car_service",
     "get_client_service",
     "get_user_service",
     "get_rental_service",
+    "get_export_service",
+    "get_search_service",
+    "get_report_service",
+    "get_utilization_service",
     "get_auth_service",
     "get_current_user",
+    "get_current_user_async",
+    "get_async_car_service",
+    "get_async_client_service",
+    "get_async_user_service",
+    "get_async_rental_service",
+    "get_page_request",
+    "get_car_filter",
+    "get_client_filter",
     "create_access_token"
 ]
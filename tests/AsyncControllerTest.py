@@ -0,0 +1,138 @@
+from config.connection import DatabaseConfig, get_async_db
+from config import test_data as seed
+from controller import async_car_router, async_client_router, async_user_router, async_rental_router
+from service import create_access_token
+from service.AvailabilityIndex import availability_index
+from service.FleetAvailability import fleet_availability
+from service.SearchIndex import search_index
+from service.ModelIndex import model_index
+from service.FleetStats import fleet_stats
+from service.IdentityCache import identity_cache
+
+import asyncio
+import pytest
+import fastapi.dependencies.utils
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+
+def invalidate_indexes():
+    # Индексы и кэш живут в памяти процесса: данные этой базы не должны попасть в другие тесты
+    for index in (availability_index, fleet_availability, search_index, model_index, fleet_stats):
+        index.invalidate()
+    identity_cache.clear()
+
+
+@pytest.fixture
+def database(tmp_path):
+    # Файловая база: асинхронный драйвер с :memory: открыл бы отдельную пустую базу
+    config = DatabaseConfig({'backend': 'sqlite', 'path': str(tmp_path / 'async.db')})
+    engine = config.sync_engine(metrics=None)
+    invalidate_indexes()
+    session = Session(bind=engine)
+    try:
+        yield config, seed.TestData(session).load()
+    finally:
+        session.close()
+        engine.dispose()
+        invalidate_indexes()
+
+
+@pytest.fixture
+def client(database, monkeypatch):
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    config, test_data = database
+    async_engine = config.async_engine(metrics=None)
+    sessions = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with sessions() as db:
+            yield db
+
+    # Асинхронные маршруты не должны уходить в пул потоков ни на одной зависимости
+    def no_threadpool(*args, **kwargs):
+        raise AssertionError("Зависимость асинхронного маршрута вызвана в пуле потоков")
+
+    monkeypatch.setattr(fastapi.dependencies.utils, 'run_in_threadpool', no_threadpool)
+
+    app = FastAPI()
+    for router in (async_car_router, async_client_router, async_user_router, async_rental_router):
+        app.include_router(router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+
+    token = create_access_token({'sub': str(test_data.users[0].user_id)})
+    with TestClient(app, headers={'Authorization': f'Bearer {token}'}) as c:
+        yield c, test_data
+    asyncio.run(async_engine.dispose())
+
+
+def test_memory_sqlite_rejected():
+    with pytest.raises(ValueError, match='файловая база'):
+        DatabaseConfig({'backend': 'sqlite', 'path': ':memory:'}).async_engine()
+
+
+def test_requires_valid_token(client):
+    c, _ = client
+    assert c.get('/users/count', headers={'Authorization': 'Bearer broken'}).status_code == 401
+
+
+def test_car_by_id_and_filter(client):
+    c, test_data = client
+    car_id = test_data.cars[0].car_id
+
+    response = c.get(f'/cars/{car_id}')
+    assert response.status_code == 200
+    assert response.json()['specifications']['name'] == 'Nissan Silvia S15'
+    assert c.get('/cars/999').status_code == 404
+
+    response = c.get('/cars/filter', params={'min_rate': 600, 'limit': 1})
+    assert response.status_code == 200
+    page = response.json()
+    assert len(page['items']) == 1 and page['items'][0]['car']['daily_rate'] >= 600
+    assert page['limit'] == 1
+
+
+def test_client_by_id_name_and_filter(client):
+    c, test_data = client
+    client_id = test_data.clients[0].client_id
+
+    response = c.get(f'/clients/{client_id}')
+    assert response.status_code == 200
+    assert response.json()['phone'] == '89003123412'
+    assert c.get('/clients/999').status_code == 404
+
+    response = c.get('/clients/name', params={'name': 'Бутусов'})
+    assert [item['name'] for item in response.json()['items']] == ['Бутусов Денис Николаевич']
+
+    response = c.get('/clients/filter', params={'phone': '8900312'})
+    assert [item['client_id'] for item in response.json()['items']] == [client_id]
+
+
+def test_user_by_id_exists_and_count(client):
+    c, test_data = client
+    user_id = test_data.users[0].user_id
+
+    response = c.get(f'/users/{user_id}')
+    assert response.status_code == 200
+    assert response.json()['name'] == 'Петров Дмитрий'
+    assert c.get('/users/999').status_code == 404
+
+    assert c.get(f'/users/{user_id}/exist').json() is True
+    assert c.get('/users/999/exist').json() is False
+    assert c.get('/users/count').json() == {'count': len(test_data.users)}
+
+
+def test_rental_by_id_and_filter(client):
+    c, test_data = client
+    rent_id = test_data.rentals[0].rental.rent_id
+
+    response = c.get(f'/rentals/{rent_id}')
+    assert response.status_code == 200
+    assert response.json()['client']['client_id'] == test_data.clients[0].client_id
+    assert c.get('/rentals/999').status_code == 404
+
+    response = c.get('/rentals/filter', params={'car_id': test_data.cars[1].car_id})
+    assert response.status_code == 200
+    assert [item['rental']['rent_id'] for item in response.json()['items']] == [test_data.rentals[1].rental.rent_id]
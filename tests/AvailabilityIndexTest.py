@@ -0,0 +1,167 @@
+from service import get_rental_service, RentalConflictError
+from service.AvailabilityIndex import AvailabilityIndex, CarIntervals
+from dto import RentalCreateDTO
+from repository import RentalRepository
+from entity import Rental, RentalStatus
+
+import pytest
+import random
+from datetime import datetime, timedelta, timezone
+
+DAY = datetime(2030, 1, 1)
+
+
+def day(n: int) -> datetime:
+    return DAY + timedelta(days=n)
+
+
+def test_overlapping_finds_enclosing_and_boundary_intervals():
+    intervals = CarIntervals([(1, day(0), day(10)), (2, day(20), day(22))])
+
+    assert list(intervals.overlapping(day(3), day(5))) == [1]    # аренда целиком накрывает окно
+    assert list(intervals.overlapping(day(10), day(12))) == [1]  # границы включительные
+    assert list(intervals.overlapping(day(11), day(19))) == []
+    assert sorted(intervals.overlapping(day(5), day(21))) == [1, 2]
+
+
+def test_remove_and_move_interval():
+    intervals = CarIntervals([(1, day(0), day(10)), (2, day(20), day(22))])
+
+    intervals.remove(1)
+    assert list(intervals.overlapping(day(3), day(5))) == []
+
+    intervals.add(2, day(20), day(30))  # продление заменяет период
+    assert list(intervals.overlapping(day(25), day(26))) == [2]
+    assert len(intervals) == 1
+
+
+class CountingMoment(datetime):
+    """Начало окна, которое считает сравнения с концами периодов"""
+    comparisons = 0
+
+    def _count(compare):
+        def counted(self, other):
+            CountingMoment.comparisons += 1
+            return compare(self, other)
+        return counted
+
+    __lt__ = _count(datetime.__lt__)
+    __le__ = _count(datetime.__le__)
+    __gt__ = _count(datetime.__gt__)
+    __ge__ = _count(datetime.__ge__)
+    del _count
+
+
+def test_long_interval_does_not_scan_short_ones():
+    # Длинный период в начале, за ним тысячи коротких, которые кончаются до окна
+    short = [(n, day(n) + timedelta(hours=1), day(n) + timedelta(hours=2)) for n in range(1, 4001)]
+    intervals = CarIntervals([(0, day(0), day(5000))] + short)
+
+    window = day(4500)
+    CountingMoment.comparisons = 0
+    found = list(intervals.overlapping(CountingMoment(window.year, window.month, window.day), day(4501)))
+
+    assert found == [0]
+    # Спуск по дереву, а не перебор всех 4000 коротких периодов
+    assert 0 < CountingMoment.comparisons < 100
+
+
+def test_overlapping_matches_brute_force():
+    rng = random.Random(12)
+    periods = []
+    for rent_id in range(300):
+        start = day(0) + timedelta(hours=rng.randrange(0, 24 * 200))
+        periods.append((rent_id, start, start + timedelta(hours=rng.choice([1, 5, 48, 24 * 60]))))
+    intervals = CarIntervals(periods)
+
+    for _ in range(200):
+        start = day(0) + timedelta(hours=rng.randrange(-48, 24 * 210))
+        end = start + timedelta(hours=rng.randrange(0, 24 * 10))
+        expected = sorted(rent_id for rent_id, s, e in periods if s <= end and e >= start)
+        assert sorted(intervals.overlapping(start, end)) == expected
+
+
+def test_index_reads_loader_once():
+    index = AvailabilityIndex(ttl=0)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return [(1, day(0), day(10))]
+
+    assert not index.is_free(7, day(1), day(2), loader)
+    index.add(7, 2, day(20), day(25))
+    assert not index.is_free(7, day(21), day(22), loader)
+    assert index.is_free(7, day(21), day(22), loader, exclude_rent_id=2)
+    assert len(calls) == 1
+
+    index.invalidate(7)
+    assert index.is_free(7, day(21), day(22), loader)
+    assert len(calls) == 2
+
+
+@pytest.fixture
+def rental_service(db_session):
+    return get_rental_service(db_session)
+
+
+def make_rental(test_data, car_index: int, start: datetime, end: datetime) -> RentalCreateDTO:
+    return RentalCreateDTO(
+        car_id=test_data.cars[car_index].car_id,
+        client_id=test_data.clients[0].client_id,
+        user_id=test_data.users[0].user_id,
+        start_date=start,
+        end_date=end
+    )
+
+
+def test_repository_detects_enclosing_rental(db_session, test_data):
+    # Аренда из test_data: дни 3-5 от текущего момента
+    now = datetime.now(timezone.utc)
+    repo = RentalRepository(db_session)
+
+    assert not repo.is_car_available(test_data.cars[0].car_id, now + timedelta(days=3, hours=12),
+                                     now + timedelta(days=4))
+
+
+def test_extend_rental_conflict(rental_service, test_data):
+    now = datetime.now(timezone.utc)
+    first = rental_service.create_rental(make_rental(test_data, 1, now + timedelta(days=30), now + timedelta(days=32)))
+    rental_service.create_rental(make_rental(test_data, 1, now + timedelta(days=40), now + timedelta(days=42)))
+
+    with pytest.raises(ValueError, match="Нельзя продлить аренду"):
+        rental_service.extend_rental(first.rental.rent_id, now + timedelta(days=41))
+
+    extended = rental_service.extend_rental(first.rental.rent_id, now + timedelta(days=35))
+    assert extended.rental.end_date.date() == (now + timedelta(days=35)).date()
+
+
+def test_extend_checks_database_not_only_index(rental_service, db_session, test_data):
+    now = datetime.now(timezone.utc)
+    first = rental_service.create_rental(make_rental(test_data, 1, now + timedelta(days=30), now + timedelta(days=32)))
+    car_id = test_data.cars[1].car_id
+    assert rental_service.is_car_available(car_id, now + timedelta(days=40), now + timedelta(days=42))
+
+    # Бронь другого процесса: в БД она есть, индекс этого процесса о ней не знает
+    db_session.add(Rental(car_id=car_id, client_id=test_data.clients[1].client_id, status=RentalStatus.AWAITING,
+                          start_date=(now + timedelta(days=40)).replace(tzinfo=None),
+                          end_date=(now + timedelta(days=42)).replace(tzinfo=None)))
+    db_session.commit()
+
+    with pytest.raises(RentalConflictError):
+        rental_service.extend_rental(first.rental.rent_id, now + timedelta(days=41))
+    assert rental_service.get_rent_by_id(first.rental.rent_id).rental.end_date.date() == (now + timedelta(days=32)).date()
+
+    # Индекс сброшен и теперь сам видит чужую бронь
+    with pytest.raises(RentalConflictError, match="аренды"):
+        rental_service.extend_rental(first.rental.rent_id, now + timedelta(days=41))
+
+
+def test_cancel_frees_period(rental_service, test_data):
+    now = datetime.now(timezone.utc)
+    car_id = test_data.cars[0].car_id
+    rent_id = test_data.rentals[0].rental.rent_id
+
+    assert not rental_service.is_car_available(car_id, now + timedelta(days=4), now + timedelta(days=4, hours=1))
+    rental_service.cancel_rental(rent_id)
+    assert rental_service.is_car_available(car_id, now + timedelta(days=4), now + timedelta(days=4, hours=1))
@@ -1,10 +1,10 @@
 from main import app
 from ClientOverride import override_get_current_user
-from config import SessionLocal
 from service import get_car_service, get_current_user, CarService
 from dto import CarStatusEnum, CarCreateDTO
 
 import pytest
+from datetime import datetime, timedelta, timezone
 from fastapi.testclient import TestClient
 
 test_car_create = CarCreateDTO(
@@ -16,11 +16,6 @@ test_car_create = CarCreateDTO(
 )
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    return SessionLocal()
-
-
 @pytest.fixture
 def client(db_session):
     # Устанавливаем переопределения зависимостей
@@ -90,3 +85,45 @@ def test_create_duplicate_vin_error(client):
     assert response.status_code == 400
     assert "уже существует" in response.json()["detail"]
     client.delete(f"/cars/{res.json()['car_id']}")
+
+
+def test_get_free_cars(client):
+    start = datetime.now(timezone.utc) + timedelta(days=100)
+    response = client.get("/cars/free", params={"start": start.isoformat(),
+                                               "end": (start + timedelta(days=2)).isoformat()})
+    assert response.status_code == 200
+
+    response = client.get("/cars/free", params={"start": start.isoformat(),
+                                               "end": (start - timedelta(days=2)).isoformat()})
+    assert response.status_code == 400
+
+
+def test_filter_pages_endpoint(client):
+    response = client.get("/cars/filter", params={"limit": 1, "sort": "daily_rate"})
+    assert response.status_code == 200
+    page = response.json()
+    assert page["limit"] == 1 and len(page["items"]) == 1
+
+    response = client.get("/cars/filter", params={"cursor": page["next_cursor"], "sort": "daily_rate"})
+    assert response.status_code == 200
+    assert response.json()["items"][0]["car"]["daily_rate"] >= page["items"][0]["car"]["daily_rate"]
+
+    assert client.get("/cars/filter", params={"cursor": "xyz"}).status_code == 400
+
+
+def test_model_suggestions_endpoint(client):
+    response = client.get("/cars/models", params={"prefix": "sil"})
+    assert response.status_code == 200
+    assert response.json() == [{"name": "Nissan Silvia S15", "count": 1}]
+    assert client.get("/cars/models", params={"limit": 0}).status_code == 422
+
+
+def test_stats_endpoint(client):
+    response = client.get("/cars/stats", params={"top": 1})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 2
+    assert body["by_status"] == {"AVAILABLE": 2}
+    assert [car["daily_rate"] for car in body["most_expensive"]] == [700]
+
+    assert client.get("/cars/stats", params={"top": 0}).status_code == 422
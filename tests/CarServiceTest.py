@@ -1,17 +1,12 @@
 from service import get_car_service
+from repository.CarRepository import compile_car_filter
 from dto import (CarCreateDTO, CarSpecificationsCreateDTO, CarFilterDTO,
                  CarWithSpecsUpdateDTO, TransmissionEnum, ActuatorEnum,
                  WheelEnum, CarStatusEnum, CarUpdateDTO)
-from config import SessionLocal
 
 import pytest
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    return SessionLocal()
-
-
 @pytest.fixture
 def car_service(db_session):
     return get_car_service(db_session)
@@ -130,3 +125,22 @@ def test_update_car(car_service):
     ))
     assert update_dto.car.car_id == car_dto.car_id and update_dto.car.license_plate == "А555АА77"
     car_service.delete_car(car_dto.car_id)
+
+
+def test_filter_by_specs_single_query(car_service, test_data, db_session, sql_log):
+    db_session.expunge_all()
+    with sql_log:
+        results = car_service.get_cars_by_filter(CarFilterDTO(model='silvia', min_power=100, max_rate=100_000))
+
+    assert [r['car']['car_id'] for r in results] == [test_data.cars[0].car_id]
+    assert results[0]['specifications']['name'] == 'Nissan Silvia S15'
+    assert len(sql_log) == 1 and 'EXISTS' not in sql_log.statements[0]
+
+
+def test_compiled_filter_cached_per_shape():
+    first, first_params = compile_car_filter(CarFilterDTO(model='Supra', min_rate=10))
+    second, second_params = compile_car_filter(CarFilterDTO(model='Silvia', min_rate=500))
+    other, _ = compile_car_filter(CarFilterDTO(model='Supra'))
+
+    assert first is second and first is not other
+    assert second_params == {'model': '%Silvia%', 'min_rate': 500}
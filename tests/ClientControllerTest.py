@@ -1,6 +1,5 @@
 from main import app
 from ClientOverride import override_get_current_user
-from config import SessionLocal
 from service import get_current_user, get_client_service, ClientService
 from dto import ClientCreateDTO, ClientUpdateDTO
 
@@ -15,11 +14,6 @@ test_client_create = ClientCreateDTO(
 )
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    return SessionLocal()
-
-
 @pytest.fixture
 def client(db_session):
     # Устанавливаем переопределения зависимостей
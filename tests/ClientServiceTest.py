@@ -1,15 +1,9 @@
 from service import get_client_service
-from config import SessionLocal
 from dto import ClientCreateDTO, ClientUpdateDTO, ClientFilterDTO
 
 import pytest
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    return SessionLocal()
-
-
 @pytest.fixture
 def client_service(db_session):
     return get_client_service(db_session)
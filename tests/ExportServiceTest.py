@@ -0,0 +1,49 @@
+from service import ExportService
+from service.ExportService import csv_columns
+from dto import CarFilterDTO, RentalFilterDTO, RentalWithRelationsDTO, ExportFormatEnum
+
+import csv
+import io
+import json
+import pytest
+from contextlib import nullcontext
+from datetime import datetime
+
+
+@pytest.fixture
+def export_service(db_session) -> ExportService:
+    # Пачки по одной строке: проверяем склейку ответа из нескольких кусков
+    return ExportService(session_scope=lambda: nullcontext(db_session), chunk_size=1)
+
+
+def test_export_rentals_ndjson(export_service, test_data):
+    rows = [json.loads(line) for line in ''.join(export_service.export_rentals(RentalFilterDTO(), ExportFormatEnum.NDJSON)).splitlines()]
+
+    assert [row['rental']['rent_id'] for row in rows] == sorted(rental.rental.rent_id for rental in test_data.rentals)
+    assert all(row['car']['car'] and row['client'] and row['user'] for row in rows)
+
+
+def test_export_rentals_csv(export_service, test_data):
+    chunks = export_service.export_rentals(RentalFilterDTO(), ExportFormatEnum.CSV)
+    # Заголовок отдаётся до первого запроса
+    header = next(chunks)
+    assert header.strip().split(',') == csv_columns(RentalWithRelationsDTO)
+
+    rows = list(csv.DictReader(io.StringIO(header + ''.join(chunks))))
+    assert len(rows) == len(test_data.rentals)
+    assert {row['car.car.car_id'] for row in rows} <= {str(car.car_id) for car in test_data.cars}
+
+
+def test_export_single_query(export_service, sql_log):
+    with sql_log:
+        list(export_service.export_rentals(RentalFilterDTO(), ExportFormatEnum.NDJSON))
+        list(export_service.export_cars(CarFilterDTO(), ExportFormatEnum.NDJSON))
+
+    # Связи приходят тем же запросом, сколько бы ни было пачек
+    assert len(sql_log.selects) == 2
+
+
+def test_export_bad_filter_fails_before_streaming(export_service):
+    now = datetime.now()
+    with pytest.raises(ValueError):
+        export_service.export_rentals(RentalFilterDTO(time_range=[now, now, now]), ExportFormatEnum.CSV)
@@ -0,0 +1,71 @@
+from service import CarService, get_rental_service
+from service.FleetAvailability import FleetAvailability, fleet_availability
+from dto import CarFilterDTO, RentalCreateDTO
+
+import pytest
+from datetime import date, datetime, timedelta, timezone
+
+ORIGIN = date(2030, 1, 1)
+
+
+def day(n: int, hour: int = 12) -> datetime:
+    return datetime.combine(ORIGIN, datetime.min.time()) + timedelta(days=n, hours=hour)
+
+
+@pytest.fixture
+def fleet() -> FleetAvailability:
+    fleet = FleetAvailability(horizon_days=30, ttl=0)
+    fleet.build([10, 20, 30], [(10, day(2), day(4)), (20, day(10), day(12))], ORIGIN)
+    return fleet
+
+
+def test_free_cars_for_window(fleet):
+    assert fleet.car_ids_of(fleet.free_mask(day(0), day(1))) == [10, 20, 30]
+    assert fleet.car_ids_of(fleet.free_mask(day(3), day(11))) == [30]
+    # Окно внутри аренды: автомобиль занят, хотя ни начало, ни конец аренды в окно не попадают
+    assert fleet.car_ids_of(fleet.free_mask(day(3, 1), day(3, 2))) == [20, 30]
+
+
+def test_candidates_and_horizon(fleet):
+    assert fleet.free_car_ids(day(0), day(1), candidates=[20, 99]) == [20]
+    with pytest.raises(ValueError):
+        fleet.free_mask(day(0), day(31))
+
+
+def test_updates_on_write(fleet):
+    fleet.set_car_intervals(30, [(1, day(5), day(6))])
+    fleet.set_car_intervals(10, [])
+    fleet.add_car(40)
+    fleet.remove_car(20)
+    fleet.add_interval(40, day(7), day(8))
+
+    assert fleet.car_ids_of(fleet.free_mask(day(5), day(5))) == [10, 40]
+    assert fleet.car_ids_of(fleet.free_mask(day(10), day(10))) == [10, 30, 40]
+    assert fleet.car_ids_of(fleet.free_mask(day(8), day(8))) == [10, 30]
+
+
+def test_service_free_cars(db_session, test_data):
+    service = CarService(db_session)
+    now = datetime.now(timezone.utc)
+    silvia, supra = test_data.cars[0].car_id, test_data.cars[1].car_id
+
+    # Silvia занята на 3-5 день, Supra — на 9-11
+    free = service.get_free_cars(now + timedelta(days=4), now + timedelta(days=4, hours=1))
+    assert [car.car.car_id for car in free] == [supra]
+
+    free = service.get_free_cars(now + timedelta(days=20), now + timedelta(days=21), CarFilterDTO(model='Silvia'))
+    assert [car.car.car_id for car in free] == [silvia]
+
+    # Отмена аренды сразу видна в картах
+    get_rental_service(db_session).cancel_rental(test_data.rentals[0].rental.rent_id)
+    assert fleet_availability.is_built
+    free = service.get_free_cars(now + timedelta(days=4), now + timedelta(days=4, hours=1))
+    assert sorted(car.car.car_id for car in free) == sorted([silvia, supra])
+
+    # Новая бронь отмечается в картах без перечитывания аренд автомобиля
+    get_rental_service(db_session).create_rental(RentalCreateDTO(
+        car_id=supra, client_id=test_data.clients[0].client_id, user_id=test_data.users[0].user_id,
+        start_date=now + timedelta(days=20), end_date=now + timedelta(days=22)
+    ))
+    free = service.get_free_cars(now + timedelta(days=21), now + timedelta(days=21, hours=1))
+    assert [car.car.car_id for car in free] == [silvia]
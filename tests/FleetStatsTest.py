@@ -0,0 +1,74 @@
+from service import CarService, UserService
+from service.FleetStats import FleetStats
+from dto import CarStatusEnum, UserCreateDTO, UserPositionEnum
+
+import pytest
+
+
+@pytest.fixture
+def stats() -> FleetStats:
+    stats = FleetStats(ttl=0)
+    stats.build([(1, 'AVAILABLE', 500), (2, 'RENTED', 900), (3, 'AVAILABLE', 300), (4, 'MAINTENANCE', 700)])
+    return stats
+
+
+def test_counts_and_rankings(stats):
+    assert stats.count_all() == 4
+    assert stats.status_distribution() == {'AVAILABLE': 2, 'RENTED': 1, 'MAINTENANCE': 1}
+    assert stats.most_expensive(2) == [(2, 900), (4, 700)]
+    assert stats.cheapest_available(5) == [(3, 300), (1, 500)]
+    # Повторный запрос возвращает те же записи: вершина кучи не теряется
+    assert stats.most_expensive(2) == [(2, 900), (4, 700)]
+
+
+def test_rankings_follow_writes(stats):
+    stats.put_car(3, CarStatusEnum.RENTED, 300)
+    stats.put_car(1, 'AVAILABLE', 1000)
+    stats.put_car(5, 'AVAILABLE', 100)
+    stats.remove_car(2)
+
+    assert stats.count_by_status('AVAILABLE') == 2
+    assert stats.count_by_status('RENTED') == 1
+    assert stats.most_expensive(4) == [(1, 1000), (4, 700), (3, 300), (5, 100)]
+    assert stats.cheapest_available(3) == [(5, 100), (1, 1000)]
+
+
+def test_stale_entries_compacted(stats):
+    for rate in range(1000):
+        stats.put_car(1, 'AVAILABLE', rate)
+    assert len(stats._expensive) <= 2 * stats.count_all() + 64
+    assert stats.cheapest_available(1) == [(3, 300)]
+    assert stats.most_expensive(1) == [(1, 999)]
+
+
+def test_service_reads_db_once(test_data, sql_log):
+    service = CarService(test_data.session)
+    with sql_log:
+        first = service.get_stats(top=1)
+        loaded = len(sql_log)
+        assert first.total == 2 and first.by_status == {'AVAILABLE': 2}
+        assert [car.daily_rate for car in first.most_expensive] == [700]
+        service.get_stats()
+        assert len(sql_log) == loaded
+
+    expensive, cheap = test_data.cars[1].car_id, test_data.cars[0].car_id
+    service.change_status(cheap, CarStatusEnum.MAINTENANCE)
+    service.update_daily_rate(expensive, 1500)
+    stats = service.get_stats()
+    assert stats.by_status == {'AVAILABLE': 1, 'MAINTENANCE': 1}
+    assert [(car.car_id, car.daily_rate) for car in stats.cheapest_available] == [(expensive, 1500)]
+
+    service.delete_car(cheap)
+    assert service.get_stats().total == 1
+
+
+def test_user_count_follows_writes(test_data):
+    service = UserService(test_data.session)
+    assert service.count_all() == 2
+    created = service.create_user(UserCreateDTO(email="stats@test.com", password="pwd", name="Stats",
+                                                position=UserPositionEnum.AGENT))
+    assert service.count_all() == 3
+    service.delete_user(created.user_id)
+    service.delete_user(created.user_id)
+    assert service.count_all() == 2
+
@@ -0,0 +1,83 @@
+import utils
+from utils import HashingExecutor, HashingOverloadError
+from main import app
+from service import get_auth_service, get_user_service, get_current_user, UserDetailsService, UserService
+from service.LoginThrottle import LoginThrottle
+from ClientOverride import override_get_current_user
+
+import time
+import controller.AuthController
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def busy_executor(monkeypatch):
+    """Пул из одного процесса без очереди, занятый долгой задачей"""
+    executor = HashingExecutor(max_workers=1, queue_limit=0, timeout=5)
+    future = executor._submit(time.sleep, 0.5)
+    monkeypatch.setattr(utils, '_hashing_executor', executor)
+    yield executor
+    future.result()
+    executor.shutdown()
+
+
+def test_queue_limit_rejects_at_once(busy_executor):
+    started = time.monotonic()
+    with pytest.raises(HashingOverloadError, match="переполнена"):
+        busy_executor.run(pow, 2, 10)
+    assert time.monotonic() - started < 0.2
+
+
+def test_slot_returns_after_task():
+    executor = HashingExecutor(max_workers=1, queue_limit=0, timeout=5)
+    try:
+        assert executor.run(pow, 2, 10) == 1024
+        assert executor.run(pow, 2, 11) == 2048
+    finally:
+        executor.shutdown()
+
+
+def test_timeout_raises_overload():
+    executor = HashingExecutor(max_workers=1, queue_limit=0, timeout=0.1)
+    try:
+        with pytest.raises(HashingOverloadError, match="время ожидания"):
+            executor.run(time.sleep, 1)
+    finally:
+        executor.shutdown()
+
+
+@pytest.fixture
+def client(db_session, monkeypatch):
+    # Свой счётчик попыток: неудачные входы других тестов не мешают
+    monkeypatch.setattr(controller.AuthController, 'login_throttle', LoginThrottle())
+    app.dependency_overrides[get_auth_service] = lambda: UserDetailsService(db_session)
+    app.dependency_overrides[get_user_service] = lambda: UserService(db_session)
+    app.dependency_overrides[get_current_user] = override_get_current_user
+
+    with TestClient(app) as c:
+        yield c
+
+    app.dependency_overrides.clear()
+
+
+def test_login_when_pool_is_full_returns_503(client, busy_executor):
+    response = client.post("/auth/login", data={"username": "admin@yandex.ru", "password": "123"})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_create_user_when_pool_is_full_returns_503(client, busy_executor):
+    response = client.post("/users/", json=dict(email="new@test.com", password="secret", name="Новый",
+                                                position="AGENT"))
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_login_succeeds_with_free_pool(client):
+    response = client.post("/auth/login", data={"username": "admin@yandex.ru", "password": "123"})
+
+    assert response.status_code == 200
+    assert response.json()["token_type"] == "bearer"
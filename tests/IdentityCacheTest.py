@@ -0,0 +1,51 @@
+from service.IdentityCache import IdentityCache
+from dto import UserLoginResponseDTO
+
+import time
+
+
+def make_identity(user_id: int) -> UserLoginResponseDTO:
+    return UserLoginResponseDTO(user_id=user_id, email=f'user{user_id}@test.com')
+
+
+def test_get_returns_cached_identity():
+    cache = IdentityCache(max_size=10, ttl=60)
+    cache.put('token-1', make_identity(1))
+
+    assert cache.get('token-1').user_id == 1
+    assert cache.get('unknown') is None
+
+
+def test_lru_eviction():
+    cache = IdentityCache(max_size=2, ttl=60)
+    cache.put('a', make_identity(1))
+    cache.put('b', make_identity(2))
+    cache.get('a')  # 'b' становится самым старым
+    cache.put('c', make_identity(3))
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+
+
+def test_entry_is_capped_by_token_expiry():
+    cache = IdentityCache(max_size=10, ttl=60)
+    cache.put('expired', make_identity(1), token_exp=time.time() - 1)
+    cache.put('short', make_identity(2), token_exp=time.time() + 0.05)
+
+    assert cache.get('expired') is None
+    assert cache.get('short') is not None
+    time.sleep(0.1)
+    assert cache.get('short') is None
+
+
+def test_invalidate_user_drops_all_tokens():
+    cache = IdentityCache(max_size=10, ttl=60)
+    cache.put('t1', make_identity(1))
+    cache.put('t2', make_identity(1))
+    cache.put('t3', make_identity(2))
+
+    cache.invalidate_user(1)
+
+    assert cache.get('t1') is None and cache.get('t2') is None
+    assert cache.get('t3') is not None
+    assert len(cache) == 1
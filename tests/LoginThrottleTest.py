@@ -0,0 +1,96 @@
+from service.LoginThrottle import LoginThrottle, SlidingWindowCounter
+from service import get_auth_service
+from main import app, register_routers
+
+import asyncio
+import controller.AuthController
+import httpx
+
+
+def test_counter_blocks_after_limit_and_recovers():
+    counter = SlidingWindowCounter(limit=3, window=10)
+    for t in (0, 1, 2):
+        assert counter.retry_after('key', t) == 0
+        counter.hit('key', t)
+
+    assert counter.retry_after('key', 3) == 7  # самая ранняя попытка выйдет из окна в t=10
+    assert counter.retry_after('key', 10) == 0
+
+
+def test_throttle_by_email_is_case_insensitive_and_reset_on_success():
+    throttle = LoginThrottle(max_attempts_per_email=2, max_attempts_per_ip=100, window=60)
+    throttle.reserve('Agent@yandex.ru', '10.0.0.1')
+    throttle.reserve('agent@yandex.ru', '10.0.0.1')
+
+    wait, attempt = throttle.reserve('agent@yandex.ru', '10.0.0.1')
+    assert wait > 0
+    throttle.register_success('agent@yandex.ru', '10.0.0.1', attempt)
+    assert throttle.retry_after('agent@yandex.ru', '10.0.0.1') == 0
+
+
+def test_email_lockout_does_not_spread_to_other_ips():
+    throttle = LoginThrottle(max_attempts_per_email=2, max_attempts_per_ip=100, window=60)
+    for _ in range(5):
+        throttle.reserve('agent@yandex.ru', '10.6.6.6')
+
+    assert throttle.retry_after('agent@yandex.ru', '10.6.6.6') > 0
+    # Сам агент со своего адреса по-прежнему входит
+    assert throttle.retry_after('agent@yandex.ru', '10.0.0.1') == 0
+
+
+def test_throttle_by_ip_covers_unknown_emails():
+    throttle = LoginThrottle(max_attempts_per_email=100, max_attempts_per_ip=3, window=60)
+    for i in range(3):
+        throttle.reserve(f'unknown{i}@test.com', '10.0.0.1')
+
+    assert throttle.retry_after('another@test.com', '10.0.0.1') > 0
+    assert throttle.retry_after('another@test.com', '10.0.0.2') == 0
+
+
+def test_reserve_counts_attempts_before_they_finish():
+    throttle = LoginThrottle(max_attempts_per_email=3, max_attempts_per_ip=100, window=60)
+    # Пять одновременных запросов: ни один ещё не получил ответа от проверки пароля
+    waits = [throttle.reserve('agent@yandex.ru', '10.0.0.1')[0] for _ in range(5)]
+
+    assert [wait == 0 for wait in waits] == [True, True, True, False, False]
+
+
+def test_refund_returns_attempt_and_success_frees_ip():
+    throttle = LoginThrottle(max_attempts_per_email=1, max_attempts_per_ip=1, window=60)
+    _, attempt = throttle.reserve('agent@yandex.ru', '10.0.0.1')
+    throttle.refund('agent@yandex.ru', '10.0.0.1', attempt)
+    assert throttle.retry_after('agent@yandex.ru', '10.0.0.1') == 0
+
+    _, attempt = throttle.reserve('agent@yandex.ru', '10.0.0.1')
+    throttle.register_success('agent@yandex.ru', '10.0.0.1', attempt)
+    assert throttle.retry_after('other@yandex.ru', '10.0.0.1') == 0
+
+
+class SlowWrongPassword:
+    """Проверка пароля, которая долго считает и всегда отказывает"""
+
+    async def authenticate_async(self, email, password):
+        await asyncio.sleep(0.05)
+        return None
+
+
+def test_concurrent_logins_cannot_pass_the_limit(monkeypatch):
+    monkeypatch.setattr(controller.AuthController, 'login_throttle',
+                        LoginThrottle(max_attempts_per_email=2, max_attempts_per_ip=100, window=60))
+    app.dependency_overrides[get_auth_service] = SlowWrongPassword
+    register_routers(app)  # ASGITransport не запускает lifespan
+
+    async def burst():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await asyncio.gather(*(
+                client.post('/auth/login', data={'username': 'agent@yandex.ru', 'password': 'wrong'})
+                for _ in range(6)
+            ))
+
+    try:
+        responses = asyncio.run(burst())
+    finally:
+        app.dependency_overrides.clear()
+
+    assert sorted(r.status_code for r in responses) == [401, 401, 429, 429, 429, 429]
@@ -0,0 +1,97 @@
+from config.connection import DatabaseConfig
+from migrations import IndexAdvisor, MigrationRunner
+
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import inspect, text
+
+
+@pytest.fixture
+def engine():
+    # Отдельная пустая база: схему создают только миграции
+    return DatabaseConfig({'backend': 'sqlite', 'path': ':memory:'}).sync_engine(metrics=None, create_schema=False)
+
+
+def index_names(engine, table: str) -> set:
+    return {index['name'] for index in inspect(engine).get_indexes(table)}
+
+
+def test_upgrade_to_head(engine):
+    runner = MigrationRunner(engine)
+    assert runner.current_version() == 0
+
+    applied = runner.upgrade()
+
+    assert [m.version for m in applied] == [1, 2, 3, 4, 5, 6]
+    assert runner.current_version() == runner.head
+    assert 'ix_rentals_car_status_period' in index_names(engine, 'Rentals')
+    assert 'ix_cars_daily_rate' in index_names(engine, 'Cars')
+    assert 'updated_at' in {column['name'] for column in inspect(engine).get_columns('Rentals')}
+    assert runner.upgrade() == []
+
+
+def test_downgrade_drops_indexes_then_tables(engine):
+    runner = MigrationRunner(engine)
+    runner.upgrade()
+
+    runner.downgrade(1)
+    assert runner.current_version() == 1
+    assert 'ix_rentals_car_status_period' not in index_names(engine, 'Rentals')
+
+    runner.downgrade(0)
+    assert runner.current_version() == 0
+    assert not inspect(engine).has_table('Rentals')
+
+
+def test_initial_schema_has_no_later_indexes(engine):
+    runner = MigrationRunner(engine)
+    runner.upgrade(1)
+
+    assert index_names(engine, 'Rentals') == {'ix_Rentals_rent_id'}
+    assert index_names(engine, 'Cars') == {'ix_Cars_car_id', 'ix_Cars_license_plate', 'ix_Cars_vin'}
+
+    # Индексы появляются только в своих версиях
+    assert [m.version for m in runner.upgrade(2)] == [2]
+    assert 'ix_rentals_car_status_period' in index_names(engine, 'Rentals')
+    assert 'ix_clients_name' not in index_names(engine, 'Clients')
+
+
+def test_rollups_filled_from_existing_rentals(engine):
+    runner = MigrationRunner(engine)
+    runner.upgrade(3)
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO Cars (car_id, license_plate, vin, daily_rate) VALUES (1, 'A1', 'V1', 100)"))
+        connection.execute(text(
+            "INSERT INTO Clients (client_id, name, phone, license_number) VALUES (1, 'Иван', '79990000000', 'L1')"
+        ))
+        connection.execute(text(
+            "INSERT INTO Rentals (rent_id, car_id, client_id, start_date, end_date, actual_return_date, status, total_cost)"
+            " VALUES (1, 1, 1, :start, :end, :end, 'COMPLETED', 100), (2, 1, 1, :start, :end, NULL, 'ACTIVE', NULL)"
+        ), dict(start=datetime(2024, 5, 1, 12), end=datetime(2024, 5, 2, 12)))
+
+    runner.upgrade()
+
+    with engine.connect() as connection:
+        rows = connection.execute(text(
+            "SELECT day, started, completed, revenue, busy_hours FROM RentalDayRollups ORDER BY day"
+        )).all()
+    assert [(str(row[0]), row[1], row[2], Decimal(str(row[3])), Decimal(str(row[4]))) for row in rows] == [
+        (str(date(2024, 5, 1)), 1, 0, Decimal(0), Decimal(12)),
+        (str(date(2024, 5, 2)), 0, 1, Decimal(100), Decimal(12)),
+    ]
+
+
+def test_upgrade_unknown_version(engine):
+    with pytest.raises(ValueError):
+        MigrationRunner(engine).upgrade(99)
+
+
+def test_advisor_hot_queries_use_indexes(engine):
+    MigrationRunner(engine).upgrade()
+    plans = {plan.name: plan for plan in IndexAdvisor(engine).run()}
+
+    assert not plans['RentalRepository.is_car_available'].has_scans
+    assert not plans['RentalRepository.find_by_filters(car_id, status)'].has_scans
+    assert not plans['CarRepository.get_cheapest_cars'].has_scans
+    assert not plans['CarRepository.find_by_filters(min_rate, max_rate)'].has_scans
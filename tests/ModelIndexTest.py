@@ -0,0 +1,52 @@
+from service import CarService
+from service.ModelIndex import ModelIndex
+from dto import CarWithSpecsUpdateDTO, CarUpdateDTO, CarSpecificationsUpdateDTO
+
+import pytest
+
+
+@pytest.fixture
+def index() -> ModelIndex:
+    index = ModelIndex(ttl=0)
+    index.build([(1, 'Toyota Camry'), (2, 'Toyota Camry'), (3, 'Toyota Supra MK4'), (4, 'Kia Rio'), (5, None)])
+    return index
+
+
+def test_prefix_of_any_word(index):
+    assert index.suggest('toy') == [('Toyota Camry', 2), ('Toyota Supra MK4', 1)]
+    assert index.suggest('SUP') == [('Toyota Supra MK4', 1)]
+    assert index.suggest('toyota  su') == [('Toyota Supra MK4', 1)]
+    assert index.suggest('lada') == []
+    # Пустой префикс — самые частые модели
+    assert index.suggest('', limit=2) == [('Toyota Camry', 2), ('Kia Rio', 1)]
+
+
+def test_counts_follow_writes(index):
+    index.set_car_model(2, 'Kia Rio')
+    assert index.suggest('') == [('Kia Rio', 2), ('Toyota Camry', 1), ('Toyota Supra MK4', 1)]
+
+    index.remove_car(3)
+    assert index.suggest('supra') == []
+
+    index.set_car_model(6, 'Lada Vesta')
+    index.set_car_model(4, None)
+    assert index.suggest('') == [('Kia Rio', 1), ('Lada Vesta', 1), ('Toyota Camry', 1)]
+
+
+def test_service_uses_index_after_first_load(test_data, sql_log):
+    service = CarService(test_data.session)
+    with sql_log:
+        assert [s.name for s in service.get_model_suggestions('ni')] == ['Nissan Silvia S15']
+        loaded = len(sql_log)
+        assert [s.name for s in service.get_model_suggestions('s')] == ['Nissan Silvia S15', 'Toyota Supra MK4']
+        assert len(sql_log) == loaded
+
+    car_id = test_data.cars[0].car_id
+    service.update_car(CarWithSpecsUpdateDTO(
+        car=CarUpdateDTO(car_id=car_id),
+        specifications=CarSpecificationsUpdateDTO(car_id=car_id, name='Toyota Supra MK4')
+    ))
+    assert [(s.name, s.count) for s in service.get_model_suggestions('')] == [('Toyota Supra MK4', 2)]
+
+    service.delete_car(car_id)
+    assert [(s.name, s.count) for s in service.get_model_suggestions('')] == [('Toyota Supra MK4', 1)]
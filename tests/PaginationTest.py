@@ -0,0 +1,101 @@
+from service import CarService, ClientService, RentalService
+from repository import InvalidCursorError, page_limits
+from dto import (CarCreateDTO, CarStatusEnum, CarFilterDTO, ClientFilterDTO, RentalFilterDTO, RentalUpdateDTO,
+                 PageRequestDTO)
+
+import pytest
+
+
+@pytest.fixture
+def car_service(test_data) -> CarService:
+    # Несколько одинаковых цен: порядок внутри них задаёт car_id
+    for number, rate in enumerate([300, 500, 500, 900, 1200]):
+        test_data.car_service.create_car(CarCreateDTO(
+            license_plate=f"К{number}00КК77",
+            vin=f"P{number}" * 8 + 'P',
+            daily_rate=rate,
+            status=CarStatusEnum.AVAILABLE,
+            specifications=None
+        ))
+    return CarService(test_data.session)
+
+
+def walk(fetch, **params):
+    """Пройти все страницы, возвращая их по очереди"""
+    pages, cursor = [], None
+    while True:
+        page = fetch(PageRequestDTO(cursor=cursor, **params))
+        pages.append(page)
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+def test_car_pages_cover_filter(car_service):
+    expected = [car['car']['car_id'] for car in car_service.get_cars_by_filter(CarFilterDTO())]
+    pages = walk(lambda page: car_service.get_cars_page(CarFilterDTO(), page), limit=2)
+
+    assert all(len(page.items) <= 2 for page in pages)
+    assert [item.car.car_id for page in pages for item in page.items] == sorted(expected)
+
+
+@pytest.mark.parametrize('sort', ['daily_rate', '-daily_rate'])
+def test_car_pages_sorted_by_rate(car_service, sort):
+    pages = walk(lambda page: car_service.get_cars_page(CarFilterDTO(), page), limit=3, sort=sort)
+    cars = [(item.car.daily_rate, item.car.car_id) for page in pages for item in page.items]
+
+    assert cars == sorted(cars, reverse=sort.startswith('-'))
+    assert len(set(cars)) == len(cars)
+
+
+def test_client_and_rental_pages(test_data):
+    clients = walk(lambda page: ClientService(test_data.session).get_clients_page(ClientFilterDTO(), page),
+                   limit=1, sort='-name')
+    names = [client.name for page in clients for client in page.items]
+    assert names == sorted(names, reverse=True)
+    assert len(names) == len(test_data.clients)
+
+    rentals = walk(lambda page: RentalService(test_data.session).get_rentals_page(RentalFilterDTO(), page),
+                   limit=1, sort='start_date')
+    assert len([rental for page in rentals for rental in page.items]) == len(test_data.rentals)
+
+
+def test_updated_rental_keeps_its_place(test_data):
+    service = RentalService(test_data.session)
+    fetch = lambda page: service.get_rentals_page(RentalFilterDTO(), page)
+
+    first = fetch(PageRequestDTO(limit=1, sort='created_at'))
+    # Правка уже выданной записи не должна сдвинуть её в конец сортировки
+    rent_id = first.items[0].rental.rent_id
+    service.update_rental(RentalUpdateDTO(rent_id=rent_id, notes='Правка во время обхода'))
+
+    seen, cursor = [rent_id], first.next_cursor
+    while cursor is not None:
+        page = fetch(PageRequestDTO(limit=1, sort='created_at', cursor=cursor))
+        seen += [item.rental.rent_id for item in page.items]
+        cursor = page.next_cursor
+    assert sorted(seen) == sorted(rental.rental.rent_id for rental in test_data.rentals)
+
+
+def test_bad_cursor_and_sort(car_service):
+    with pytest.raises(InvalidCursorError):
+        car_service.get_cars_page(CarFilterDTO(), PageRequestDTO(cursor='не курсор'))
+
+    first = car_service.get_cars_page(CarFilterDTO(), PageRequestDTO(limit=1, sort='daily_rate'))
+    with pytest.raises(InvalidCursorError):
+        # Курсор одной сортировки нельзя продолжить в другой
+        car_service.get_cars_page(CarFilterDTO(), PageRequestDTO(cursor=first.next_cursor, sort='-daily_rate'))
+
+    with pytest.raises(ValueError):
+        car_service.get_cars_page(CarFilterDTO(), PageRequestDTO(sort='vin'))
+
+
+def test_limit_clamped(car_service):
+    default_size, max_size = page_limits.default_size, page_limits.max_size
+    page_limits.default_size, page_limits.max_size = 2, 3
+    try:
+        assert len(car_service.get_cars_page(CarFilterDTO(), PageRequestDTO()).items) == 2
+        page = car_service.get_cars_page(CarFilterDTO(), PageRequestDTO(limit=100))
+        assert page.limit == 3 and len(page.items) == 3
+    finally:
+        page_limits.default_size, page_limits.max_size = default_size, max_size
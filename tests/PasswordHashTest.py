@@ -0,0 +1,40 @@
+import utils
+from utils import hash_password, verify_password, needs_rehash
+
+import os
+import hashlib
+import pytest
+
+
+@pytest.fixture
+def iterations():
+    # Низкая стоимость, чтобы тесты не тратили время на PBKDF2
+    previous = utils.get_password_iterations()
+    utils.configure_password_iterations(1000)
+    yield 1000
+    utils.configure_password_iterations(previous)
+
+
+def test_hash_stores_algorithm_and_cost(iterations):
+    stored = hash_password('secret', iterations)
+
+    assert stored.startswith(b'pbkdf2_sha256$1000$')
+    assert verify_password(stored, 'secret')
+    assert not verify_password(stored, 'wrong')
+    assert not needs_rehash(stored)
+
+
+def test_legacy_hash_is_verified_and_needs_rehash(iterations):
+    salt = os.urandom(16)
+    legacy = salt + hashlib.pbkdf2_hmac('sha256', b'secret', salt, utils.LEGACY_ITERATIONS)
+
+    assert verify_password(legacy, 'secret')
+    assert needs_rehash(legacy)
+
+
+def test_cost_change_requires_rehash(iterations):
+    stored = hash_password('secret', iterations)
+    utils.configure_password_iterations(2000)
+
+    assert needs_rehash(stored)
+    assert verify_password(stored, 'secret')
@@ -0,0 +1,75 @@
+from config.connection import DatabaseConfig
+from config.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, PoolMetrics
+
+import asyncio
+import threading
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+
+@pytest.fixture
+def pool_config(tmp_path):
+    # Файловая база: у :memory: пул из одного соединения (StaticPool)
+    return DatabaseConfig({
+        'backend': 'sqlite',
+        'path': str(tmp_path / 'pool.db'),
+        'pool': {'size': 1, 'max-overflow': 1, 'timeout-seconds': 0.2},
+    })
+
+
+def test_pool_settings_reach_engine(pool_config):
+    engine = pool_config.sync_engine(metrics=None, create_schema=False)
+    try:
+        assert isinstance(engine.pool, InstrumentedQueuePool)
+        assert engine.pool.size() == 1
+        assert engine.pool._max_overflow == 1
+        assert engine.pool._timeout == 0.2
+    finally:
+        engine.dispose()
+
+
+def test_metrics_under_contention(pool_config):
+    metrics = PoolMetrics()
+    engine = pool_config.sync_engine(metrics=metrics, create_schema=False)
+    try:
+        first, second = engine.connect(), engine.connect()
+        assert metrics.snapshot()['checked_out'] == 2
+
+        # Третье соединение не получить: pool_size + max_overflow заняты
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+        snapshot = metrics.snapshot()
+        assert snapshot['checkout_timeouts'] == 1
+        assert snapshot['wait_max_ms'] >= 200
+
+        # Освобождаем соединение из другого потока, пока ждём
+        threading.Timer(0.05, second.close).start()
+        with engine.connect() as third:
+            third.execute(text('SELECT 1'))
+        first.close()
+
+        snapshot = metrics.snapshot()
+        assert snapshot['checkouts'] == 3
+        assert snapshot['checkins'] == 3
+        assert snapshot['checked_out'] == 0
+        assert snapshot['connections_created'] == 2
+        assert 0 < snapshot['wait_avg_ms'] <= snapshot['wait_max_ms']
+    finally:
+        engine.dispose()
+
+
+def test_async_engine_is_instrumented(pool_config):
+    metrics = PoolMetrics()
+    engine = pool_config.async_engine(metrics=metrics)
+
+    async def query():
+        async with engine.connect() as connection:
+            await connection.execute(text('SELECT 1'))
+        await engine.dispose()
+
+    asyncio.run(query())
+    assert isinstance(engine.sync_engine.pool, InstrumentedAsyncQueuePool)
+    snapshot = metrics.snapshot()
+    assert snapshot['checkouts'] == 1 and snapshot['checkins'] == 1
+    assert snapshot['pool_size'] == 1
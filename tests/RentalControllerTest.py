@@ -1,33 +1,34 @@
 from ClientOverride import override_get_current_user
-from config import SessionLocal
 from dto import RentalWithRelationsDTO, RentalStatusEnum, RentalCreateDTO
 from main import app
-from service import get_rental_service, get_current_user, RentalService
+from service import get_rental_service, get_export_service, get_current_user, RentalService, ExportService
 
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import MagicMock
+from contextlib import nullcontext
 from datetime import datetime, timezone, timedelta
 
 start = (datetime.now(timezone.utc) + timedelta(days=120)).replace(microsecond=0)
-test_rental_create = RentalCreateDTO(
-    car_id=26,
-    client_id=6,
-    user_id=2,
-    start_date = start,
-    end_date = start + timedelta(days=10),
-    status=RentalStatusEnum.AWAITING
-)
 
-@pytest.fixture(scope="function")
-def db_session():
-    return SessionLocal()
+
+@pytest.fixture
+def test_rental_create(test_data):
+    return RentalCreateDTO(
+        car_id=test_data.cars[0].car_id,
+        client_id=test_data.clients[0].client_id,
+        user_id=test_data.users[0].user_id,
+        start_date = start,
+        end_date = start + timedelta(days=10),
+        status=RentalStatusEnum.AWAITING
+    )
 
 
 @pytest.fixture
 def client(db_session):
     real_service = RentalService(db_session)
     app.dependency_overrides[get_rental_service] = lambda: real_service
+    app.dependency_overrides[get_export_service] = lambda: ExportService(lambda: nullcontext(db_session))
     app.dependency_overrides[get_current_user] = override_get_current_user
 
     with TestClient(app) as c:
@@ -36,14 +37,14 @@ def client(db_session):
     app.dependency_overrides.clear()
 
 
-def test_create_rental_success(client):
+def test_create_rental_success(client, test_rental_create):
     # Дата старта + 1 час (чтобы пройти валидацию FutureDate)
     response = client.post("/rentals/", json=test_rental_create.model_dump(mode="json"))
     assert response.status_code == 201
     client.delete(f"/rentals/{response.json()['rental']['rent_id']}")
 
 
-def test_create_rental_conflict(client):
+def test_create_rental_conflict(client, test_rental_create):
     # Создаем первую аренду на те же даты
     res1 = client.post("/rentals/", json=test_rental_create.model_dump(mode="json"))
     # Вторая попытка на то же авто
@@ -54,7 +55,7 @@ def test_create_rental_conflict(client):
     client.delete(f"/rentals/{res1.json()['rental']['rent_id']}")
 
 
-def test_extend_rental(client):
+def test_extend_rental(client, test_rental_create):
     # 1. Создаем
     resp = client.post("/rentals/", json=test_rental_create.model_dump(mode="json"))
     rent_id = resp.json()["rental"]["rent_id"]
@@ -67,7 +68,27 @@ def test_extend_rental(client):
     client.delete(f"/rentals/{rent_id}")
 
 
-def test_cancel_rental(client):
+def test_extend_rental_into_booking(client, test_rental_create):
+    first = client.post("/rentals/", json=test_rental_create.model_dump(mode="json")).json()["rental"]["rent_id"]
+    later = test_rental_create.model_copy(update={
+        "start_date": test_rental_create.end_date + timedelta(days=3),
+        "end_date": test_rental_create.end_date + timedelta(days=6),
+    })
+    second = client.post("/rentals/", json=later.model_dump(mode="json")).json()["rental"]["rent_id"]
+
+    new_end = test_rental_create.end_date + timedelta(days=4)
+    response = client.put(f"/rentals/extend/{first}", params={"new_end_date": new_end.isoformat()})
+    assert response.status_code == 409
+    assert "уже забронирован" in response.json()["detail"]
+
+    response = client.put("/rentals/extend/999999", params={"new_end_date": new_end.isoformat()})
+    assert response.status_code == 404
+
+    client.delete(f"/rentals/{second}")
+    client.delete(f"/rentals/{first}")
+
+
+def test_cancel_rental(client, test_rental_create):
     # Создаем
     resp = client.post("/rentals/", json=test_rental_create.model_dump(mode="json"))
     rent_id = resp.json()["rental"]["rent_id"]
@@ -77,7 +98,7 @@ def test_cancel_rental(client):
     assert response.json()["rental"]["status"] == "CANCELLED"
 
 
-def test_delete_rental_success(client):
+def test_delete_rental_success(client, test_rental_create):
     # Создаем
     resp = client.post("/rentals/", json=test_rental_create.model_dump(mode="json"))
     rent_id = resp.json()["rental"]["rent_id"]
@@ -90,3 +111,16 @@ def test_delete_rental_success(client):
     check_resp = client.put(f"/rentals/cancel/{rent_id}")
     assert check_resp.json()['rental'] is None
 
+
+def test_export_rentals_endpoint(client, test_data):
+    response = client.get("/rentals/export", params={"format": "ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert len(response.text.splitlines()) == len(test_data.rentals)
+
+    response = client.get("/rentals/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert 'attachment; filename="rentals.csv"' == response.headers["content-disposition"]
+    assert len(response.text.splitlines()) == len(test_data.rentals) + 1
+
+    assert client.get("/rentals/export", params={"format": "xml"}).status_code == 422
@@ -1,29 +1,23 @@
 from service import get_rental_service
-from dto import RentalCreateDTO, RentalUpdateDTO, RentalStatusEnum
-from config import SessionLocal
+from dto import RentalCreateDTO, RentalUpdateDTO, RentalStatusEnum, RentalFilterDTO
 
 import pytest
 from datetime import datetime, timedelta, timezone
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    return SessionLocal()
-
-
 @pytest.fixture
 def rental_service(db_session):
     return get_rental_service(db_session)
 
 
-def test_create_rental_success(rental_service):
+def test_create_rental_success(rental_service, test_data):
     start = datetime.now(timezone.utc) + timedelta(days=10)
     end = start + timedelta(days=12)
 
     dto = RentalCreateDTO(
-        car_id=26,
-        client_id=6,
-        user_id=2,
+        car_id=test_data.cars[0].car_id,
+        client_id=test_data.clients[0].client_id,
+        user_id=test_data.users[0].user_id,
         start_date=start,
         end_date=end,
         notes="First rental"
@@ -36,7 +30,7 @@ def test_create_rental_success(rental_service):
     rental_service.delete_rental(result.rental.rent_id)
 
 
-def test_create_rental_car_not_available(rental_service):
+def test_create_rental_car_not_available(rental_service, test_data):
     """
     В файле config/test_data.py мы уже ранее создавали аренду,
     которая будет пересекаться с той, которую мы хотим создать.
@@ -46,9 +40,9 @@ def test_create_rental_car_not_available(rental_service):
     end = start + timedelta(days=3)
 
     dto = RentalCreateDTO(
-        car_id=26,
-        client_id=6,
-        user_id=2,
+        car_id=test_data.cars[0].car_id,
+        client_id=test_data.clients[0].client_id,
+        user_id=test_data.users[0].user_id,
         start_date=start,
         end_date=end
     )
@@ -57,11 +51,11 @@ def test_create_rental_car_not_available(rental_service):
         rental_service.create_rental(dto)
 
 
-def test_create_rental_invalid_client(rental_service):
+def test_create_rental_invalid_client(rental_service, test_data):
     dto = RentalCreateDTO(
-        car_id=26,
+        car_id=test_data.cars[0].car_id,
         client_id=999,  # Несуществующий ID
-        user_id=2,
+        user_id=test_data.users[0].user_id,
         start_date=datetime.now(timezone.utc) + timedelta(days=2),
         end_date=datetime.now(timezone.utc) + timedelta(days=3)
     )
@@ -69,15 +63,15 @@ def test_create_rental_invalid_client(rental_service):
         rental_service.create_rental(dto)
 
 
-def test_extend_rental(rental_service):
+def test_extend_rental(rental_service, test_data):
     start = datetime.now(timezone.utc) + timedelta(days=80)
     old_end = start + timedelta(days=90)
     new_end = (start + timedelta(days=100)).replace(microsecond=0)
 
     rental_dto = RentalCreateDTO(
-        car_id=27,
-        client_id=7,
-        user_id=2,
+        car_id=test_data.cars[1].car_id,
+        client_id=test_data.clients[1].client_id,
+        user_id=test_data.users[0].user_id,
         start_date=start,
         end_date=old_end
     )
@@ -94,3 +88,72 @@ def test_get_rent_by_id_not_found(rental_service):
     with pytest.raises(ValueError, match="не существует"):
         rental_service.get_rent_by_id(888)
 
+
+
+def test_get_rentals_by_filter_query_count(rental_service, test_data, db_session, sql_log):
+    # Ещё несколько аренд: число запросов не должно зависеть от размера результата
+    start = datetime.now(timezone.utc) + timedelta(days=200)
+    for i in range(5):
+        rental_service.create_rental(RentalCreateDTO(
+            car_id=test_data.cars[1].car_id,
+            client_id=test_data.clients[i % 2].client_id,
+            user_id=test_data.users[0].user_id,
+            start_date=start + timedelta(days=10 * i),
+            end_date=start + timedelta(days=10 * i + 2)
+        ))
+    db_session.expunge_all()
+
+    with sql_log:
+        rentals = rental_service.get_rentals_by_filter(RentalFilterDTO())
+
+    assert len(rentals) == 7
+    assert all(r.car.specifications is not None and r.client and r.user for r in rentals)
+    assert len(sql_log.selects) == 1
+
+
+def test_get_rent_by_id_single_query(rental_service, test_data, db_session, sql_log):
+    rent_id = test_data.rentals[0].rental.rent_id
+    db_session.expunge_all()
+
+    with sql_log:
+        result = rental_service.get_rent_by_id(rent_id)
+
+    assert result.car.specifications is not None and result.client and result.user
+    assert len(sql_log.selects) == 1
+
+
+def test_complete_rental(rental_service, test_data, sql_log):
+    rent_id = test_data.rentals[0].rental.rent_id
+    rental_service.update_rental(RentalUpdateDTO(rent_id=rent_id, status=RentalStatusEnum.ACTIVE))
+
+    with sql_log:
+        result = rental_service.complete_rental(rent_id, datetime.now(timezone.utc))
+
+    assert result.rental.status == RentalStatusEnum.COMPLETED
+    assert result.rental.total_cost == test_data.cars[0].daily_rate
+    assert len(sql_log.selects) == 2
+    # Сводки отчётов обновляются той же транзакцией, без чтения аренд
+    assert any('RentalDayRollups' in s for s in sql_log.statements)
+
+
+def test_create_rental_two_statements(rental_service, test_data, sql_log):
+    start = datetime.now(timezone.utc) + timedelta(days=30)
+    dto = RentalCreateDTO(
+        car_id=test_data.cars[1].car_id,
+        client_id=test_data.clients[0].client_id,
+        user_id=test_data.users[0].user_id,
+        start_date=start,
+        end_date=start + timedelta(days=2),
+    )
+    with sql_log:
+        result = rental_service.create_rental(dto)
+
+    # Бронирование — запрос связей и INSERT ... RETURNING, больше ничего
+    assert sql_log.kinds == ['SELECT', 'INSERT']
+    assert '"Clients"' in sql_log.statements[0] and 'NOT (EXISTS' in sql_log.statements[1]
+    assert result.rental.rent_id and result.car.car.car_id == dto.car_id
+    assert result.client.client_id == dto.client_id and result.user.user_id == dto.user_id
+
+    # Тот же период занят: INSERT не вставляет строку
+    with pytest.raises(ValueError, match="не доступен"):
+        rental_service.create_rental(dto)
@@ -0,0 +1,112 @@
+from config.replicas import ReplicaRouter, RoutingSession
+from entity import Base, Car, CarStatus
+from repository import CarRepository
+
+import pytest
+import sqlite3
+import threading
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+
+
+def make_engine():
+    engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def make_car(plate: str, vin: str) -> Car:
+    return Car(license_plate=plate, vin=vin, daily_rate=1000, status=CarStatus.AVAILABLE)
+
+
+@pytest.fixture
+def engines():
+    primary, replica = make_engine(), make_engine()
+    # На реплике есть машина, которой нет на основном сервере
+    with RoutingSession(bind=replica) as session:
+        session.add(make_car('А001АА77', 'R' * 17))
+        session.commit()
+    return primary, replica
+
+
+def test_read_only_methods_go_to_replica(engines):
+    primary, replica = engines
+    session = RoutingSession(bind=primary, router=ReplicaRouter(primary, [replica]))
+    repo = CarRepository(session)
+
+    assert repo.count_all() == 1          # @read_only -> реплика
+    assert repo.get_by_id(1) is None       # обычное чтение -> основной сервер
+
+
+def test_reads_stay_on_primary_until_commit(engines):
+    primary, replica = engines
+    session = RoutingSession(bind=primary, router=ReplicaRouter(primary, [replica]))
+    repo = CarRepository(session)
+
+    session.add(make_car('В002ВВ77', 'P' * 17))
+    session.add(make_car('С003СС77', 'Q' * 17))
+    session.flush()
+    assert repo.count_all() == 2          # своя незафиксированная запись видна только на основном сервере
+
+    session.commit()
+    assert repo.count_all() == 1          # транзакция закончилась — чтение снова на реплике
+    assert repo.get_by_id(1).vin == 'P' * 17
+
+
+def test_replica_failure_retries_on_primary(engines):
+    primary, _ = engines
+    # На «реплике» нет таблиц, а ошибка считается обрывом связи
+    broken = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+    event.listen(broken, 'handle_error', lambda context: setattr(context, 'is_disconnect', True))
+
+    router = ReplicaRouter(primary, [broken], retry_after=60)
+    session = RoutingSession(bind=primary, router=router)
+    repo = CarRepository(session)
+    session.add(make_car('В002ВВ77', 'P' * 17))
+    session.commit()
+    car = repo.get_by_id(1)
+
+    assert repo.count_all() == 1
+    assert router.health()[0]['healthy'] is False
+    # Транзакция основной сессии не откатывалась: объект не просрочен, запись проходит
+    assert 'daily_rate' in car.__dict__
+    car.daily_rate = 1500
+    pending = make_car('С003СС77', 'Q' * 17)
+    session.add(pending)
+    assert repo.count_all() == 2
+    session.commit()
+    assert repo.get_by_id(1).daily_rate == 1500 and pending.car_id == 2
+
+
+def test_unhealthy_replica_falls_back_to_primary(engines):
+    primary, replica = engines
+    router = ReplicaRouter(primary, [replica], retry_after=60)
+    router.mark_down(replica)
+
+    assert router.get_read_engine() is primary
+    assert router.health()[0]['healthy'] is False
+
+
+def test_probe_runs_in_background(engines):
+    primary, _ = engines
+    reachable = threading.Event()
+
+    def connect():
+        reachable.wait(5)
+        return sqlite3.connect(':memory:', check_same_thread=False)
+
+    slow = create_engine('sqlite://', creator=connect, poolclass=StaticPool)
+    router = ReplicaRouter(primary, [slow], retry_after=0)
+    router.mark_down(slow)
+
+    started = time.monotonic()
+    assert router.get_read_engine() is primary     # проверка ушла в фоновый поток
+    assert router.get_read_engine() is primary
+    assert time.monotonic() - started < 1
+
+    reachable.set()
+    deadline = time.monotonic() + 5
+    while not router.health()[0]['healthy'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert router.get_read_engine() is slow
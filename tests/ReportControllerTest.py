@@ -0,0 +1,48 @@
+from main import app
+from ClientOverride import override_get_current_user
+from service import get_report_service, get_utilization_service, get_current_user, ReportService, UtilizationService
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def client(db_session):
+    real_service = ReportService(db_session)
+    app.dependency_overrides[get_report_service] = lambda: real_service
+    app.dependency_overrides[get_current_user] = override_get_current_user
+
+    with TestClient(app) as c:
+        yield c
+
+    app.dependency_overrides.clear()
+
+
+def test_report_endpoints(client):
+    response = client.get("/reports/month", params={"year": 2024, "month": 2})
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["first_day"], body["last_day"]) == ("2024-02-01", "2024-02-29")
+    assert body["completed"] == 0 and body["fleet_size"] == 2
+
+    assert client.get("/reports/quarter", params={"year": 2024, "quarter": 3}).json()["first_day"] == "2024-07-01"
+    assert client.get("/reports/year", params={"year": 2024}).json()["last_day"] == "2024-12-31"
+    assert client.get("/reports/month", params={"year": 2024, "month": 13}).status_code == 422
+
+
+def test_utilization_endpoint(db_session):
+    app.dependency_overrides[get_utilization_service] = lambda: UtilizationService(db_session)
+    app.dependency_overrides[get_current_user] = override_get_current_user
+    try:
+        with TestClient(app) as client:
+            response = client.get("/reports/utilization",
+                                  params={"start": "2024-01-01T00:00:00", "end": "2024-01-02T00:00:00"})
+            assert response.status_code == 200
+            assert response.json()["window_hours"] == 24
+            assert response.json()["utilization"] == 0
+
+            response = client.get("/reports/utilization",
+                                  params={"start": "2024-01-02T00:00:00", "end": "2024-01-01T00:00:00"})
+            assert response.status_code == 400
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,169 @@
+from service import RentalService, ReportService
+from service.ReportService import period_bounds
+from repository import RentalRepository
+from dto import RentalCreateDTO, RentalUpdateDTO, ReportPeriodEnum
+from entity import Base, Car, Client, Rental, RentalStatus, User
+from entity import RentalDayRollup, RentalCarDayRollup, RentalClientDayRollup
+
+import pytest
+import threading
+from datetime import date, datetime, timezone
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.orm import Session
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def rentals(test_data):
+    """Завершённая аренда Silvia на рубеже марта и апреля и продлённая, затем завершённая аренда Supra в мае"""
+    service = RentalService(test_data.session)
+    car, client, user = test_data.cars[0], test_data.clients[0], test_data.users[0]
+    # Аренды в прошлом: валидатор DTO принимает только будущую дату возврата
+    march = service.create_rental(RentalCreateDTO.model_construct(
+        car_id=car.car_id, client_id=client.client_id, user_id=user.user_id,
+        start_date=utc(2024, 3, 30, 10), end_date=utc(2024, 4, 2, 10), notes=None
+    ))
+    # 60 часов: начатые сутки оплачиваются целиком, 3 · 500
+    service.complete_rental(march.rental.rent_id, utc(2024, 4, 1, 22))
+
+    may = service.create_rental(RentalCreateDTO.model_construct(
+        car_id=test_data.cars[1].car_id, client_id=test_data.clients[1].client_id, user_id=user.user_id,
+        start_date=utc(2024, 5, 1), end_date=utc(2024, 5, 3), notes=None
+    ))
+    service.extend_rental(may.rental.rent_id, utc(2024, 5, 6))
+    service.complete_rental(may.rental.rent_id, utc(2024, 5, 6))
+    service.cancel_rental(test_data.rentals[0].rental.rent_id)
+    return service
+
+
+def rollup_rows(session):
+    return [sorted(tuple(row) for row in session.execute(select(*table.__table__.c)))
+            for table in (RentalDayRollup, RentalCarDayRollup, RentalClientDayRollup)]
+
+
+def test_period_bounds():
+    assert period_bounds(ReportPeriodEnum.MONTH, 2024, 2) == (date(2024, 2, 1), date(2024, 2, 29))
+    assert period_bounds(ReportPeriodEnum.QUARTER, 2024, 4) == (date(2024, 10, 1), date(2024, 12, 31))
+    assert period_bounds(ReportPeriodEnum.YEAR, 2023) == (date(2023, 1, 1), date(2023, 12, 31))
+    with pytest.raises(ValueError):
+        period_bounds(ReportPeriodEnum.QUARTER, 2024, 5)
+
+
+def test_reports_from_rollups(rentals, test_data):
+    service = ReportService(test_data.session)
+
+    march = service.get_report(ReportPeriodEnum.MONTH, 2024, 3)
+    assert (march.started, march.completed, march.busy_hours) == (1, 0, 38)
+
+    april = service.get_report(ReportPeriodEnum.MONTH, 2024, 4)
+    assert (april.started, april.completed, april.revenue, april.busy_hours) == (0, 1, 1500, 22)
+    assert april.average_duration_hours == 60
+    assert [(car.car_id, car.revenue) for car in april.top_cars] == [(test_data.cars[0].car_id, 1500)]
+    assert [client.client_id for client in april.top_clients] == [test_data.clients[0].client_id]
+
+    second_quarter = service.get_report(ReportPeriodEnum.QUARTER, 2024, 2)
+    # 22 часа в апреле и 5 суток продлённой аренды в мае
+    assert second_quarter.busy_hours == 22 + 5 * 24
+
+    year = service.get_report(ReportPeriodEnum.YEAR, 2024)
+    assert (year.started, year.completed, year.revenue) == (2, 2, 1500 + 5 * test_data.cars[1].daily_rate)
+    assert year.utilization == round((60 + 120) / (2 * 366 * 24), 4)
+
+
+def test_open_rentals_do_not_touch_rollups(test_data, sql_log):
+    service = RentalService(test_data.session)
+    with sql_log:
+        created = service.create_rental(RentalCreateDTO.model_construct(
+            car_id=test_data.cars[0].car_id, client_id=test_data.clients[0].client_id,
+            user_id=test_data.users[0].user_id, start_date=utc(2024, 7, 1), end_date=utc(2024, 7, 3), notes=None
+        ))
+        service.extend_rental(created.rental.rent_id, utc(2024, 7, 5))
+    assert not any('Rollups' in s for s in sql_log.statements)
+    assert rollup_rows(test_data.session) == [[], [], []]
+
+    # Правка закрытой аренды переносит её вклад: старые дни уменьшаются, новые растут
+    service.complete_rental(created.rental.rent_id, utc(2024, 7, 4))
+    service.update_rental(RentalUpdateDTO(rent_id=created.rental.rent_id, actual_return_date=utc(2024, 7, 2)))
+    report = ReportService(test_data.session).get_report(ReportPeriodEnum.MONTH, 2024, 7)
+    assert (report.started, report.completed, report.busy_hours) == (1, 1, 24)
+    assert rollup_rows(test_data.session)[0][-1] == (date(2024, 7, 4), 0, 0, 0, 0, 0, 0)
+
+    service.delete_rental(created.rental.rent_id)
+    assert ReportService(test_data.session).get_report(ReportPeriodEnum.MONTH, 2024, 7).busy_hours == 0
+
+
+def test_incremental_refresh_matches_rebuild(rentals, test_data):
+    incremental = rollup_rows(test_data.session)
+    assert incremental[0]
+
+    ReportService(test_data.session).rebuild()
+    assert rollup_rows(test_data.session) == incremental
+
+
+def test_report_reads_only_rollups(rentals, test_data, sql_log):
+    service = ReportService(test_data.session)
+    service.get_report(ReportPeriodEnum.YEAR, 2024)
+
+    with sql_log:
+        service.get_report(ReportPeriodEnum.YEAR, 2024)
+
+    assert len(sql_log.selects) == 3
+    assert all('Rentals"' not in s and 'Rentals ' not in s for s in sql_log.selects)
+
+
+def test_concurrent_writes_on_same_days(tmp_path):
+    """Два писателя одновременно закрывают аренды за одни и те же дни: ни одно прибавление не теряется"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'rollups.db'}", connect_args={'timeout': 30})
+
+    # Писатель ждёт другого на BEGIN IMMEDIATE, как в MSSQL он ждал бы блокировку строки сводки
+    @event.listens_for(engine, 'connect')
+    def _on_connect(dbapi_connection, _):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, 'begin')
+    def _on_begin(connection):
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
+
+    Base.metadata.create_all(engine)
+    per_writer = 10
+    with engine.begin() as connection:
+        connection.execute(insert(User), [dict(user_id=1, email='a@b.c', password=b'x', name='Админ', position='ADMIN')])
+        connection.execute(insert(Client), [dict(client_id=1, name='Клиент', phone='89000000000', license_number='1')])
+        connection.execute(insert(Car), [dict(car_id=car_id, license_plate=str(car_id), vin=str(car_id) * 17,
+                                              daily_rate=1000) for car_id in (1, 2)])
+        connection.execute(insert(Rental), [
+            dict(rent_id=rent_id, car_id=rent_id % 2 + 1, client_id=1, user_id=1, status=RentalStatus.ACTIVE,
+                 start_date=datetime(2024, 3, 1, rent_id), end_date=datetime(2024, 3, 3))
+            for rent_id in range(1, 2 * per_writer + 1)
+        ])
+
+    barrier = threading.Barrier(2)
+    errors = []
+
+    def close_rentals(parity: int):
+        try:
+            with Session(engine) as session:
+                repository = RentalRepository(session)
+                barrier.wait()
+                for rent_id in range(1 + parity, 2 * per_writer + 1, 2):
+                    repository.complete_rental(rent_id, utc(2024, 3, 4, rent_id), 1000)
+        except Exception as error:
+            errors.append(error)
+
+    writers = [threading.Thread(target=close_rentals, args=(parity,)) for parity in (0, 1)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+    assert errors == []
+
+    with Session(engine) as session:
+        incremental = rollup_rows(session)
+        report = ReportService(session).get_report(ReportPeriodEnum.MONTH, 2024, 3)
+        assert (report.started, report.completed, report.revenue) == (2 * per_writer, 2 * per_writer, 20000)
+        ReportService(session).rebuild()
+        assert rollup_rows(session) == incremental
+    engine.dispose()
@@ -0,0 +1,34 @@
+from main import app
+from ClientOverride import override_get_current_user
+from service import get_search_service, get_current_user, SearchService
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def client(db_session):
+    real_service = SearchService(db_session)
+    app.dependency_overrides[get_search_service] = lambda: real_service
+    app.dependency_overrides[get_current_user] = override_get_current_user
+
+    with TestClient(app) as c:
+        yield c
+
+    app.dependency_overrides.clear()
+
+
+def test_search_endpoint(client, test_data):
+    response = client.get("/search", params={"q": "8912"})
+    assert response.status_code == 200
+    assert response.json()[0] == {
+        "kind": "client", "id": test_data.clients[1].client_id, "title": "Бутусов Денис Николаевич",
+        "field": "phone", "value": "89123221212", "score": 2
+    }
+
+    response = client.get("/search", params={"q": "о322", "kind": "car"})
+    assert [hit["field"] for hit in response.json()] == ["license_plate"]
+
+
+def test_search_short_query(client):
+    assert client.get("/search", params={"q": "ив"}).status_code == 400
@@ -0,0 +1,75 @@
+from service import SearchService, ClientService, CarService
+from service.SearchIndex import SearchIndex, search_index, client_document, car_document, normalize
+from dto import ClientCreateDTO, ClientUpdateDTO, CarCreateDTO, CarStatusEnum, SearchKindEnum
+
+import pytest
+
+
+@pytest.fixture
+def index() -> SearchIndex:
+    index = SearchIndex(ttl=0)
+    index.build([
+        client_document(1, 'Иванов Иван', '89003123412', '@ivan_tg', 'ГИБДД 1234'),
+        client_document(2, 'Петров Иван', '89161234567', None, 'ГИБДД 5678'),
+        car_document(1, 'А191АА21', 'WWWWWWWWWWWWWWWWW', 'Nissan Silvia S15'),
+        car_document(2, 'О322ОО197', 'WWWWWWWW111111111', None),
+    ])
+    return index
+
+
+def test_substring_and_ranking(index):
+    hits = index.search('иван')
+    # «Иванов Иван» начинается с запроса, «Петров Иван» только содержит его
+    assert [(hit.kind, hit.key, hit.score) for hit in hits] == [('client', 1, 2), ('client', 2, 1)]
+    assert [hit.key for hit in index.search('1234')] == [1, 2]
+    assert index.search('ГИБДД 5678')[0].score == 3
+
+
+def test_normalization(index):
+    # Латиница вместо кириллицы в номере, пробелы и регистр не важны
+    assert index.search('a191aa')[0].key == 1
+    assert normalize('+7 (900) 312-34') == '790031234'
+    assert [hit.key for hit in index.search('silvia', kind='car')] == [1]
+    assert index.search('silvia', kind='client') == []
+
+
+def test_incremental_updates(index):
+    index.put(client_document(2, 'Петров Пётр', '89161234567', None, 'ГИБДД 5678'))
+    assert [hit.key for hit in index.search('иван')] == [1]
+    assert index.search('петр')[0].key == 2
+
+    index.remove('car', 1)
+    assert index.search('silvia') == []
+    assert len(index) == 3
+
+
+def test_short_query(index):
+    with pytest.raises(ValueError):
+        index.search('ив')
+
+
+def test_service_builds_once_and_follows_writes(test_data, sql_log):
+    service = SearchService(test_data.session)
+    with sql_log:
+        assert service.search('Бутусов')[0].id == test_data.clients[1].client_id
+        loaded = len(sql_log)
+        assert service.search('Supra', kind=SearchKindEnum.CAR)[0].title == 'Toyota Supra MK4 О322ОО197'
+        # Повторные запросы обслуживаются из памяти
+        assert len(sql_log) == loaded
+
+    client = ClientService(test_data.session).create_client(ClientCreateDTO(
+        name='Сидоров Алексей', phone='89990001122', telegram_id='@sidor', license_number='ГИБДД 4321'
+    ))
+    assert service.search('сидоров')[0].id == client.client_id
+
+    ClientService(test_data.session).update_client(ClientUpdateDTO(client_id=client.client_id, name='Смирнов Алексей'))
+    assert service.search('сидоров') == []
+    assert service.search('смирнов')[0].id == client.client_id
+
+    car = CarService(test_data.session).create_car(CarCreateDTO(
+        license_plate='М777ММ77', vin='Z' * 17, daily_rate=900, status=CarStatusEnum.AVAILABLE, specifications=None
+    ))
+    assert service.search('м777')[0].id == car.car_id
+    CarService(test_data.session).delete_car(car.car_id)
+    assert service.search('м777') == []
+    assert search_index.is_built
@@ -0,0 +1,121 @@
+from config.data import Settings
+
+import json
+import os
+import signal
+import threading
+import pytest
+
+
+def write_config(path, data, mtime=None):
+    path.write_text(json.dumps(data) if isinstance(data, dict) else data, encoding='utf-8')
+    if mtime is not None:
+        # Время изменения задаём явно: у файловой системы оно может быть грубее пауз теста
+        os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture(autouse=True)
+def clean_environ(monkeypatch):
+    # conftest задаёт настройки тестов через окружение, здесь они перекрыли бы файл
+    for name in list(os.environ):
+        if name.startswith('CAR_RENTAL__'):
+            monkeypatch.delenv(name)
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / 'config.json'
+    write_config(path, {'auth-key': 'file', 'database': {'server': 'db1', 'port': 1433}}, mtime=1000)
+    return path
+
+
+def test_env_overrides_nested_json_and_normalized_keys(config_file, monkeypatch):
+    monkeypatch.setenv('CAR_RENTAL__DATABASE__SERVER', 'db2')
+    monkeypatch.setenv('CAR_RENTAL__AUTH_KEY', 'env')
+    monkeypatch.setenv('CAR_RENTAL__LOGIN_ATTEMPTS', '5')
+    monkeypatch.setenv('CAR_RENTAL__REPLICAS', '[{"server": "r1"}]')
+
+    data = Settings(str(config_file)).data
+
+    assert data['database'] == {'server': 'db2', 'port': 1433}
+    # Существующий ключ переопределяется под своим именем, новый получает имя через дефис
+    assert data['auth-key'] == 'env' and 'auth_key' not in data
+    assert data['login-attempts'] == 5
+    assert data['replicas'] == [{'server': 'r1'}]
+
+
+def test_reload_if_changed_notifies_subscribers(config_file):
+    settings = Settings(str(config_file))
+    calls = []
+    settings.subscribe(lambda s: calls.append(s.get('auth-key')))
+
+    assert settings.reload_if_changed() is True  # первая загрузка
+    assert settings.reload_if_changed() is False
+
+    write_config(config_file, {'auth-key': 'changed'}, mtime=2000)
+    assert settings.reload_if_changed() is True
+    assert calls == ['file', 'changed']
+
+
+def test_broken_file_keeps_previous_data_and_is_retried(config_file):
+    settings = Settings(str(config_file))
+    assert settings.get('auth-key') == 'file'
+
+    write_config(config_file, '{"auth-key": ', mtime=2000)
+    with pytest.raises(ValueError):
+        settings.reload_if_changed()
+    assert settings.get('auth-key') == 'file'
+
+    # Время изменения то же, что у битого файла: проверка всё равно его перечитает
+    write_config(config_file, {'auth-key': 'fixed'}, mtime=2000)
+    assert settings.reload_if_changed() is True
+    assert settings.get('auth-key') == 'fixed'
+
+
+def test_watch_reloads_changed_file_and_stops(config_file):
+    settings = Settings(str(config_file))
+    settings.data
+    reloaded = threading.Event()
+    settings.subscribe(lambda s: reloaded.set())
+
+    settings.watch(interval=0.01)
+    try:
+        write_config(config_file, {'auth-key': 'changed'}, mtime=2000)
+        assert reloaded.wait(2)
+        assert settings.get('auth-key') == 'changed'
+    finally:
+        watcher = settings._watcher
+        settings.stop_watching(timeout=2)
+    assert not watcher.is_alive()
+
+
+@pytest.mark.skipif(not hasattr(signal, 'SIGHUP'), reason="SIGHUP есть только в POSIX")
+def test_sighup_reloads_in_watcher_thread(config_file):
+    settings = Settings(str(config_file))
+    settings.data
+    threads = []
+    reloaded = threading.Event()
+
+    def listener(s):
+        threads.append(threading.current_thread().name)
+        reloaded.set()
+
+    settings.subscribe(listener)
+    previous = signal.getsignal(signal.SIGHUP)
+    settings.install_sighup_handler()
+    try:
+        # Битый файл: обработчик не падает, данные прежние
+        write_config(config_file, '{"auth-key": ')
+        os.kill(os.getpid(), signal.SIGHUP)
+        assert not reloaded.wait(0.2)
+        assert settings.get('auth-key') == 'file'
+
+        write_config(config_file, {'auth-key': 'changed'})
+        os.kill(os.getpid(), signal.SIGHUP)
+        assert reloaded.wait(2)
+        assert settings.get('auth-key') == 'changed'
+        # Подписчики работают в фоновом потоке, а не в обработчике сигнала
+        assert set(threads) == {'settings-watcher'}
+    finally:
+        signal.signal(signal.SIGHUP, previous)
+        settings.stop_watching(timeout=2)
@@ -0,0 +1,23 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def loaded_after(statement: str, modules) -> list:
+    """Какие из модулей оказались загружены в чистом интерпретаторе после statement"""
+    code = f"import sys\n{statement}\nprint(','.join(m for m in {list(modules)!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=os.environ.copy(),
+                            capture_output=True, text=True, check=True)
+    return [name for name in result.stdout.strip().split(',') if name]
+
+
+def test_import_main_skips_database_and_models():
+    assert loaded_after('import main', ['sqlalchemy', 'entity', 'config.connection', 'numpy', 'service']) == []
+
+
+def test_import_service_skips_numpy_and_settings():
+    statement = 'import service, utils\nassert utils._hashing_executor is None\nassert service.Dependencies.SECRET_KEY is None'
+    assert loaded_after(statement, ['numpy']) == []
@@ -0,0 +1,37 @@
+from sqlalchemy import event
+from typing import List
+
+
+class StatementLog:
+    """
+    SQL-запросы, выполненные внутри with. SAVEPOINT и RELEASE открывает
+    тестовая сессия, к запросам сервиса они не относятся и не записываются.
+    """
+
+    def __init__(self, bind):
+        self.bind = bind
+        self.statements: List[str] = []
+
+    def _record(self, conn, cursor, statement, *args):
+        if not statement.startswith(('SAVEPOINT', 'RELEASE', 'ROLLBACK TO SAVEPOINT')):
+            self.statements.append(statement)
+
+    def __enter__(self) -> 'StatementLog':
+        self.statements.clear()
+        event.listen(self.bind, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.bind, 'before_cursor_execute', self._record)
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    @property
+    def kinds(self) -> List[str]:
+        """Первое слово каждого запроса: SELECT, INSERT, ..."""
+        return [statement.split()[0].upper() for statement in self.statements]
+
+    @property
+    def selects(self) -> List[str]:
+        return [statement for statement in self.statements if statement.lstrip().upper().startswith('SELECT')]
@@ -0,0 +1,114 @@
+from service import get_car_service, get_client_service
+from repository import UniqueViolation
+from entity import Car, CarSpecifications, Client, User
+from dto import CarCreateDTO, CarSpecificationsCreateDTO, CarStatusEnum, ClientCreateDTO
+from dto import TransmissionEnum, ActuatorEnum, WheelEnum
+
+import pytest
+from sqlalchemy import UniqueConstraint, func, select
+from sqlalchemy.exc import IntegrityError
+
+
+class DriverError(Exception):
+    pass
+
+
+def violation(message: str, table) -> UniqueViolation:
+    return UniqueViolation.from_error(IntegrityError('INSERT', {}, DriverError(message)), table)
+
+
+# (модель, столбец, имя уникального индекса или ограничения) — все уникальные ключи моделей
+UNIQUE_KEYS = [
+    (Car, 'license_plate', 'ix_Cars_license_plate'),
+    (Car, 'vin', 'ix_Cars_vin'),
+    (Client, 'phone', 'ix_Clients_phone'),
+    (Client, 'telegram_id', 'ix_Clients_telegram_id'),
+    (Client, 'license_number', 'uq_clients_license_number'),
+    (User, 'email', 'uq_users_email'),
+]
+
+
+def test_every_unique_key_is_named():
+    keys = set()
+    for model in (Car, Client, User):
+        table = model.__table__
+        # unique=True у столбца дал бы безымянное ограничение
+        assert not any(column.unique for column in table.columns)
+        unique = [index for index in table.indexes if index.unique]
+        unique += [constraint for constraint in table.constraints if isinstance(constraint, UniqueConstraint)]
+        keys.update((model, next(iter(key.columns)).name, key.name) for key in unique)
+    assert keys == set(UNIQUE_KEYS)
+
+
+@pytest.mark.parametrize('model, column, name', UNIQUE_KEYS)
+def test_column_from_mssql_name(model, column, name):
+    table = model.__table__.name
+    if name.startswith('uq_'):
+        message = (f"Violation of UNIQUE KEY constraint '{name}'. Cannot insert duplicate key in object "
+                   f"'dbo.{table}'. The duplicate key value is (vin).")
+    else:
+        message = (f"Cannot insert duplicate key row in object 'dbo.{table}' with unique index '{name}'. "
+                   f"The duplicate key value is (vin).")
+    assert violation(message, model.__table__).column == column
+
+
+@pytest.mark.parametrize('model, column, name', UNIQUE_KEYS)
+def test_column_from_sqlite_message(model, column, name):
+    message = f'UNIQUE constraint failed: {model.__table__.name}.{column}'
+    assert violation(message, model.__table__).column == column
+
+
+def test_unknown_or_foreign_key_violation():
+    # Автоматическое имя MSSQL (ограничение создано до явных имён) столбца не выдаёт
+    assert violation("Violation of UNIQUE KEY constraint 'UQ__Clients__A1B2C3'. Cannot insert duplicate key "
+                     "in object 'dbo.Clients'.", Client.__table__).column is None
+    assert violation('FOREIGN KEY constraint failed', Car.__table__) is None
+
+
+def test_car_with_specs_in_one_transaction(db_session, sql_log):
+    car_service = get_car_service(db_session)
+    dto = CarCreateDTO(
+        license_plate="Т777ТТ77", vin="Z" * 17, daily_rate=900, status=CarStatusEnum.AVAILABLE,
+        specifications=CarSpecificationsCreateDTO(
+            car_id=1, name="Lada Vesta", mileage=10, power=106, overclocking=11.9, consump_in_city=9,
+            transmission=TransmissionEnum.MANUAL, actuator=ActuatorEnum.FRONT, wheel=WheelEnum.LEFT, color="Серый"
+        )
+    )
+
+    # Без предварительных проверок и перечитывания: два INSERT в одной транзакции
+    with sql_log:
+        car_service.create_car(dto)
+    assert sql_log.kinds == ['INSERT', 'INSERT']
+    assert car_service.get_car_by_id(dto.specifications.car_id).specifications.name == "Lada Vesta"
+
+    duplicate_plate = dto.model_copy(update={'vin': 'Y' * 17})
+    with pytest.raises(ValueError, match=f"Номерной знак {dto.license_plate} уже существует"):
+        car_service.create_car(duplicate_plate)
+    duplicate_vin = dto.model_copy(update={'license_plate': 'Т778ТТ77'})
+    with pytest.raises(ValueError, match=f"VIN {dto.vin} уже существует"):
+        car_service.create_car(duplicate_vin)
+    # Откат не оставил характеристик без автомобиля, сессия пригодна для работы
+    assert db_session.scalar(select(func.count()).select_from(Car)) == 3
+    assert db_session.scalar(select(func.count()).select_from(CarSpecifications)) == 3
+
+
+@pytest.mark.parametrize('field, value, message', [
+    ('phone', '89003123412', 'Номер 89003123412 уже есть в базе.'),
+    ('telegram_id', '@ivan_tg', 'Телеграм ID @ivan_tg уже есть в базе.'),
+    ('license_number', 'ГИБДД 1234', 'Водительское удостоверение ГИБДД 1234 уже есть в базе.'),
+])
+def test_client_duplicates_mapped(db_session, field, value, message):
+    client_service = get_client_service(db_session)
+    fields = dict(name="Клон", phone="89990000001", telegram_id="@clone", license_number="ГИБДД 5555")
+    fields[field] = value
+
+    with pytest.raises(ValueError, match=message):
+        client_service.create_client(ClientCreateDTO(**fields))
+
+
+def test_client_single_insert(db_session, sql_log):
+    client_service = get_client_service(db_session)
+    dto = ClientCreateDTO(name="Новый", phone="89990000002", telegram_id=None, license_number="ГИБДД 7777")
+    with sql_log:
+        client_service.create_client(dto)
+    assert sql_log.kinds == ['INSERT']
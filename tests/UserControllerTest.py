@@ -1,4 +1,3 @@
-from config import SessionLocal
 from dto import UserCreateDTO, UserPositionEnum, UserUpdateDTO
 from main import app  # Импорт вашего FastAPI приложения
 from service import get_user_service, get_current_user, UserService
@@ -17,11 +16,6 @@ test_user_create = UserCreateDTO(
 )
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    return SessionLocal()
-
-
 @pytest.fixture
 def client(db_session):
     # Устанавливаем переопределения зависимостей
@@ -1,15 +1,9 @@
 from service import get_user_service
-from config import SessionLocal
 from dto import UserCreateDTO, UserUpdateDTO, UserPositionEnum
 
 import pytest
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    return SessionLocal()
-
-
 @pytest.fixture
 def user_service(db_session):
     return get_user_service(db_session)
@@ -0,0 +1,56 @@
+from service import UtilizationService
+from service.UtilizationService import busy_seconds
+
+import pytest
+import numpy as np
+from datetime import timedelta
+
+
+def brute_force(car_index, starts, ends, window_start, window_end, car_count):
+    busy = [set() for _ in range(car_count)]
+    for car, start, end in zip(car_index, starts, ends):
+        busy[car].update(range(max(start, window_start), min(end, window_end)))
+    return [len(seconds) for seconds in busy]
+
+
+def test_overlaps_counted_once_and_clipped():
+    car_index = np.array([0, 0, 0, 1, 1, 2])
+    starts = np.array([10, 15, 40, -5, 90, 200])
+    ends = np.array([20, 30, 45, 5, 150, 300])
+
+    busy = busy_seconds(car_index, starts, ends, 0, 100, 4)
+
+    # 10..30 и 40..45; 0..5 и 90..100; аренда вне окна; автомобиль без аренд
+    assert busy.tolist() == [25, 15, 0, 0]
+
+
+def test_matches_brute_force():
+    rng = np.random.default_rng(7)
+    car_index = rng.integers(0, 20, 2000)
+    starts = rng.integers(0, 1000, 2000)
+    ends = starts + rng.integers(0, 120, 2000)
+
+    busy = busy_seconds(car_index, starts, ends, 200, 800, 20)
+
+    assert busy.tolist() == brute_force(car_index, starts, ends, 200, 800, 20)
+
+
+def test_service_by_car_and_model(test_data):
+    first, second = test_data.rentals[0].rental, test_data.rentals[1].rental
+    start = first.start_date + timedelta(days=1)
+    end = second.start_date + timedelta(days=1)
+
+    report = UtilizationService(test_data.session).get_utilization(start, end)
+
+    cars = {car.car_id: car for car in report.cars}
+    window_hours = (end - start).total_seconds() / 3600
+    assert report.fleet_size == 2
+    assert report.window_hours == pytest.approx(window_hours, abs=0.01)
+    # Первая аренда попадает в окно последними сутками, вторая — первыми
+    assert cars[first.car_id].busy_hours == pytest.approx(24, abs=0.01)
+    assert cars[second.car_id].busy_hours == pytest.approx(24, abs=0.01)
+    assert report.utilization == pytest.approx(48 / (2 * window_hours), abs=1e-4)
+    assert {model.model: model.cars for model in report.models} == {'Nissan Silvia S15': 1, 'Toyota Supra MK4': 1}
+
+    with pytest.raises(ValueError):
+        UtilizationService(test_data.session).get_utilization(end, start)
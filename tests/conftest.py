@@ -0,0 +1,66 @@
+"""
+Общие фикстуры: тесты работают на встроенном SQLite в памяти.
+Каждый тест получает свежие данные из config.test_data.TestData
+и откатывает все изменения по завершении.
+"""
+import os
+
+# Настройки задаются до импорта приложения: конфигурация читается один раз
+os.environ.setdefault('CAR_RENTAL__DATABASE__BACKEND', 'sqlite')
+os.environ.setdefault('CAR_RENTAL__DATABASE__PATH', ':memory:')
+os.environ.setdefault('CAR_RENTAL__AUTH_KEY', 'test-secret')
+os.environ.setdefault('CAR_RENTAL__AUTH_ALGORITHM', 'HS256')
+os.environ.setdefault('CAR_RENTAL__TOKEN_EXPIRES_MINUTES', '30')
+# Дешёвый PBKDF2, чтобы сидирование пользователей не тормозило тесты
+os.environ.setdefault('CAR_RENTAL__PASSWORD_HASH_ITERATIONS', '1000')
+
+from config import get_engine
+from config.test_data import TestData
+from service.AvailabilityIndex import availability_index
+from service.FleetAvailability import fleet_availability
+from service.SearchIndex import search_index
+from service.ModelIndex import model_index
+from service.FleetStats import fleet_stats
+from service.Dependencies import configure
+from StatementLog import StatementLog
+
+import pytest
+from sqlalchemy.orm import Session
+
+# Приложение применяет настройки при старте; сервисным тестам они нужны сразу
+configure()
+
+
+@pytest.fixture(scope="function")
+def test_data() -> TestData:
+    connection = get_engine().connect()
+    transaction = connection.begin()
+    # commit() в репозиториях закрывает только SAVEPOINT внутри внешней транзакции
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    # Индексы занятости живут в памяти процесса и не откатываются вместе с БД
+    availability_index.invalidate()
+    fleet_availability.invalidate()
+    search_index.invalidate()
+    model_index.invalidate()
+    fleet_stats.invalidate()
+    try:
+        yield TestData(session).load()
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+        availability_index.invalidate()
+        fleet_availability.invalidate()
+        search_index.invalidate()
+        model_index.invalidate()
+        fleet_stats.invalidate()
+
+
+@pytest.fixture(scope="function")
+def db_session(test_data: TestData) -> Session:
+    return test_data.session
+
+
+@pytest.fixture(scope="function")
+def sql_log(db_session: Session) -> StatementLog:
+    return StatementLog(db_session.bind)
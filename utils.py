@@ -1,33 +1,183 @@
+import asyncio
 import hashlib
 import hmac
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Optional, Tuple
 
+# Формат хеша: b'pbkdf2_sha256$<итерации>$' + соль + ключ.
+# Старые записи хранят только соль + ключ и посчитаны с LEGACY_ITERATIONS.
+HASH_ALGORITHM = 'pbkdf2_sha256'
+LEGACY_ITERATIONS = 600000
+DEFAULT_ITERATIONS = 600000
+_HASH_PREFIX = HASH_ALGORITHM.encode('ascii') + b'$'
+_SALT_LENGTH = 16
 
-def hash_password(password: str):
+_password_iterations = DEFAULT_ITERATIONS
+
+
+def configure_password_iterations(iterations: int):
+    """Задать стоимость PBKDF2 для новых хешей (настройка развертывания)"""
+    global _password_iterations
+    if iterations <= 0:
+        raise ValueError("Количество итераций должно быть положительным")
+    _password_iterations = iterations
+
+
+def get_password_iterations() -> int:
+    return _password_iterations
+
+
+def _parse_password_hash(stored_password_bytes: bytes) -> Tuple[str, int, bytes, bytes]:
+    """Разобрать хеш на (алгоритм, итерации, соль, ключ)"""
+    stored_password_bytes = bytes(stored_password_bytes)
+    if stored_password_bytes.startswith(_HASH_PREFIX):
+        algorithm, iterations, payload = stored_password_bytes.split(b'$', 2)
+        return algorithm.decode('ascii'), int(iterations), payload[:_SALT_LENGTH], payload[_SALT_LENGTH:]
+
+    # Старый формат без параметров
+    return HASH_ALGORITHM, LEGACY_ITERATIONS, stored_password_bytes[:_SALT_LENGTH], stored_password_bytes[_SALT_LENGTH:]
+
+
+def hash_password(password: str, iterations: int = DEFAULT_ITERATIONS):
     # Генерируем случайную соль (16 байт)
-    salt = os.urandom(16)
+    salt = os.urandom(_SALT_LENGTH)
     key = hashlib.pbkdf2_hmac(
         'sha256',
         password.encode('utf-8'),
         salt,
-        600000
+        iterations
     )
-    return salt + key
+    return _HASH_PREFIX + str(iterations).encode('ascii') + b'$' + salt + key
 
 
 def verify_password(stored_password_bytes: bytes, provided_password_str: str):
-    # 1. Извлекаем соль (первые 16 байт)
-    salt = stored_password_bytes[:16]
-
-    # 2. Извлекаем сам хеш
-    stored_key = stored_password_bytes[16:]
+    # 1. Извлекаем параметры, соль и сам хеш
+    algorithm, iterations, salt, stored_key = _parse_password_hash(stored_password_bytes)
+    if algorithm != HASH_ALGORITHM:
+        return False
 
-    # 3. Хешируем введенный пароль с ТЕМ ЖЕ алгоритмом, солью и итерациями
+    # 2. Хешируем введенный пароль с ТЕМ ЖЕ алгоритмом, солью и итерациями
     new_key = hashlib.pbkdf2_hmac(
         'sha256',
         provided_password_str.encode('utf-8'),
         salt,
-        600000
+        iterations
     )
 
     return hmac.compare_digest(stored_key, new_key)
+
+
+def needs_rehash(stored_password_bytes: bytes) -> bool:
+    """Хеш посчитан со старыми параметрами и его стоит пересчитать"""
+    algorithm, iterations, _, _ = _parse_password_hash(stored_password_bytes)
+    return (not bytes(stored_password_bytes).startswith(_HASH_PREFIX)
+            or algorithm != HASH_ALGORITHM
+            or iterations != _password_iterations)
+
+
+# ==================== ПУЛ ХЕШИРОВАНИЯ ====================
+
+class HashingOverloadError(RuntimeError):
+    """Очередь хеширования переполнена или задача не уложилась в таймаут"""
+
+
+class HashingExecutor:
+    """
+    Ограниченный пул процессов для PBKDF2.
+    Хеширование выполняется на отдельных ядрах и не занимает потоки,
+    обслуживающие запросы. Одновременно принимается не больше
+    max_workers + queue_limit задач, остальные сразу получают отказ.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, queue_limit: int = 64, timeout: float = 10.0):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+
+        self._slots = threading.BoundedSemaphore(self.max_workers + queue_limit)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # Процессы создаются при первой задаче, а не при импорте
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def _submit(self, fn: Callable, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingOverloadError("Очередь хеширования переполнена")
+        try:
+            future = self._get_pool().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn: Callable, *args) -> Any:
+        """Выполнить задачу в пуле и дождаться результата (для синхронного кода)"""
+        future = self._submit(fn, *args)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise HashingOverloadError("Превышено время ожидания хеширования")
+
+    async def run_async(self, fn: Callable, *args) -> Any:
+        """Выполнить задачу в пуле, не блокируя цикл событий"""
+        future = self._submit(fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise HashingOverloadError("Превышено время ожидания хеширования")
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+_hashing_executor: Optional[HashingExecutor] = None
+
+
+def configure_hashing(max_workers: Optional[int] = None, queue_limit: int = 64, timeout: float = 10.0):
+    """Задать параметры пула хеширования (вызывается один раз при старте)"""
+    global _hashing_executor
+    if _hashing_executor is not None:
+        _hashing_executor.shutdown()
+    _hashing_executor = HashingExecutor(max_workers, queue_limit, timeout)
+    return _hashing_executor
+
+
+def get_hashing_executor() -> HashingExecutor:
+    global _hashing_executor
+    if _hashing_executor is None:
+        _hashing_executor = HashingExecutor()
+    return _hashing_executor
+
+
+# ==================== ХЕШИРОВАНИЕ ЧЕРЕЗ ПУЛ ====================
+# Стоимость передаётся явно: процессы пула не видят настроек родителя.
+
+def make_password_hash(password: str) -> bytes:
+    return get_hashing_executor().run(hash_password, password, _password_iterations)
+
+
+async def make_password_hash_async(password: str) -> bytes:
+    return await get_hashing_executor().run_async(hash_password, password, _password_iterations)
+
+
+def check_password(stored_password_bytes: bytes, password: str) -> bool:
+    return get_hashing_executor().run(verify_password, stored_password_bytes, password)
+
+
+async def check_password_async(stored_password_bytes: bytes, password: str) -> bool:
+    return await get_hashing_executor().run_async(verify_password, stored_password_bytes, password)